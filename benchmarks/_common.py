@@ -0,0 +1,51 @@
+"""Shared helpers for the benchmark modules."""
+
+import gc
+import statistics
+import time
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+def result(
+    name: str,
+    metric: str,
+    value: float,
+    unit: str,
+    **params: Any,
+) -> Dict[str, Any]:
+    """Build one machine-readable benchmark record."""
+    return {"name": name, "params": params, "metric": metric, "value": round(value, 4), "unit": unit}
+
+
+def per_call_us(func: Callable[[], Any], number: int, repeat: int = 5) -> float:
+    """Best-of-``repeat`` time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+
+def latency_us(func: Callable[[], Any], number: int) -> Dict[str, float]:
+    """Median and p99 of individually timed calls, in microseconds."""
+    samples: List[float] = []
+    for _ in range(number):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "median": statistics.median(samples),
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def peak_bytes(func: Callable[[], Any]) -> int:
+    """Peak traced allocation while ``func`` runs, keeping its result alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept: Optional[Any] = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return peak
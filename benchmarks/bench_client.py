@@ -0,0 +1,86 @@
+"""
+Per-call client overhead against a local stub server.
+
+Runs ``MockNowPaymentsServer`` on localhost and times the same request made
+with a bare ``requests.Session`` and through the client (``dict`` and model
+responses). The difference is what ``BaseAPI._request`` and parsing add to
+every call. The ``urllib3`` cases send the same calls through
+``Urllib3Transport``, bypassing the ``requests`` session. The ``replay`` cases serve a cassette recorded from the stub
+through ``ReplayTransport``, isolating client-side cost from the network.
+
+Usage:
+  python benchmarks/bench_client.py
+"""
+
+import os
+import tempfile
+from typing import Any, Dict, List
+
+import requests
+from _common import latency_us, result
+
+from nowpayment import NowPayments, RequestHooks
+from nowpayment.testing import MockNowPaymentsServer
+from nowpayment.transports import RecordingTransport, ReplayTransport, Urllib3Transport
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    number = 200 if quick else 2000
+    results: List[Dict[str, Any]] = []
+    with MockNowPaymentsServer(payments=100) as server:
+        headers = {"x-api-key": "bench", "Authorization": "Bearer bench"}
+        session = requests.Session()
+        client = NowPayments("bench", jwt_token="bench", base_url=server.base_url)
+        hooked = NowPayments(
+            "bench",
+            base_url=server.base_url,
+            hooks=RequestHooks(before_request=lambda event: None, after_response=lambda event: None),
+        )
+        lean = NowPayments("bench", jwt_token="bench", base_url=server.base_url, transport=Urllib3Transport())
+        status_url = f"{server.base_url}/status"
+        list_url = f"{server.base_url}/payment"
+        list_params = {"limit": 100, "page": 0, "sortBy": "created_at", "orderBy": "desc"}
+        cases = {
+            "status/requests": lambda: session.get(status_url, headers=headers).json(),
+            "status/client": lambda: client.get_api_status(),
+            "status/client-model": lambda: client.get_api_status(as_model=True),
+            "status/client-hooks": lambda: hooked.get_api_status(),
+            "status/urllib3": lambda: lean.get_api_status(),
+            "payment-list/requests": lambda: session.get(list_url, params=list_params, headers=headers).json(),
+            "payment-list/client": lambda: client.payment.get_payment_list(limit=100),
+            "payment-list/client-model": lambda: client.payment.get_payment_list(limit=100, as_model=True),
+            "payment-list/urllib3": lambda: lean.payment.get_payment_list(limit=100),
+        }
+        handle, cassette = tempfile.mkstemp(suffix=".ndjson")
+        os.close(handle)
+        with RecordingTransport(cassette) as recorder:
+            recording = NowPayments("bench", jwt_token="bench", base_url=server.base_url, transport=recorder)
+            recording.get_api_status()
+            recording.payment.get_payment_list(limit=100)
+        replay = NowPayments("bench", jwt_token="bench", base_url=server.base_url, transport=ReplayTransport(cassette))
+        os.unlink(cassette)
+        cases["status/replay"] = lambda: replay.get_api_status()
+        cases["payment-list/replay"] = lambda: replay.payment.get_payment_list(limit=100)
+        cases["payment-list/replay-model"] = lambda: replay.payment.get_payment_list(limit=100, as_model=True)
+        try:
+            for name, func in cases.items():
+                for _ in range(20):
+                    func()
+                stats = latency_us(func, number)
+                results.append(result(f"client.{name}", "median", stats["median"], "us"))
+                results.append(result(f"client.{name}", "p99", stats["p99"], "us"))
+        finally:
+            client.close()
+            hooked.close()
+            lean.transport.close()
+            session.close()
+    return results
+
+
+def main() -> None:
+    for record in run():
+        print(f"{record['name']:<36} {record['metric']:<7} {record['value']:10.1f} {record['unit']}")
+
+
+if __name__ == "__main__":
+    main()
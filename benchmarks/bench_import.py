@@ -0,0 +1,92 @@
+"""
+Cold import time of the package and its standalone entry points.
+
+Each module is imported in a fresh interpreter so caches from earlier imports
+do not hide the cost. ``--check`` fails when a lightweight entry point pulls
+in HTTP dependencies or exceeds its time budget, guarding the lazy-import
+layout against regressions.
+
+Usage:
+  python benchmarks/bench_import.py
+  python benchmarks/bench_import.py --check
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+from _common import result
+
+MODULES = (
+    "nowpayment",
+    "nowpayment.signatures",
+    "nowpayment.webhooks",
+    "nowpayment.webhooks.verification",
+    "nowpayment.models",
+    "nowpayment.client",
+)
+
+# Entry points that must stay free of HTTP dependencies, with time budgets.
+LIGHTWEIGHT_BUDGETS_MS = {
+    "nowpayment": 10.0,
+    "nowpayment.signatures": 25.0,
+    "nowpayment.webhooks": 10.0,
+    "nowpayment.webhooks.verification": 30.0,
+}
+HEAVY_MODULES = ("requests", "urllib3", "sqlite3")
+
+_PROBE = (
+    "import sys, time, json; started = time.perf_counter(); import {module}; "
+    "elapsed = time.perf_counter() - started; "
+    "print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))"
+)
+
+
+def probe(module: str) -> Dict[str, Any]:
+    output = subprocess.check_output([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)])
+    elapsed, heavy = json.loads(output)
+    return {"seconds": elapsed, "heavy": heavy}
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    repeat = 3 if quick else 10
+    results = []
+    for module in MODULES:
+        probes = [probe(module) for _ in range(repeat)]
+        best = min(item["seconds"] for item in probes)
+        results.append(result("import", "cold", best * 1e3, "ms", module=module))
+        results.append(result("import", "heavy_modules", len(probes[0]["heavy"]), "modules", module=module))
+    return results
+
+
+def check(records: List[Dict[str, Any]]) -> List[str]:
+    failures = []
+    for record in records:
+        module = record["params"]["module"]
+        if module not in LIGHTWEIGHT_BUDGETS_MS:
+            continue
+        if record["metric"] == "heavy_modules" and record["value"]:
+            failures.append(f"{module} imports HTTP/storage dependencies")
+        if record["metric"] == "cold" and record["value"] > LIGHTWEIGHT_BUDGETS_MS[module]:
+            failures.append(f"{module} took {record['value']:.1f} ms (budget {LIGHTWEIGHT_BUDGETS_MS[module]} ms)")
+    return failures
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold import time.")
+    parser.add_argument("--check", action="store_true", help="Fail when budgets are exceeded")
+    args = parser.parse_args(argv)
+    records = run()
+    for record in records:
+        if record["metric"] == "cold":
+            print(f"{record['params']['module']:<36} {record['value']:8.1f} ms")
+    failures = check(records) if args.check else []
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Parse time and memory of ``PaymentList`` and ``CurrencyList``.
+
+Decodes synthetic responses of several sizes with ``parse_response`` in each
+``raw_mode`` and reports time per parse and peak traced allocation.
+
+Usage:
+  python benchmarks/bench_models.py
+"""
+
+import json
+from typing import Any, Dict, List
+
+from _common import peak_bytes, per_call_us, result
+
+from nowpayment.constants import RAW_MODES
+from nowpayment.models import CurrencyList, PaymentList, parse_response
+
+STATUSES = ("waiting", "confirming", "finished", "failed", "expired")
+CURRENCIES = ("btc", "eth", "trx", "ltc", "usdttrc20")
+
+
+def payment_list_body(size: int) -> str:
+    data = [
+        {
+            "payment_id": 5_000_000_000 + index,
+            "invoice_id": None,
+            "payment_status": STATUSES[index % len(STATUSES)],
+            "pay_address": f"T{index:033d}",
+            "price_amount": 10 + index % 90,
+            "price_currency": "usd",
+            "pay_amount": 165.652609,
+            "actually_paid": 0,
+            "pay_currency": CURRENCIES[index % len(CURRENCIES)],
+            "order_id": f"order-{index}",
+            "order_description": "Benchmark order",
+            "purchase_id": str(6_000_000_000 + index),
+            "outcome_amount": 164.2896,
+            "outcome_currency": CURRENCIES[index % len(CURRENCIES)],
+            "created_at": "2024-01-01T00:00:00.000Z",
+            "updated_at": "2024-01-01T00:05:00.000Z",
+        }
+        for index in range(size)
+    ]
+    return json.dumps({"data": data, "limit": size, "page": 0, "pagesCount": 1, "total": size})
+
+
+def currency_list_body(size: int) -> str:
+    currencies = [
+        {
+            "id": index,
+            "code": f"C{index % 400}",
+            "name": f"Coin {index}",
+            "enable": True,
+            "wallet_regex": "^[a-zA-Z0-9]{26,42}$",
+            "priority": index,
+            "extra_id_exists": False,
+            "extra_id_regex": None,
+            "logo_url": f"/images/coins/c{index}.svg",
+            "track": True,
+            "cg_id": f"coin-{index}",
+            "is_maxlimit": False,
+            "network": CURRENCIES[index % len(CURRENCIES)],
+            "smart_contract": None,
+            "network_precision": None,
+        }
+        for index in range(size)
+    ]
+    return json.dumps({"currencies": currencies})
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    sizes = (10, 100, 1000) if quick else (10, 100, 1000, 10000)
+    results: List[Dict[str, Any]] = []
+    for model, build in ((PaymentList, payment_list_body), (CurrencyList, currency_list_body)):
+        for size in sizes:
+            body = build(size)
+            number = max(1, 20000 // size) if not quick else max(1, 2000 // size)
+            for raw_mode in RAW_MODES:
+                def parse(body=body, model=model, raw_mode=raw_mode):
+                    return parse_response(json.loads(body), model, True, raw_mode=raw_mode)
+
+                name = f"models.{model.__name__}"
+                results.append(result(
+                    name, "parse", per_call_us(parse, number, repeat=3), "us", size=size, raw_mode=raw_mode
+                ))
+                results.append(result(
+                    name, "peak_memory", peak_bytes(parse), "bytes", size=size, raw_mode=raw_mode
+                ))
+    return results
+
+
+def main() -> None:
+    for record in run():
+        params = " ".join(f"{key}={value}" for key, value in record["params"].items())
+        print(f"{record['name']:<22} {params:<24} {record['metric']:<12} {record['value']:14.1f} {record['unit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Per-callback cost of IPN signature computation and verification.
+
+Compares the original per-call implementation (re-keying HMAC and building a
+sorted dict on every callback) with ``PaymentSignatureVerifier``, on a flat
+payment IPN and on a nested one that previously had to be deep-sorted in
+Python before verification, and reports end-to-end ``verify_ipn_body``
+throughput from raw request bytes.
+
+Usage:
+  python benchmarks/bench_signatures.py
+"""
+
+import hashlib
+import hmac
+import json
+from typing import Any, Dict, List
+
+from _common import per_call_us, result
+
+from nowpayment.signatures import PaymentSignatureVerifier, compute_payment_signature
+from nowpayment.webhooks import IPN_SIGNATURE_HEADER, IPNVerifier, verify_ipn_body
+
+IPN_SECRET = "benchmark-ipn-secret"
+PAYLOAD = {
+    "payment_id": 5077125051,
+    "payment_status": "finished",
+    "pay_address": "TNDFkiSmBQorNFacb3735q8MnT29sn8BLn",
+    "price_amount": 10,
+    "price_currency": "usd",
+    "pay_amount": 165.652609,
+    "actually_paid": 165.652609,
+    "pay_currency": "trx",
+    "order_id": "order-5077125051",
+    "order_description": "Benchmark order",
+    "purchase_id": "6084744717",
+    "outcome_amount": 164.2896,
+    "outcome_currency": "trx",
+    "created_at": "2024-01-01T00:00:00.000Z",
+    "updated_at": "2024-01-01T00:05:00.000Z",
+}
+NESTED_PAYLOAD = {
+    **PAYLOAD,
+    "fee": {"serviceFee": 0.5, "depositFee": 0.85, "withdrawalFee": 0, "currency": "trx"},
+    "payin_extra_id": None,
+    "parent_payment_id": None,
+    "outcome": {"currency": "trx", "amount": 164.2896, "network": {"name": "tron", "code": "trx"}},
+}
+
+
+def legacy_compute(data: dict, ipn_secret: str) -> str:
+    request_data = dict(sorted(data.items()))
+    sorted_request_json = json.dumps(request_data, separators=(",", ":"))
+    return hmac.new(
+        ipn_secret.encode("utf-8"),
+        sorted_request_json.encode("utf-8"),
+        hashlib.sha512,
+    ).hexdigest()
+
+
+def _deep_sorted(value):
+    if isinstance(value, dict):
+        return {key: _deep_sorted(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [_deep_sorted(item) for item in value]
+    return value
+
+
+def run(quick: bool = False) -> List[Dict[str, Any]]:
+    number = 5000 if quick else 50000
+    verifier = PaymentSignatureVerifier(IPN_SECRET)
+    assert verifier.compute(PAYLOAD) == legacy_compute(PAYLOAD, IPN_SECRET)
+    assert verifier.compute(NESTED_PAYLOAD) == legacy_compute(
+        _deep_sorted(NESTED_PAYLOAD), IPN_SECRET
+    )
+
+    results: List[Dict[str, Any]] = []
+    for label, payload, legacy in (
+        ("flat", PAYLOAD, lambda: legacy_compute(PAYLOAD, IPN_SECRET)),
+        ("nested", NESTED_PAYLOAD, lambda: legacy_compute(_deep_sorted(NESTED_PAYLOAD), IPN_SECRET)),
+    ):
+        cases = {
+            "legacy": legacy,
+            "compute_payment_signature": lambda: compute_payment_signature(payload, IPN_SECRET),
+            "PaymentSignatureVerifier.compute": lambda: verifier.compute(payload),
+        }
+        for name, func in cases.items():
+            results.append(result(f"signatures.{name}", "per_call", per_call_us(func, number), "us", payload=label))
+
+        body = json.dumps(payload).encode("utf-8")
+        headers = {IPN_SIGNATURE_HEADER: verifier.compute(payload)}
+        ipn_verifier = IPNVerifier(IPN_SECRET)
+        cases = {
+            "verify_ipn_body": lambda: verify_ipn_body(body, headers, IPN_SECRET),
+            "IPNVerifier.verify_body": lambda: ipn_verifier.verify_body(body, headers),
+        }
+        for name, func in cases.items():
+            micros = per_call_us(func, number)
+            results.append(result(f"webhooks.{name}", "ops_per_sec", 1e6 / micros, "ops/s", payload=label))
+    return results
+
+
+def main() -> None:
+    records = run()
+    for label in ("flat", "nested"):
+        print(f"{label} payload")
+        rows = [record for record in records if record["params"]["payload"] == label]
+        baseline = next(record["value"] for record in rows if record["name"] == "signatures.legacy")
+        for record in rows:
+            if record["unit"] == "us":
+                speedup = baseline / record["value"]
+                print(f"  {record['name']:<44} {record['value']:8.2f} us/callback  {speedup:5.2f}x")
+            else:
+                print(f"  {record['name']:<44} {record['value']:10.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare two benchmark result files produced by ``run.py``.
+
+Prints the relative change of every result present in both files and exits
+with status 1 when any of them regressed by more than ``--threshold``.
+
+Usage:
+  python benchmarks/compare.py baseline.json candidate.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Units where a larger value is better; everything else is a cost.
+HIGHER_IS_BETTER = {"ops/s"}
+
+Key = Tuple[str, str, str]
+
+
+def _index(report: Dict[str, Any]) -> Dict[Key, Dict[str, Any]]:
+    return {
+        (record["name"], record["metric"], json.dumps(record["params"], sort_keys=True)): record
+        for record in report["results"]
+    }
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], threshold: float) -> int:
+    old, new = _index(baseline), _index(candidate)
+    regressions = 0
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key]["value"], new[key]["value"]
+        if not before:
+            continue
+        change = (after - before) / before
+        if new[key]["unit"] in HIGHER_IS_BETTER:
+            change = -change
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        name, metric, params = key
+        print(f"{name:<44} {metric:<12} {params:<40} {before:12.2f} -> {after:12.2f}  {change:+7.1%}{flag}")
+    print(f"{regressions} regression(s) over {threshold:.0%}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown (default 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.candidate, encoding="utf-8") as handle:
+        candidate = json.load(handle)
+    return compare(baseline, candidate, args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
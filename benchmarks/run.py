@@ -0,0 +1,68 @@
+"""
+Run the benchmark suite and write machine-readable results.
+
+Usage:
+  python benchmarks/run.py --output results/1.10.0.json
+  python benchmarks/run.py --quick --only signatures models
+  python benchmarks/compare.py results/1.9.0.json results/1.10.0.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import bench_client
+import bench_import
+import bench_models
+import bench_signatures
+
+import nowpayment
+
+SUITES = {
+    "client": bench_client,
+    "models": bench_models,
+    "signatures": bench_signatures,
+    "import": bench_import,
+}
+
+
+def run_suites(names: Sequence[str], quick: bool = False) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        started = time.perf_counter()
+        records = SUITES[name].run(quick=quick)
+        results.extend(records)
+        print(f"{name:<12} {len(records):4d} results in {time.perf_counter() - started:6.1f}s", file=sys.stderr)
+    return {
+        "nowpayment_version": nowpayment.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the nowpayment benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="Suites to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations and smaller sizes")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_suites(args.only or list(SUITES), quick=args.quick)
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(encoded + "\n")
+    else:
+        print(encoded)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,11 +10,10 @@ Expose with ngrok:
   # Use the ngrok URL as ipn_callback_url when creating payments
 """
 
-import json
 import os
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
-from nowpayment import IPNVerificationError, extract_ipn_signature, verify_ipn_payload
+from nowpayment import IPNVerificationError, verify_ipn_body
 
 
 class IPNHandler(BaseHTTPRequestHandler):
@@ -25,16 +24,7 @@ class IPNHandler(BaseHTTPRequestHandler):
         body = self.rfile.read(length)
 
         try:
-            payload = json.loads(body.decode("utf-8"))
-        except json.JSONDecodeError:
-            self.send_response(400)
-            self.end_headers()
-            self.wfile.write(b"Invalid JSON")
-            return
-
-        signature = extract_ipn_signature(self.headers)
-        try:
-            verified = verify_ipn_payload(payload, self.ipn_secret, signature)
+            verified = verify_ipn_body(body, self.headers, self.ipn_secret)
         except IPNVerificationError as exc:
             self.send_response(401)
             self.end_headers()
@@ -1,49 +1,86 @@
 """
 NowPayments.io Python Client
+
+Public names are resolved lazily on first access, so importing the package
+(or ``nowpayment.webhooks`` / ``nowpayment.signatures``) does not load
+``requests`` or the API modules until a client is actually used.
 """
 
 __version__ = "1.9.0"
 
-from typing import Optional, Union
-
-import requests
-
-from nowpayment.apis.billing import BillingAPI
-from nowpayment.apis.currencies import CurrencyAPI
-from nowpayment.apis.payment import PaymentAPI
-from nowpayment.apis.payout import PayoutAPI
-from nowpayment.apis.subscriptions import SubscriptionAPI
-from nowpayment.constants import PRODUCTION_BASE_URL, SANDBOX_BASE_URL
-from nowpayment.exceptions import NowPaymentsAPIError, NowPaymentsError
-from nowpayment.models import (
-    AddressValidation,
-    APIStatus,
-    AuthToken,
-    Balance,
-    Currency,
-    CurrencyList,
-    Estimate,
-    Invoice,
-    MinAmount,
-    Payment,
-    PaymentList,
-    Payout,
-    PayoutFee,
-    PayoutVerification,
-    Subscription,
-    SubscriptionList,
-    SubscriptionPlan,
-    SubscriptionPlanList,
-    WithdrawalModel,
-)
-from nowpayment.signatures import compute_payment_signature, verify_payment_signature
-from nowpayment.webhooks import IPNVerificationError, extract_ipn_signature, verify_ipn_payload
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "NowPayments": "nowpayment.client",
+    "BillingAPI": "nowpayment.apis.billing",
+    "CurrencyAPI": "nowpayment.apis.currencies",
+    "PaymentAPI": "nowpayment.apis.payment",
+    "PayoutAPI": "nowpayment.apis.payout",
+    "SubscriptionAPI": "nowpayment.apis.subscriptions",
+    "PRODUCTION_BASE_URL": "nowpayment.constants",
+    "SANDBOX_BASE_URL": "nowpayment.constants",
+    "ClientPool": "nowpayment.pool",
+    "RateLimiter": "nowpayment.ratelimit",
+    "request_priority": "nowpayment.ratelimit",
+    "DeadlineExceededError": "nowpayment.timeouts",
+    "Timeout": "nowpayment.timeouts",
+    "deadline": "nowpayment.timeouts",
+    "NowPaymentsAPIError": "nowpayment.exceptions",
+    "NowPaymentsError": "nowpayment.exceptions",
+    "ClientMetrics": "nowpayment.metrics",
+    "RequestEvent": "nowpayment.hooks",
+    "RequestHooks": "nowpayment.hooks",
+    "IPNReceiver": "nowpayment.webhooks.receiver",
+    "IPNVerificationError": "nowpayment.webhooks.verification",
+    "IPNVerifier": "nowpayment.webhooks.verification",
+    "extract_ipn_signature": "nowpayment.webhooks.verification",
+    "verify_ipn_body": "nowpayment.webhooks.verification",
+    "verify_ipn_payload": "nowpayment.webhooks.verification",
+    "compute_payment_signature": "nowpayment.signatures",
+    "verify_payment_signature": "nowpayment.signatures",
+    "AddressValidation": "nowpayment.models",
+    "APIStatus": "nowpayment.models",
+    "AuthToken": "nowpayment.models",
+    "Balance": "nowpayment.models",
+    "Currency": "nowpayment.models",
+    "CurrencyList": "nowpayment.models",
+    "Estimate": "nowpayment.models",
+    "Invoice": "nowpayment.models",
+    "MinAmount": "nowpayment.models",
+    "Payment": "nowpayment.models",
+    "PaymentList": "nowpayment.models",
+    "Payout": "nowpayment.models",
+    "PayoutFee": "nowpayment.models",
+    "PayoutVerification": "nowpayment.models",
+    "Subscription": "nowpayment.models",
+    "SubscriptionList": "nowpayment.models",
+    "SubscriptionPlan": "nowpayment.models",
+    "SubscriptionPlanList": "nowpayment.models",
+    "WithdrawalModel": "nowpayment.models",
+}
 
 __all__ = [
     "NowPayments",
+    "BillingAPI",
+    "CurrencyAPI",
+    "PaymentAPI",
+    "PayoutAPI",
+    "SubscriptionAPI",
+    "PRODUCTION_BASE_URL",
+    "SANDBOX_BASE_URL",
+    "ClientPool",
+    "ClientMetrics",
+    "RateLimiter",
+    "Timeout",
+    "DeadlineExceededError",
+    "RequestEvent",
+    "RequestHooks",
     "NowPaymentsAPIError",
     "NowPaymentsError",
+    "IPNReceiver",
     "IPNVerificationError",
+    "IPNVerifier",
     "APIStatus",
     "AddressValidation",
     "AuthToken",
@@ -63,93 +100,70 @@ __all__ = [
     "SubscriptionPlan",
     "SubscriptionPlanList",
     "WithdrawalModel",
+    "compute_payment_signature",
+    "deadline",
     "extract_ipn_signature",
+    "request_priority",
+    "verify_ipn_body",
     "verify_ipn_payload",
+    "verify_payment_signature",
     "__version__",
 ]
 
-
-class NowPayments:
-
-    def __init__(
-        self,
-        api_key: str,
-        jwt_token: Optional[str] = None,
-        timeout: Optional[Union[int, float]] = None,
-        sandbox: bool = False,
-        session: Optional[requests.Session] = None,
-    ):
-        self.api_key = api_key
-        self.jwt_token = jwt_token
-        self.timeout = timeout
-        self.sandbox = sandbox
-        self.base_url = SANDBOX_BASE_URL if sandbox else PRODUCTION_BASE_URL
-        self._session = session
-        self._owns_session = session is None
-
-    @property
-    def session(self) -> requests.Session:
-        if self._session is None:
-            self._session = requests.Session()
-        return self._session
-
-    def _client_kwargs(self) -> dict:
-        return {
-            "api_key": self.api_key,
-            "jwt_token": self.jwt_token,
-            "timeout": self.timeout,
-            "base_url": self.base_url,
-            "session": self.session,
-        }
-
-    @property
-    def payment(self) -> PaymentAPI:
-        return PaymentAPI(**self._client_kwargs())
-
-    @property
-    def currency(self) -> CurrencyAPI:
-        return CurrencyAPI(**self._client_kwargs())
-
-    @property
-    def payout(self) -> PayoutAPI:
-        return PayoutAPI(**self._client_kwargs())
-
-    @property
-    def billing(self) -> BillingAPI:
-        return BillingAPI(**self._client_kwargs())
-
-    @property
-    def subscription(self) -> SubscriptionAPI:
-        return SubscriptionAPI(**self._client_kwargs())
-
-    def close(self) -> None:
-        if self._owns_session and self._session is not None:
-            self._session.close()
-            self._session = None
-
-    def __enter__(self) -> "NowPayments":
-        return self
-
-    def __exit__(self, exc_type, exc, tb) -> None:
-        self.close()
-
-    def get_api_status(self, as_model: bool = False) -> Union[dict, APIStatus]:
-        """
-        Obtain information about the status of the API.
-
-        :param as_model: When True, return an ``APIStatus`` model.
-        :return: API status.
-        """
-        return self.payment.get_api_status(as_model=as_model)
-
-    @staticmethod
-    def compute_payment_signature(data: dict, ipn_secret: str) -> str:
-        return compute_payment_signature(data, ipn_secret)
-
-    @staticmethod
-    def verify_payment_signature(
-        data: dict,
-        ipn_secret: str,
-        signature: Optional[str] = None,
-    ) -> Union[str, bool]:
-        return verify_payment_signature(data, ipn_secret, signature)
+if TYPE_CHECKING:
+    from nowpayment.apis.billing import BillingAPI
+    from nowpayment.apis.currencies import CurrencyAPI
+    from nowpayment.apis.payment import PaymentAPI
+    from nowpayment.apis.payout import PayoutAPI
+    from nowpayment.apis.subscriptions import SubscriptionAPI
+    from nowpayment.client import NowPayments
+    from nowpayment.constants import PRODUCTION_BASE_URL, SANDBOX_BASE_URL
+    from nowpayment.exceptions import NowPaymentsAPIError, NowPaymentsError
+    from nowpayment.hooks import RequestEvent, RequestHooks
+    from nowpayment.metrics import ClientMetrics
+    from nowpayment.models import (
+        AddressValidation,
+        APIStatus,
+        AuthToken,
+        Balance,
+        Currency,
+        CurrencyList,
+        Estimate,
+        Invoice,
+        MinAmount,
+        Payment,
+        PaymentList,
+        Payout,
+        PayoutFee,
+        PayoutVerification,
+        Subscription,
+        SubscriptionList,
+        SubscriptionPlan,
+        SubscriptionPlanList,
+        WithdrawalModel,
+    )
+    from nowpayment.pool import ClientPool
+    from nowpayment.ratelimit import RateLimiter, request_priority
+    from nowpayment.signatures import compute_payment_signature, verify_payment_signature
+    from nowpayment.timeouts import DeadlineExceededError, Timeout, deadline
+    from nowpayment.webhooks.receiver import IPNReceiver
+    from nowpayment.webhooks.verification import (
+        IPNVerificationError,
+        IPNVerifier,
+        extract_ipn_signature,
+        verify_ipn_body,
+        verify_ipn_payload,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,9 +1,47 @@
-from typing import Any, Dict, Optional, Union
+import time
+from typing import Any, Dict, Optional, Type, TypeVar, Union
 
 import requests
 
-from nowpayment.constants import PRODUCTION_BASE_URL
+from nowpayment.constants import PRODUCTION_BASE_URL, RAW_KEEP, RAW_MODES, SESSION_PROCESS
 from nowpayment.exceptions import NowPaymentsAPIError
+from nowpayment.hooks import (
+    AFTER_PARSE,
+    AFTER_RESPONSE,
+    BEFORE_REQUEST,
+    ON_ERROR,
+    ON_RETRY,
+    RequestEvent,
+    RequestHooks,
+)
+from nowpayment.metrics import (
+    PHASE_CONNECT,
+    PHASE_PARSE,
+    PHASE_READ,
+    PHASE_TOTAL,
+    PHASE_WAIT,
+    STATUS_ERROR,
+    ClientMetrics,
+    endpoint_template,
+)
+from nowpayment.models import BaseResponse, parse_response
+from nowpayment.ratelimit import PRIORITY_NORMAL, RateLimiter, current_priority
+from nowpayment.timeouts import (
+    Deadline,
+    DeadlineExceededError,
+    Timeout,
+    TimeoutSpec,
+    attempt_timeout,
+    current_deadline,
+)
+from nowpayment.transports.base import RequestsTransport, Transport
+
+T = TypeVar("T", bound=BaseResponse)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+RETRY_ALWAYS_STATUSES = frozenset({429, 503})
+RETRY_IDEMPOTENT_STATUSES = frozenset({500, 502, 504})
+MAX_RETRY_AFTER = 60.0
 
 
 class BaseAPI:
@@ -13,24 +51,57 @@ class BaseAPI:
         self,
         api_key: str,
         jwt_token: Optional[str] = None,
-        timeout: Optional[Union[int, float]] = None,
+        timeout: TimeoutSpec = None,
         base_url: str = PRODUCTION_BASE_URL,
         session: Optional[requests.Session] = None,
+        raw_mode: str = RAW_KEEP,
+        metrics: Optional[ClientMetrics] = None,
+        hooks: Optional[RequestHooks] = None,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        transport: Optional[Transport] = None,
+        session_scope: str = SESSION_PROCESS,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: str = PRIORITY_NORMAL,
     ):
+        if raw_mode not in RAW_MODES:
+            raise ValueError(f"raw_mode must be one of {', '.join(RAW_MODES)}")
         self.api_key = api_key
         self.jwt_token = jwt_token
         self.timeout = timeout
         self.base_url = base_url.rstrip("/")
         self._session = session
         self._owns_session = session is None
+        self.raw_mode = raw_mode
+        self.metrics = metrics
+        self.hooks = hooks
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._transport = transport
+        self._owns_transport = transport is None
+        self.session_scope = session_scope
+        self.rate_limiter = rate_limiter
+        self.priority = priority
 
     @property
     def session(self) -> requests.Session:
+        transport = self.transport
+        if isinstance(transport, RequestsTransport):
+            return transport.session
         if self._session is None:
             self._session = requests.Session()
         return self._session
 
+    @property
+    def transport(self) -> Transport:
+        if self._transport is None:
+            self._transport = RequestsTransport(self._session, scope=self.session_scope)
+        return self._transport
+
     def close(self) -> None:
+        if self._owns_transport and self._transport is not None:
+            self._transport.close()
+            self._transport = None
         if self._owns_session and self._session is not None:
             self._session.close()
             self._session = None
@@ -77,6 +148,7 @@ class BaseAPI:
         method: str,
         path: str,
         headers: Optional[dict] = None,
+        typed: bool = False,
         **kwargs,
     ) -> Dict[str, Any]:
         """
@@ -85,18 +157,222 @@ class BaseAPI:
         :param method: HTTP method.
         :param path: API path relative to the base URL.
         :param headers: Optional headers merged into defaults.
+        :param typed: The caller passes the response to ``_parse_model``
+            next, which reports it to ``after_parse`` hooks.
         :param kwargs: Additional arguments passed to requests.
         :return: Parsed API response.
         """
         url = f"{self.base_url}/{path.lstrip('/')}"
-        response = self.session.request(
+        hooks = self.hooks if self.hooks else None
+        event: Optional[RequestEvent] = None
+        if hooks is not None:
+            event = RequestEvent(method, endpoint_template(path), path, kwargs.get("params"), kwargs.get("json"))
+        budget = current_deadline()
+        priority = current_priority() or self.priority
+        first_started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt += 1
+            timeout = self.timeout
+            if budget is not None:
+                if self.rate_limiter is not None and not self.rate_limiter.acquire(budget.remaining(), priority):
+                    self._deadline_exceeded(hooks, event, path, first_started)
+                remaining = budget.remaining()
+                if remaining <= 0:
+                    self._deadline_exceeded(hooks, event, path, first_started)
+                timeout = attempt_timeout(timeout, remaining)
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.acquire(priority=priority)
+                if isinstance(timeout, Timeout):
+                    timeout = timeout.as_tuple()
+            if event is not None:
+                event.attempt = attempt
+                hooks.emit(BEFORE_REQUEST, event)
+            started = time.perf_counter()
+            try:
+                response = self.transport.request(
+                    method,
+                    url,
+                    headers=self._build_headers(headers),
+                    timeout=timeout,
+                    **kwargs,
+                )
+            except requests.RequestException as exc:
+                if self.metrics is not None:
+                    self.metrics.record(method, path, STATUS_ERROR, phases={PHASE_TOTAL: time.perf_counter() - started})
+                if budget is not None and budget.expired:
+                    self._deadline_exceeded(hooks, event, path, first_started, exc)
+                delay = self._retry_delay(method, attempt, None, exc, budget)
+                if delay is None:
+                    if event is not None:
+                        self._emit_error(hooks, event, exc, started, first_started)
+                    raise
+                self._wait_retry(hooks, event, exc, delay)
+                continue
+
+            received = time.perf_counter()
+            self.transport.last_activity = time.monotonic()
+            delay = self._retry_delay(method, attempt, response, None, budget)
+            if delay is not None:
+                if self.metrics is not None:
+                    self._record_metrics(method, path, response, started, received)
+                self._wait_retry(hooks, event, None, delay, response.status_code)
+                continue
+
+            if self.metrics is None and event is None:
+                return self._parse_response(response)
+            try:
+                data = self._parse_response(response)
+            except NowPaymentsAPIError as exc:
+                if event is not None:
+                    event.status_code = response.status_code
+                    self._emit_error(hooks, event, exc, started, first_started, received)
+                raise
+            finally:
+                if self.metrics is not None:
+                    self._record_metrics(method, path, response, started, received)
+            if event is not None:
+                finished = time.perf_counter()
+                event.status_code = response.status_code
+                event.timings.update(request=received - started, decode=finished - received, total=finished - first_started)
+                hooks.emit(AFTER_RESPONSE, event)
+                if typed:
+                    hooks.bind(event)
+            return data
+
+    def _retry_delay(
+        self,
+        method: str,
+        attempt: int,
+        response: Optional[requests.Response],
+        error: Optional[BaseException],
+        budget: Optional[Deadline] = None,
+    ) -> Optional[float]:
+        """Return seconds to wait before retrying, or ``None`` to give up."""
+        if attempt > self.max_retries:
+            return None
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        delay = self.retry_backoff * (2 ** (attempt - 1))
+        if response is not None:
+            status = response.status_code
+            # 429 and 503 mean the request was not processed, so any method
+            # can be repeated; other gateway errors only for idempotent ones.
+            if status not in RETRY_ALWAYS_STATUSES and not (idempotent and status in RETRY_IDEMPOTENT_STATUSES):
+                return None
+            retry_after = response.headers.get("Retry-After") if response.headers else None
+            if retry_after:
+                try:
+                    delay = min(float(retry_after), MAX_RETRY_AFTER)
+                except ValueError:
+                    pass
+        elif not (idempotent and isinstance(error, (requests.ConnectionError, requests.Timeout))):
+            return None
+        # A retry that cannot start before the deadline would only fail later.
+        if budget is not None and delay >= budget.remaining():
+            return None
+        return delay
+
+    def _wait_retry(
+        self,
+        hooks: Optional[RequestHooks],
+        event: Optional[RequestEvent],
+        error: Optional[BaseException],
+        delay: float,
+        status_code: Optional[int] = None,
+    ) -> None:
+        if event is not None:
+            event.status_code = status_code
+            event.error = error
+            event.retry_delay = delay
+            hooks.emit(ON_RETRY, event)
+            event.error = None
+            event.retry_delay = None
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _deadline_exceeded(
+        hooks: Optional[RequestHooks],
+        event: Optional[RequestEvent],
+        path: str,
+        first_started: float,
+        cause: Optional[BaseException] = None,
+    ) -> None:
+        error = DeadlineExceededError(f"Deadline exceeded calling {path}")
+        if event is not None:
+            finished = time.perf_counter()
+            event.error = error
+            event.timings["total"] = finished - first_started
+            hooks.emit(ON_ERROR, event)
+        raise error from cause
+
+    @staticmethod
+    def _emit_error(
+        hooks: RequestHooks,
+        event: RequestEvent,
+        error: BaseException,
+        started: float,
+        first_started: float,
+        received: Optional[float] = None,
+    ) -> None:
+        finished = time.perf_counter()
+        event.error = error
+        event.timings.update(request=(received or finished) - started, total=finished - first_started)
+        hooks.emit(ON_ERROR, event)
+
+    def _record_metrics(
+        self,
+        method: str,
+        path: str,
+        response: requests.Response,
+        started: float,
+        received: float,
+    ) -> None:
+        # ``Response.elapsed`` runs from sending the request to parsing the
+        # response headers, so it covers connection setup and server wait;
+        # the rest of the call is spent reading the body. Transports that
+        # time connection setup report it as ``connect_time``.
+        finished = time.perf_counter()
+        transfer = received - started
+        wait = min(response.elapsed.total_seconds(), transfer)
+        phases = {
+            PHASE_WAIT: wait,
+            PHASE_READ: transfer - wait,
+            PHASE_PARSE: finished - received,
+            PHASE_TOTAL: finished - started,
+        }
+        connect = getattr(response, "connect_time", None)
+        if connect is not None:
+            connect = min(connect, wait)
+            phases[PHASE_CONNECT] = connect
+            phases[PHASE_WAIT] = wait - connect
+        body = response.request.body if response.request is not None else None
+        self.metrics.record(
             method,
-            url,
-            headers=self._build_headers(headers),
-            timeout=self.timeout,
-            **kwargs,
+            path,
+            response.status_code,
+            bytes_out=len(body) if body else 0,
+            bytes_in=len(response.content or b""),
+            phases=phases,
         )
-        return self._parse_response(response)
+
+    def _parse_model(
+        self,
+        data: Dict[str, Any],
+        model: Type[T],
+        as_model: bool,
+    ) -> Union[Dict[str, Any], T]:
+        if not self.hooks:
+            return parse_response(data, model, as_model, raw_mode=self.raw_mode)
+        event = self.hooks.pop_bound()
+        started = time.perf_counter()
+        parsed = parse_response(data, model, as_model, raw_mode=self.raw_mode)
+        if event is not None:
+            event.model_type = model if as_model else dict
+            event.timings["parse"] = time.perf_counter() - started
+            self.hooks.emit(AFTER_PARSE, event)
+        return parsed
 
     def get_api_status(self) -> dict:
         """Return the current API status."""
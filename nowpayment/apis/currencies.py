@@ -1,7 +1,7 @@
 from typing import Union
 
 from nowpayment.apis import BaseAPI
-from nowpayment.models import CurrencyList, parse_response
+from nowpayment.models import CurrencyList
 
 
 class CurrencyAPI(BaseAPI):
@@ -20,8 +20,8 @@ class CurrencyAPI(BaseAPI):
         params = {}
         if 'fixed_rate' in kwargs:
             params['fixed_rate'] = kwargs['fixed_rate']
-        data = self._request('GET', "currencies", params=params)
-        return parse_response(data, CurrencyList, as_model)
+        data = self._request('GET', "currencies", params=params, typed=True)
+        return self._parse_model(data, CurrencyList, as_model)
 
     def get_available_currencies_v2(
         self,
@@ -33,8 +33,8 @@ class CurrencyAPI(BaseAPI):
         :param as_model: When True, return a ``CurrencyList`` model.
         :return: Detailed currency list.
         """
-        data = self._request('GET', "full-currencies")
-        return parse_response(data, CurrencyList, as_model)
+        data = self._request('GET', "full-currencies", typed=True)
+        return self._parse_model(data, CurrencyList, as_model)
 
     def get_available_checked_currencies(
         self,
@@ -50,5 +50,5 @@ class CurrencyAPI(BaseAPI):
         params = {}
         if 'fixed_rate' in kwargs:
             params['fixed_rate'] = kwargs['fixed_rate']
-        data = self._request('GET', "merchant/coins", params=params)
-        return parse_response(data, CurrencyList, as_model)
+        data = self._request('GET', "merchant/coins", params=params, typed=True)
+        return self._parse_model(data, CurrencyList, as_model)
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Any, Dict, Iterator, Union
 
 from nowpayment.apis import BaseAPI
 from nowpayment.decorators import jwt_required
@@ -9,8 +9,8 @@ from nowpayment.models import (
     MinAmount,
     Payment,
     PaymentList,
-    parse_response,
 )
+from nowpayment.timeouts import current_deadline, deadline
 
 
 class PaymentAPI(BaseAPI):
@@ -38,8 +38,8 @@ class PaymentAPI(BaseAPI):
             "currency_to": to_currency,
             **kwargs
         }
-        data = self._request('GET', "estimate", params=params)
-        return parse_response(data, Estimate, as_model)
+        data = self._request('GET', "estimate", params=params, typed=True)
+        return self._parse_model(data, Estimate, as_model)
 
     def create_payment(
             self,
@@ -70,8 +70,8 @@ class PaymentAPI(BaseAPI):
             "ipn_callback_url": ipn_callback_url,
             **kwargs
         }
-        response = self._request('POST', "payment", json=data)
-        return parse_response(response, Payment, as_model)
+        response = self._request('POST', "payment", json=data, typed=True)
+        return self._parse_model(response, Payment, as_model)
 
     def create_invoice_payment(
             self,
@@ -93,8 +93,8 @@ class PaymentAPI(BaseAPI):
             "pay_currency": pay_currency,
             **kwargs
         }
-        response = self._request('POST', "invoice-payment", json=data)
-        return parse_response(response, Payment, as_model)
+        response = self._request('POST', "invoice-payment", json=data, typed=True)
+        return self._parse_model(response, Payment, as_model)
 
     def get_payment_estimated(
             self,
@@ -108,8 +108,8 @@ class PaymentAPI(BaseAPI):
         :param as_model: When True, return a ``Payment`` model.
         :return: Payment estimate response.
         """
-        data = self._request('POST', f"payment/{payment_id}/update-merchant-estimate")
-        return parse_response(data, Payment, as_model)
+        data = self._request('POST', f"payment/{payment_id}/update-merchant-estimate", typed=True)
+        return self._parse_model(data, Payment, as_model)
 
     def get_payment_status(
             self,
@@ -123,8 +123,8 @@ class PaymentAPI(BaseAPI):
         :param as_model: When True, return a ``Payment`` model.
         :return: Payment status response.
         """
-        data = self._request('GET', f"payment/{payment_id}")
-        return parse_response(data, Payment, as_model)
+        data = self._request('GET', f"payment/{payment_id}", typed=True)
+        return self._parse_model(data, Payment, as_model)
 
     def get_minimum_payment_amount(
             self,
@@ -147,8 +147,8 @@ class PaymentAPI(BaseAPI):
             "fiat_equivalent": "usd",
             **kwargs
         }
-        data = self._request('GET', "min-amount", params=params)
-        return parse_response(data, MinAmount, as_model)
+        data = self._request('GET', "min-amount", params=params, typed=True)
+        return self._parse_model(data, MinAmount, as_model)
 
     @jwt_required
     def get_payment_list(
@@ -183,8 +183,59 @@ class PaymentAPI(BaseAPI):
             "dateTo": date_to,
             **kwargs
         }
-        data = self._request('GET', "payment", params=params)
-        return parse_response(data, PaymentList, as_model)
+        data = self._request('GET', "payment", params=params, typed=True)
+        return self._parse_model(data, PaymentList, as_model)
+
+    @jwt_required
+    def iter_payment_pages(
+            self,
+            limit: int = 100,
+            start_page: int = 0,
+            sort_by: str = 'created_at',
+            order_by: str = 'desc',
+            date_from: str = None,
+            date_to: str = None,
+            as_model: bool = False,
+            **kwargs
+    ) -> Iterator[Union[Dict[str, Any], PaymentList]]:
+        """
+        Iterate over payment list pages until the last page is reached.
+
+        :param limit: Page size.
+        :param start_page: First page to fetch.
+        :param sort_by: Sort by.
+        :param order_by: Order by.
+        :param date_from: Date from. e.g. "2019-01-01"
+        :param date_to: Date to. e.g. "2019-01-01"
+        :param as_model: When True, yield ``PaymentList`` models.
+        :return: Iterator of payment list pages. A ``deadline()`` active when
+            iteration starts applies to every page, even if later pages are
+            fetched outside its ``with`` block.
+        """
+        budget = current_deadline()
+        page = start_page
+        while True:
+            params = {
+                "limit": limit,
+                "page": page,
+                "sortBy": sort_by,
+                "orderBy": order_by,
+                "dateFrom": date_from,
+                "dateTo": date_to,
+                **kwargs
+            }
+            with deadline(budget):
+                data = self._request('GET', "payment", params=params, typed=True)
+            items = data.get("data") or []
+            yield self._parse_model(data, PaymentList, as_model)
+            pages_count = data.get("pagesCount") or data.get("pages_count")
+            if not items:
+                return
+            if pages_count is not None and page + 1 >= pages_count:
+                return
+            if pages_count is None and len(items) < limit:
+                return
+            page += 1
 
     def create_invoice(
             self,
@@ -206,9 +257,9 @@ class PaymentAPI(BaseAPI):
             "price_currency": price_currency,
             **kwargs
         }
-        response = self._request('POST', 'invoice', json=data)
-        return parse_response(response, Invoice, as_model)
+        response = self._request('POST', 'invoice', json=data, typed=True)
+        return self._parse_model(response, Invoice, as_model)
 
     def get_api_status(self, as_model: bool = False) -> Union[dict, APIStatus]:
-        data = super().get_api_status()
-        return parse_response(data, APIStatus, as_model)
+        data = self._request("GET", "status", typed=True)
+        return self._parse_model(data, APIStatus, as_model)
@@ -10,7 +10,6 @@ from nowpayment.models import (
     PayoutFee,
     PayoutVerification,
     WithdrawalModel,
-    parse_response,
 )
 
 
@@ -34,8 +33,8 @@ class PayoutAPI(BaseAPI):
             'email': email,
             'password': password
         }
-        response = self._request('POST', "auth", json=data)
-        return parse_response(response, AuthToken, as_model)
+        response = self._request('POST', "auth", json=data, typed=True)
+        return self._parse_model(response, AuthToken, as_model)
 
     @jwt_required
     def create_payout(
@@ -68,8 +67,9 @@ class PayoutAPI(BaseAPI):
                 "ipn_callback_url": ipn_callback_url,
                 "withdrawals": withdrawals,
             },
+            typed=True,
         )
-        return parse_response(response, Payout, as_model)
+        return self._parse_model(response, Payout, as_model)
 
     def get_payout_status(
         self,
@@ -83,8 +83,8 @@ class PayoutAPI(BaseAPI):
         :param as_model: When True, return a ``Payout`` model.
         :return: Payout status response.
         """
-        data = self._request('GET', f"payout/{payout_id}")
-        return parse_response(data, Payout, as_model)
+        data = self._request('GET', f"payout/{payout_id}", typed=True)
+        return self._parse_model(data, Payout, as_model)
 
     def get_balance(self, as_model: bool = False) -> Union[dict, Balance]:
         """
@@ -93,10 +93,8 @@ class PayoutAPI(BaseAPI):
         :param as_model: When True, return a ``Balance`` model.
         :return: Balance response.
         """
-        data = self._request('GET', "balance")
-        if as_model:
-            return Balance.from_dict(data)
-        return data
+        data = self._request('GET', "balance", typed=True)
+        return self._parse_model(data, Balance, as_model)
 
     def validate_address(
         self,
@@ -117,8 +115,8 @@ class PayoutAPI(BaseAPI):
         payload = {"address": address, "currency": currency}
         if extra_id is not None:
             payload["extra_id"] = extra_id
-        data = self._request('POST', "payout/validate-address", json=payload)
-        return parse_response(data, AddressValidation, as_model)
+        data = self._request('POST', "payout/validate-address", json=payload, typed=True)
+        return self._parse_model(data, AddressValidation, as_model)
 
     def get_payout_fee(
         self,
@@ -135,8 +133,8 @@ class PayoutAPI(BaseAPI):
         :return: Fee estimate response.
         """
         params = {"currency": currency, "amount": amount}
-        data = self._request('GET', "payout/fee", params=params)
-        return parse_response(data, PayoutFee, as_model)
+        data = self._request('GET', "payout/fee", params=params, typed=True)
+        return self._parse_model(data, PayoutFee, as_model)
 
     @jwt_required
     def cancel_payout(
@@ -151,8 +149,8 @@ class PayoutAPI(BaseAPI):
         :param as_model: When True, return a ``PayoutVerification`` model.
         :return: Cancellation response.
         """
-        data = self._request('POST', f"payout/{withdrawal_id}/cancel")
-        return parse_response(data, PayoutVerification, as_model)
+        data = self._request('POST', f"payout/{withdrawal_id}/cancel", typed=True)
+        return self._parse_model(data, PayoutVerification, as_model)
 
     @jwt_required
     def verify_payout(
@@ -179,5 +177,6 @@ class PayoutAPI(BaseAPI):
             'POST',
             f"payout/{batch_id}/verify",
             json={"verification_code": verification_code},
+            typed=True,
         )
-        return parse_response(data, PayoutVerification, as_model)
+        return self._parse_model(data, PayoutVerification, as_model)
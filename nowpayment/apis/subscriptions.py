@@ -7,7 +7,6 @@ from nowpayment.models import (
     SubscriptionList,
     SubscriptionPlan,
     SubscriptionPlanList,
-    parse_response,
 )
 
 
@@ -40,8 +39,8 @@ class SubscriptionAPI(BaseAPI):
             "currency": currency,
             **kwargs,
         }
-        response = self._request('POST', "subscriptions/plans", json=data)
-        return parse_response(response, SubscriptionPlan, as_model)
+        response = self._request('POST', "subscriptions/plans", json=data, typed=True)
+        return self._parse_model(response, SubscriptionPlan, as_model)
 
     def get_plans(
         self,
@@ -62,8 +61,8 @@ class SubscriptionAPI(BaseAPI):
             params["limit"] = limit
         if offset is not None:
             params["offset"] = offset
-        data = self._request('GET', "subscriptions/plans", params=params)
-        return parse_response(data, SubscriptionPlanList, as_model)
+        data = self._request('GET', "subscriptions/plans", params=params, typed=True)
+        return self._parse_model(data, SubscriptionPlanList, as_model)
 
     def get_plan(
         self,
@@ -77,8 +76,8 @@ class SubscriptionAPI(BaseAPI):
         :param as_model: When True, return a ``SubscriptionPlan`` model.
         :return: Plan response.
         """
-        data = self._request('GET', f"subscriptions/plans/{plan_id}")
-        return parse_response(data, SubscriptionPlan, as_model)
+        data = self._request('GET', f"subscriptions/plans/{plan_id}", typed=True)
+        return self._parse_model(data, SubscriptionPlan, as_model)
 
     @jwt_required
     def update_plan(
@@ -95,8 +94,8 @@ class SubscriptionAPI(BaseAPI):
         :param updates: Fields to update (title, amount, interval_day, etc).
         :return: Updated plan response.
         """
-        data = self._request('PATCH', f"subscriptions/plans/{plan_id}", json=updates)
-        return parse_response(data, SubscriptionPlan, as_model)
+        data = self._request('PATCH', f"subscriptions/plans/{plan_id}", json=updates, typed=True)
+        return self._parse_model(data, SubscriptionPlan, as_model)
 
     @jwt_required
     def create_subscription(
@@ -128,8 +127,8 @@ class SubscriptionAPI(BaseAPI):
             data["email"] = email
         if sub_partner_id is not None:
             data["sub_partner_id"] = sub_partner_id
-        response = self._request('POST', "subscriptions", json=data)
-        return parse_response(response, Subscription, as_model)
+        response = self._request('POST', "subscriptions", json=data, typed=True)
+        return self._parse_model(response, Subscription, as_model)
 
     def get_subscriptions(
         self,
@@ -162,8 +161,8 @@ class SubscriptionAPI(BaseAPI):
             params["limit"] = limit
         if offset is not None:
             params["offset"] = offset
-        data = self._request('GET', "subscriptions", params=params)
-        return parse_response(data, SubscriptionList, as_model)
+        data = self._request('GET', "subscriptions", params=params, typed=True)
+        return self._parse_model(data, SubscriptionList, as_model)
 
     def get_subscription(
         self,
@@ -177,8 +176,8 @@ class SubscriptionAPI(BaseAPI):
         :param as_model: When True, return a ``Subscription`` model.
         :return: Subscription response.
         """
-        data = self._request('GET', f"subscriptions/{subscription_id}")
-        return parse_response(data, Subscription, as_model)
+        data = self._request('GET', f"subscriptions/{subscription_id}", typed=True)
+        return self._parse_model(data, Subscription, as_model)
 
     @jwt_required
     def delete_subscription(
@@ -0,0 +1,174 @@
+from typing import Optional, Union
+
+import requests
+
+from nowpayment.apis.billing import BillingAPI
+from nowpayment.apis.currencies import CurrencyAPI
+from nowpayment.apis.payment import PaymentAPI
+from nowpayment.apis.payout import PayoutAPI
+from nowpayment.apis.subscriptions import SubscriptionAPI
+from nowpayment.constants import (
+    PRODUCTION_BASE_URL,
+    RAW_KEEP,
+    RAW_MODES,
+    SANDBOX_BASE_URL,
+    SESSION_PROCESS,
+)
+from nowpayment.hooks import RequestHooks
+from nowpayment.metrics import ClientMetrics
+from nowpayment.models import APIStatus
+from nowpayment.ratelimit import PRIORITIES, PRIORITY_NORMAL, RateLimiter
+from nowpayment.signatures import compute_payment_signature, verify_payment_signature
+from nowpayment.timeouts import TimeoutSpec
+from nowpayment.transports.base import RequestsTransport, Transport
+from nowpayment.warmup import DEFAULT_WARM_UP_TIMEOUT, KeepAlive, warm_up
+
+
+class NowPayments:
+
+    def __init__(
+        self,
+        api_key: str,
+        jwt_token: Optional[str] = None,
+        timeout: TimeoutSpec = None,
+        sandbox: bool = False,
+        session: Optional[requests.Session] = None,
+        raw_mode: str = RAW_KEEP,
+        base_url: Optional[str] = None,
+        metrics: Union[bool, ClientMetrics, None] = None,
+        hooks: Optional[RequestHooks] = None,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+        transport: Optional[Transport] = None,
+        session_scope: str = SESSION_PROCESS,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: str = PRIORITY_NORMAL,
+        warm_connections: int = 0,
+        keepalive_interval: Optional[float] = None,
+    ):
+        if raw_mode not in RAW_MODES:
+            raise ValueError(f"raw_mode must be one of {', '.join(RAW_MODES)}")
+        self.api_key = api_key
+        self.jwt_token = jwt_token
+        self.timeout = timeout
+        self.sandbox = sandbox
+        self.base_url = base_url or (SANDBOX_BASE_URL if sandbox else PRODUCTION_BASE_URL)
+        self._requests_transport = RequestsTransport(session, scope=session_scope)
+        self.raw_mode = raw_mode
+        self.metrics: Optional[ClientMetrics] = ClientMetrics() if metrics is True else (metrics or None)
+        self.hooks = hooks if hooks is not None else RequestHooks()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.transport = transport
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        self._keepalive: Optional[KeepAlive] = None
+        if warm_connections:
+            self.warm_up(warm_connections, timeout=DEFAULT_WARM_UP_TIMEOUT)
+        if keepalive_interval is not None:
+            self.start_keepalive(keepalive_interval, connections=max(1, warm_connections))
+
+    @property
+    def session(self) -> requests.Session:
+        """Session of the default transport for the calling process (and thread)."""
+        return self._requests_transport.session
+
+    @property
+    def _active_transport(self) -> Transport:
+        return self.transport if self.transport is not None else self._requests_transport
+
+    def _client_kwargs(self) -> dict:
+        return {
+            "api_key": self.api_key,
+            "jwt_token": self.jwt_token,
+            "timeout": self.timeout,
+            "base_url": self.base_url,
+            "raw_mode": self.raw_mode,
+            "metrics": self.metrics,
+            "hooks": self.hooks,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "transport": self._active_transport,
+            "rate_limiter": self.rate_limiter,
+            "priority": self.priority,
+        }
+
+    @property
+    def payment(self) -> PaymentAPI:
+        return PaymentAPI(**self._client_kwargs())
+
+    @property
+    def currency(self) -> CurrencyAPI:
+        return CurrencyAPI(**self._client_kwargs())
+
+    @property
+    def payout(self) -> PayoutAPI:
+        return PayoutAPI(**self._client_kwargs())
+
+    @property
+    def billing(self) -> BillingAPI:
+        return BillingAPI(**self._client_kwargs())
+
+    @property
+    def subscription(self) -> SubscriptionAPI:
+        return SubscriptionAPI(**self._client_kwargs())
+
+    def warm_up(self, connections: int = 1, timeout: Optional[float] = DEFAULT_WARM_UP_TIMEOUT) -> int:
+        """
+        Open up to ``connections`` keep-alive connections with concurrent ``status`` calls.
+
+        :param connections: Number of connections to open.
+        :param timeout: Time budget for the warm-up in seconds; ``None`` for no limit.
+        :return: Number of ``status`` calls that succeeded.
+        """
+        return warm_up(self, connections, timeout)
+
+    def start_keepalive(self, interval: float = 30.0, connections: int = 1) -> KeepAlive:
+        """
+        Ping the API from a background thread whenever the client was idle for ``interval`` seconds.
+
+        :param interval: Idle seconds before a ping.
+        :param connections: Connections kept warm by each ping.
+        :return: The running ``KeepAlive``; ``close()`` stops it.
+        """
+        self.stop_keepalive()
+        self._keepalive = KeepAlive(self, interval, connections).start()
+        return self._keepalive
+
+    def stop_keepalive(self) -> None:
+        keepalive, self._keepalive = self._keepalive, None
+        if keepalive is not None:
+            keepalive.stop()
+
+    def close(self) -> None:
+        self.stop_keepalive()
+        self._requests_transport.close()
+
+    def __enter__(self) -> "NowPayments":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def get_api_status(self, as_model: bool = False) -> Union[dict, APIStatus]:
+        """
+        Obtain information about the status of the API.
+
+        :param as_model: When True, return an ``APIStatus`` model.
+        :return: API status.
+        """
+        return self.payment.get_api_status(as_model=as_model)
+
+    @staticmethod
+    def compute_payment_signature(data: dict, ipn_secret: str) -> str:
+        return compute_payment_signature(data, ipn_secret)
+
+    @staticmethod
+    def verify_payment_signature(
+        data: dict,
+        ipn_secret: str,
+        signature: Optional[str] = None,
+    ) -> Union[str, bool]:
+        return verify_payment_signature(data, ipn_secret, signature)
@@ -0,0 +1,205 @@
+"""
+Columnar views over payment list pages.
+
+``PaymentColumns`` consumes pages from ``PaymentAPI.iter_payment_pages`` (or any
+``get_payment_list`` responses) and stores each field as a typed column, so
+aggregations can run over whole arrays instead of looping over ``Payment`` objects.
+"""
+
+import math
+from array import array
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from nowpayment.models import Payment, PaymentList
+
+AMOUNT_FIELDS = ("price_amount", "pay_amount", "actually_paid", "outcome_amount")
+CATEGORY_FIELDS = ("payment_status", "price_currency", "pay_currency", "outcome_currency")
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+AMOUNTS_FLOAT64 = "float64"
+AMOUNTS_DECIMAL = "decimal"
+
+# Matches numpy's NaT so millisecond columns can be viewed as datetime64[ms].
+MISSING_TIMESTAMP = -(2 ** 63)
+
+
+class CategoricalColumn:
+    """Dictionary-encoded string column: integer codes plus their categories."""
+
+    def __init__(self) -> None:
+        self.codes = array("i")
+        self.categories: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def append(self, value: Any) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+        value = str(value)
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def decode(self) -> List[Optional[str]]:
+        """Return the column as a list of strings (``None`` for missing values)."""
+        categories = self.categories
+        return [categories[code] if code >= 0 else None for code in self.codes]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+def _to_float(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_decimal_string(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    try:
+        return str(Decimal(str(value)))
+    except InvalidOperation:
+        return None
+
+
+def _to_epoch_ms(value: Any) -> int:
+    if not value:
+        return MISSING_TIMESTAMP
+    text = str(value)
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return MISSING_TIMESTAMP
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+class PaymentColumns:
+    """
+    Build typed columns from payment list pages.
+
+    Amount columns are ``array('d')`` (``NaN`` for missing values) or, with
+    ``amounts="decimal"``, lists of normalized decimal strings. Currency and
+    status columns are ``CategoricalColumn`` instances. Timestamp columns are
+    ``array('q')`` of epoch milliseconds with ``MISSING_TIMESTAMP`` for gaps.
+
+    :param amounts: ``"float64"`` or ``"decimal"``.
+    """
+
+    def __init__(self, amounts: str = AMOUNTS_FLOAT64):
+        if amounts not in (AMOUNTS_FLOAT64, AMOUNTS_DECIMAL):
+            raise ValueError(f"amounts must be {AMOUNTS_FLOAT64!r} or {AMOUNTS_DECIMAL!r}")
+        self.amounts = amounts
+        self.payment_id: List[Any] = []
+        self.order_id: List[Optional[str]] = []
+        if amounts == AMOUNTS_FLOAT64:
+            self._amount_columns: Dict[str, Any] = {name: array("d") for name in AMOUNT_FIELDS}
+        else:
+            self._amount_columns = {name: [] for name in AMOUNT_FIELDS}
+        self._category_columns = {name: CategoricalColumn() for name in CATEGORY_FIELDS}
+        self._timestamp_columns = {name: array("q") for name in TIMESTAMP_FIELDS}
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: Iterable[Union[Mapping[str, Any], PaymentList]],
+        amounts: str = AMOUNTS_FLOAT64,
+    ) -> "PaymentColumns":
+        """
+        Build columns from an iterable of payment list pages.
+
+        :param pages: ``get_payment_list`` responses as dicts or ``PaymentList`` models.
+        :param amounts: ``"float64"`` or ``"decimal"``.
+        :return: Populated ``PaymentColumns``.
+        """
+        columns = cls(amounts=amounts)
+        for page in pages:
+            columns.add_page(page)
+        return columns
+
+    def add_page(self, page: Union[Mapping[str, Any], PaymentList]) -> None:
+        """Append every payment in a ``get_payment_list`` page."""
+        if isinstance(page, PaymentList):
+            items: Iterable[Any] = page.data or []
+        else:
+            items = page.get("data") or []
+        for item in items:
+            self.add_payment(item)
+
+    def add_payment(self, payment: Union[Mapping[str, Any], Payment]) -> None:
+        """Append a single payment given as a dict or ``Payment`` model."""
+        if isinstance(payment, Payment):
+            get = payment.__dict__.get
+        else:
+            get = payment.get
+        self.payment_id.append(get("payment_id"))
+        self.order_id.append(get("order_id"))
+        convert = _to_float if self.amounts == AMOUNTS_FLOAT64 else _to_decimal_string
+        for name, column in self._amount_columns.items():
+            column.append(convert(get(name)))
+        for name, column in self._category_columns.items():
+            column.append(get(name))
+        for name, column in self._timestamp_columns.items():
+            column.append(_to_epoch_ms(get(name)))
+
+    def __len__(self) -> int:
+        return len(self.payment_id)
+
+    def columns(self) -> Dict[str, Any]:
+        """Return all columns keyed by payment field name."""
+        result: Dict[str, Any] = {
+            "payment_id": self.payment_id,
+            "order_id": self.order_id,
+        }
+        result.update(self._amount_columns)
+        result.update(self._category_columns)
+        result.update(self._timestamp_columns)
+        return result
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Return the columns as NumPy arrays.
+
+        Float amounts become ``float64`` arrays, decimal amounts ``object`` arrays,
+        categorical columns ``(codes, categories)`` pairs of ``int32`` and ``str``
+        arrays, and timestamps ``datetime64[ms]`` arrays.
+
+        :raises ImportError: If numpy is not installed.
+        """
+        try:
+            import numpy
+        except ImportError as exc:
+            raise ImportError(
+                "PaymentColumns.to_numpy() requires numpy; install it with "
+                "`pip install nowpayment[numpy]`"
+            ) from exc
+
+        result: Dict[str, Any] = {
+            "payment_id": numpy.array(self.payment_id, dtype=object),
+            "order_id": numpy.array(self.order_id, dtype=object),
+        }
+        for name, column in self._amount_columns.items():
+            if self.amounts == AMOUNTS_FLOAT64:
+                result[name] = numpy.frombuffer(column, dtype=numpy.float64).copy()
+            else:
+                result[name] = numpy.array(column, dtype=object)
+        for name, column in self._category_columns.items():
+            result[name] = (
+                numpy.frombuffer(column.codes, dtype=numpy.intc).astype(numpy.int32),
+                numpy.array(column.categories, dtype=str),
+            )
+        for name, column in self._timestamp_columns.items():
+            result[name] = numpy.frombuffer(column, dtype=numpy.int64).astype("datetime64[ms]")
+        return result
@@ -1,2 +1,11 @@
 PRODUCTION_BASE_URL = "https://api.nowpayments.io/v1"
 SANDBOX_BASE_URL = "https://api.sandbox.nowpayments.io/v1"
+
+RAW_KEEP = "keep"
+RAW_VIEW = "view"
+RAW_DROP = "drop"
+RAW_MODES = (RAW_KEEP, RAW_VIEW, RAW_DROP)
+
+SESSION_PROCESS = "process"
+SESSION_THREAD = "thread"
+SESSION_SCOPES = (SESSION_PROCESS, SESSION_THREAD)
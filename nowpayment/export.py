@@ -0,0 +1,255 @@
+"""
+Streaming export of the payment history to NDJSON or CSV.
+
+Pages from ``get_payment_list`` are written as they arrive and a checkpoint is
+saved after every page, so memory stays bounded and an interrupted export
+resumes from the last completed page instead of starting over. Once an
+export is done, ``run(new_window=True)`` exports the payments created since
+its upper bound into a fresh file.
+"""
+
+import contextvars
+import csv
+import io
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from nowpayment.apis.payment import PaymentAPI
+from nowpayment.models import Payment
+from nowpayment.ratelimit import PRIORITY_BULK, request_priority
+
+EXPORT_NDJSON = "ndjson"
+EXPORT_CSV = "csv"
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = tuple(item.name for item in fields(Payment) if item.name != "raw")
+
+
+@dataclass
+class ExportCheckpoint:
+    """Progress of an export, persisted after every written page."""
+
+    path: str
+    format: str
+    next_page: int = 0
+    pages_count: Optional[int] = None
+    rows: int = 0
+    offset: int = 0
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    last_created_at: Optional[str] = None
+    done: bool = False
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ExportCheckpoint"]:
+        """Read a checkpoint file, returning ``None`` when it does not exist."""
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                return cls(**json.load(handle))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: str) -> None:
+        """Atomically write the checkpoint file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(asdict(self), handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+
+class PaymentExporter:
+    """
+    Stream every payment in a date window to an NDJSON or CSV file.
+
+    The window's upper bound is frozen when an export starts (``date_to``
+    defaults to the current time) so page boundaries stay stable across
+    resumes while new payments keep arriving.
+
+    :param payment_api: ``PaymentAPI`` with a JWT token (``client.payment``).
+    :param path: Output file path.
+    :param format: ``"ndjson"`` or ``"csv"``.
+    :param checkpoint_path: Checkpoint file; defaults to ``<path>.checkpoint``.
+    :param limit: Page size requested from the API.
+    :param concurrency: Number of pages fetched in parallel; output order is preserved.
+    :param date_from: Lower bound of the export window.
+    :param date_to: Upper bound of the export window.
+    :param priority: Rate limiter priority of the page requests.
+    """
+
+    def __init__(
+        self,
+        payment_api: PaymentAPI,
+        path: str,
+        format: str = EXPORT_NDJSON,
+        checkpoint_path: Optional[str] = None,
+        limit: int = 100,
+        concurrency: int = 1,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        priority: str = PRIORITY_BULK,
+    ):
+        if format not in (EXPORT_NDJSON, EXPORT_CSV):
+            raise ValueError(f"format must be {EXPORT_NDJSON!r} or {EXPORT_CSV!r}")
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.payment_api = payment_api
+        self.path = path
+        self.format = format
+        self.checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+        self.limit = limit
+        self.concurrency = concurrency
+        self.date_from = date_from
+        self.date_to = date_to
+        self.priority = priority
+
+    def run(self, new_window: bool = False) -> ExportCheckpoint:
+        """
+        Export all pages, resuming from the checkpoint when one exists.
+
+        :param new_window: When the checkpointed export is already done, start
+            a new one that overwrites the output. Its window starts at the
+            previous ``date_to`` unless ``date_from`` was given.
+        :return: Final checkpoint with row count and window bounds.
+        """
+        checkpoint = ExportCheckpoint.load(self.checkpoint_path)
+        date_from = self.date_from
+        if checkpoint is not None and checkpoint.done and new_window:
+            if date_from is None:
+                date_from = checkpoint.date_to
+            checkpoint = None
+        if checkpoint is not None and not checkpoint.done and not self._output_intact(checkpoint):
+            logger.warning("Output %s is missing or shorter than its checkpoint; starting over", self.path)
+            checkpoint = None
+        if checkpoint is None or checkpoint.path != self.path or checkpoint.format != self.format:
+            checkpoint = ExportCheckpoint(
+                path=self.path,
+                format=self.format,
+                date_from=date_from,
+                date_to=self.date_to or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            )
+            with open(self.path, "wb") as output:
+                if self.format == EXPORT_CSV:
+                    output.write(self._encode_header())
+                checkpoint.offset = output.tell()
+            checkpoint.save(self.checkpoint_path)
+        if checkpoint.done:
+            logger.warning(
+                "Export to %s is already complete; pass new_window=True to export newer payments",
+                self.path,
+            )
+            return checkpoint
+
+        with request_priority(self.priority), open(self.path, "r+b") as output:
+            # Drop anything written after the last checkpoint, e.g. a partial page.
+            output.truncate(checkpoint.offset)
+            output.seek(checkpoint.offset)
+            for page, items, pages_count in self._pages(checkpoint):
+                output.write(self._encode_rows(items))
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.next_page = page + 1
+                checkpoint.pages_count = pages_count
+                checkpoint.rows += len(items)
+                checkpoint.offset = output.tell()
+                if items:
+                    checkpoint.last_created_at = items[-1].get("created_at")
+                checkpoint.save(self.checkpoint_path)
+
+        checkpoint.done = True
+        checkpoint.save(self.checkpoint_path)
+        return checkpoint
+
+    def _output_intact(self, checkpoint: ExportCheckpoint) -> bool:
+        try:
+            return os.path.getsize(self.path) >= checkpoint.offset
+        except OSError:
+            return False
+
+    def _fetch(self, checkpoint: ExportCheckpoint, page: int) -> Dict[str, Any]:
+        return self.payment_api.get_payment_list(
+            limit=self.limit,
+            page=page,
+            sort_by="created_at",
+            order_by="asc",
+            date_from=checkpoint.date_from,
+            date_to=checkpoint.date_to,
+        )
+
+    def _is_last(self, page: int, items: List[dict], pages_count: Optional[int]) -> bool:
+        if not items:
+            return True
+        if pages_count is not None:
+            return page + 1 >= pages_count
+        return len(items) < self.limit
+
+    def _pages(
+        self,
+        checkpoint: ExportCheckpoint,
+    ) -> Iterator[Tuple[int, List[dict], Optional[int]]]:
+        page = checkpoint.next_page
+        data = self._fetch(checkpoint, page)
+        while True:
+            items = data.get("data") or []
+            pages_count = data.get("pagesCount") or data.get("pages_count")
+            yield page, items, pages_count
+            if self._is_last(page, items, pages_count):
+                return
+            if self.concurrency > 1 and pages_count is not None:
+                yield from self._concurrent_pages(checkpoint, page + 1, pages_count)
+                return
+            page += 1
+            data = self._fetch(checkpoint, page)
+
+    def _concurrent_pages(
+        self,
+        checkpoint: ExportCheckpoint,
+        first_page: int,
+        pages_count: int,
+    ) -> Iterator[Tuple[int, List[dict], Optional[int]]]:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending: deque = deque()
+            next_page = first_page
+            # Keep at most ``concurrency`` pages in flight and yield them in order.
+            while pending or next_page < pages_count:
+                while next_page < pages_count and len(pending) < self.concurrency:
+                    # Run each fetch in a copy of this context so an active
+                    # ``deadline()`` applies in the worker thread too.
+                    context = contextvars.copy_context()
+                    pending.append((next_page, executor.submit(context.run, self._fetch, checkpoint, next_page)))
+                    next_page += 1
+                page, future = pending.popleft()
+                data = future.result()
+                yield page, data.get("data") or [], pages_count
+
+    def _encode_header(self) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_FIELDS)
+        return buffer.getvalue().encode("utf-8")
+
+    def _encode_rows(self, items: List[dict]) -> bytes:
+        if self.format == EXPORT_NDJSON:
+            return "".join(
+                json.dumps(item, separators=(",", ":")) + "\n" for item in items
+            ).encode("utf-8")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for item in items:
+            writer.writerow([_csv_value(item.get(name)) for name in CSV_FIELDS])
+        return buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
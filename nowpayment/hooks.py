@@ -0,0 +1,121 @@
+"""
+Request lifecycle hooks for tracing and profiling.
+
+``RequestHooks`` holds callbacks for five events of an API call. Every
+callback receives the same ``RequestEvent`` for one logical call (across
+retries), so a tracer can open a span in ``before_request`` and keep it in
+``event.context``. When no callback is registered the client skips all hook
+work.
+
+Usage:
+  hooks = RequestHooks()
+
+  @hooks.on(AFTER_RESPONSE)
+  def trace(event):
+      print(event.method, event.endpoint, event.status_code, event.timings)
+
+  np = NowPayments("API_KEY", hooks=hooks)
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+BEFORE_REQUEST = "before_request"
+AFTER_RESPONSE = "after_response"
+ON_RETRY = "on_retry"
+ON_ERROR = "on_error"
+AFTER_PARSE = "after_parse"
+HOOK_EVENTS = (BEFORE_REQUEST, AFTER_RESPONSE, ON_RETRY, ON_ERROR, AFTER_PARSE)
+
+
+@dataclass
+class RequestEvent:
+    """
+    State of one API call, passed to every hook.
+
+    ``timings`` holds seconds per phase as they become known: ``request``
+    (HTTP round trip of the last attempt), ``decode`` (JSON decoding),
+    ``total`` (all attempts, including retry delays) and ``parse`` (model
+    construction). ``context`` is free for hooks to keep their own state.
+    """
+
+    method: str
+    endpoint: str
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Any] = None
+    attempt: int = 1
+    status_code: Optional[int] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    model_type: Optional[Type[Any]] = None
+    error: Optional[BaseException] = None
+    retry_delay: Optional[float] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+
+
+HookCallback = Callable[[RequestEvent], None]
+
+
+class RequestHooks:
+    """
+    Registry of lifecycle callbacks shared by every API of a client.
+
+    Exceptions raised by callbacks are logged and never affect the API call.
+
+    :param callbacks: Initial callbacks by event name, e.g. ``after_response=fn``.
+    """
+
+    def __init__(self, **callbacks: HookCallback):
+        self._callbacks: Dict[str, List[HookCallback]] = {event: [] for event in HOOK_EVENTS}
+        self._active = False
+        self._local = threading.local()
+        for event, callback in callbacks.items():
+            self.add(event, callback)
+
+    def __bool__(self) -> bool:
+        return self._active
+
+    def add(self, event: str, callback: HookCallback) -> HookCallback:
+        """
+        Register ``callback`` for ``event``.
+
+        :param event: One of ``HOOK_EVENTS``.
+        :param callback: Called with the ``RequestEvent``.
+        :return: The callback, so this can be used as a decorator body.
+        """
+        if event not in self._callbacks:
+            raise ValueError(f"event must be one of {', '.join(HOOK_EVENTS)}")
+        self._callbacks[event].append(callback)
+        self._active = True
+        return callback
+
+    def remove(self, event: str, callback: HookCallback) -> None:
+        """Unregister a callback added with ``add``."""
+        self._callbacks[event].remove(callback)
+        self._active = any(self._callbacks.values())
+
+    def on(self, event: str) -> Callable[[HookCallback], HookCallback]:
+        """Decorator form of ``add``, e.g. ``@hooks.on(AFTER_RESPONSE)``."""
+        def decorator(callback: HookCallback) -> HookCallback:
+            return self.add(event, callback)
+        return decorator
+
+    def emit(self, event: str, request_event: RequestEvent) -> None:
+        for callback in self._callbacks[event]:
+            try:
+                callback(request_event)
+            except Exception:
+                logger.exception("nowpayment %s hook failed", event)
+
+    def bind(self, request_event: Optional[RequestEvent]) -> None:
+        """Remember the call whose response is parsed next on this thread (typed calls only)."""
+        self._local.event = request_event
+
+    def pop_bound(self) -> Optional[RequestEvent]:
+        request_event = getattr(self._local, "event", None)
+        self._local.event = None
+        return request_event
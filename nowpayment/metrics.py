@@ -0,0 +1,255 @@
+"""
+Per-endpoint request metrics for the NOWPayments client.
+
+``ClientMetrics`` records, for every endpoint template (``payment/{id}``),
+request counts, status-code breakdowns, bytes sent and received, and latency
+histograms per phase. It can be read as a snapshot dict or rendered in the
+Prometheus text exposition format.
+
+Usage:
+  metrics = ClientMetrics()
+  np = NowPayments("API_KEY", metrics=metrics)
+  ...
+  print(metrics.to_prometheus())
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+# Phases recorded by the requests-based client. Transports that can observe
+# connection setup separately record it under ``PHASE_CONNECT``.
+PHASE_CONNECT = "connect"
+PHASE_WAIT = "wait"
+PHASE_READ = "read"
+PHASE_PARSE = "parse"
+PHASE_TOTAL = "total"
+
+STATUS_ERROR = "error"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_SEGMENT = re.compile(r"(?<=/)[^/]*\d[^/]*(?=/|$)")
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Collapse ID-like path segments so requests group by endpoint.
+
+    :param path: API path, e.g. ``payment/5077125051``.
+    :return: Template such as ``payment/{id}``.
+    """
+    return _ID_SEGMENT.sub("{id}", "/" + path.strip("/"))[1:]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram in seconds.
+
+    :param buckets: Increasing upper bounds; an implicit ``+Inf`` bucket follows.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        :param q: Quantile between 0 and 1.
+        :return: Seconds, or ``None`` when nothing was observed.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.max
+            if bucket_count and seen + bucket_count >= rank:
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Prometheus ``le`` labels with cumulative counts."""
+        total = 0
+        rows = []
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            total += bucket_count
+            rows.append((_format_number(bound), total))
+        rows.append(("+Inf", self.count))
+        return rows
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class EndpointMetrics:
+    """Counters and histograms for one method and endpoint template."""
+
+    __slots__ = ("method", "endpoint", "count", "statuses", "bytes_out", "bytes_in", "latency", "_buckets")
+
+    def __init__(self, method: str, endpoint: str, buckets: Sequence[float]):
+        self.method = method
+        self.endpoint = endpoint
+        self.count = 0
+        self.statuses: Counter = Counter()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self._buckets = buckets
+
+    def observe(self, phase: str, seconds: float) -> None:
+        histogram = self.latency.get(phase)
+        if histogram is None:
+            histogram = self.latency[phase] = LatencyHistogram(self._buckets)
+        histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "endpoint": self.endpoint,
+            "count": self.count,
+            "statuses": {str(status): total for status, total in sorted(self.statuses.items(), key=str)},
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "latency": {phase: histogram.snapshot() for phase, histogram in self.latency.items()},
+        }
+
+
+class ClientMetrics:
+    """
+    Thread-safe request metrics shared by every API of a client.
+
+    :param buckets: Latency histogram upper bounds in seconds.
+    :param namespace: Prefix of the Prometheus metric names.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "nowpayment"):
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status: Any,
+        bytes_out: int = 0,
+        bytes_in: int = 0,
+        phases: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Record one finished request.
+
+        :param method: HTTP method.
+        :param path: API path; ID-like segments are collapsed to ``{id}``.
+        :param status: HTTP status code, or ``"error"`` when no response arrived.
+        :param bytes_out: Request body size.
+        :param bytes_in: Response body size.
+        :param phases: Seconds spent per phase, e.g. ``{"wait": 0.12, "parse": 0.001}``.
+        """
+        key = (method.upper(), endpoint_template(path))
+        with self._lock:
+            entry = self._endpoints.get(key)
+            if entry is None:
+                entry = self._endpoints[key] = EndpointMetrics(key[0], key[1], self.buckets)
+            entry.count += 1
+            entry.statuses[status] += 1
+            entry.bytes_out += bytes_out
+            entry.bytes_in += bytes_in
+            for phase, seconds in (phases or {}).items():
+                entry.observe(phase, seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return all metrics as plain data.
+
+        :return: ``{"endpoints": {"GET payment/{id}": {...}}}``.
+        """
+        with self._lock:
+            endpoints = {
+                f"{method} {endpoint}": entry.snapshot()
+                for (method, endpoint), entry in sorted(self._endpoints.items())
+            }
+        return {"endpoints": endpoints}
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        prefix = self.namespace
+        requests_lines: List[str] = []
+        out_lines: List[str] = []
+        in_lines: List[str] = []
+        latency_lines: List[str] = []
+        with self._lock:
+            for (method, endpoint), entry in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{_escape(endpoint)}"'
+                for status, total in sorted(entry.statuses.items(), key=str):
+                    requests_lines.append(f'{prefix}_requests_total{{{labels},status="{status}"}} {total}')
+                out_lines.append(f"{prefix}_request_bytes_total{{{labels}}} {entry.bytes_out}")
+                in_lines.append(f"{prefix}_response_bytes_total{{{labels}}} {entry.bytes_in}")
+                for phase, histogram in sorted(entry.latency.items()):
+                    phase_labels = f'{labels},phase="{phase}"'
+                    for bound, total in histogram.cumulative():
+                        latency_lines.append(
+                            f'{prefix}_request_duration_seconds_bucket{{{phase_labels},le="{bound}"}} {total}'
+                        )
+                    latency_lines.append(
+                        f"{prefix}_request_duration_seconds_sum{{{phase_labels}}} {_format_number(histogram.sum)}"
+                    )
+                    latency_lines.append(f"{prefix}_request_duration_seconds_count{{{phase_labels}}} {histogram.count}")
+
+        lines = [
+            f"# HELP {prefix}_requests_total Requests made to the NOWPayments API.",
+            f"# TYPE {prefix}_requests_total counter",
+            *requests_lines,
+            f"# HELP {prefix}_request_bytes_total Request body bytes sent.",
+            f"# TYPE {prefix}_request_bytes_total counter",
+            *out_lines,
+            f"# HELP {prefix}_response_bytes_total Response body bytes received.",
+            f"# TYPE {prefix}_response_bytes_total counter",
+            *in_lines,
+            f"# HELP {prefix}_request_duration_seconds Request latency by phase.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+            *latency_lines,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{value:.1f}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
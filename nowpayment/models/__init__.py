@@ -1,4 +1,4 @@
-from nowpayment.models.base import BaseResponse, parse_response
+from nowpayment.models.base import BaseResponse, interned, parse_response, wire_name
 from nowpayment.models.currency import Currency, CurrencyList
 from nowpayment.models.payment import APIStatus, Estimate, Invoice, MinAmount, Payment, PaymentList
 from nowpayment.models.payout import (
@@ -42,5 +42,7 @@ __all__ = [
     "SubscriptionPlan",
     "SubscriptionPlanList",
     "WithdrawalModel",
+    "interned",
     "parse_response",
+    "wire_name",
 ]
@@ -1,24 +1,121 @@
-from dataclasses import dataclass, field, fields
-from typing import Any, Dict, Type, TypeVar, Union
+import sys
+from dataclasses import dataclass, field, fields, is_dataclass
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Tuple, Type, TypeVar, Union
+
+from nowpayment.constants import RAW_DROP, RAW_KEEP, RAW_MODES, RAW_VIEW
 
 T = TypeVar("T", bound="BaseResponse")
 
+_DROPPED_RAW: Mapping[str, Any] = MappingProxyType({})
+_MODEL_FIELDS: Dict[type, Tuple[Tuple[str, ...], FrozenSet[str]]] = {}
+
+
+def interned(default: Any = None) -> Any:
+    """
+    Declare a low-cardinality string field that is interned during parsing.
+
+    Use for values such as currency codes and statuses that repeat across
+    list items, so every parsed model shares one string object per value.
+    The payload passed to ``from_dict()`` is never modified, so with
+    ``raw_mode="keep"`` or ``"view"`` the retained payload still holds the
+    decoder's strings; use ``"drop"`` to keep only the interned values.
+    """
+    return field(default=default, metadata={"intern": True})
+
+
+def wire_name(name: str, default: Any = None) -> Any:
+    """
+    Declare a field whose key in the API payload differs from its attribute name.
+
+    ``to_dict()`` of models parsed with ``raw_mode="drop"`` emits the field
+    under ``name``, so it returns the same keys as the other raw modes.
+    """
+    return field(default=default, metadata={"wire": name})
+
+
+def _model_fields(cls: type) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    cached = _MODEL_FIELDS.get(cls)
+    if cached is None:
+        model_fields = [item for item in fields(cls) if item.name != "raw"]
+        cached = (
+            tuple(item.name for item in model_fields),
+            frozenset(item.name for item in model_fields if item.metadata.get("intern")),
+        )
+        _MODEL_FIELDS[cls] = cached
+    return cached
+
+
+def retain_raw(data: Dict[str, Any], raw_mode: str = RAW_KEEP) -> Mapping[str, Any]:
+    """
+    Return the value a parsed model should keep as ``raw``.
+
+    :param data: Decoded API payload.
+    :param raw_mode: ``keep`` (the payload itself), ``view`` (a read-only
+        mapping over the payload) or ``drop`` (nothing retained).
+    :return: Mapping stored on the model.
+    """
+    if raw_mode == RAW_KEEP:
+        return data
+    if raw_mode == RAW_VIEW:
+        return MappingProxyType(data)
+    if raw_mode == RAW_DROP:
+        return _DROPPED_RAW
+    raise ValueError(f"raw_mode must be one of {', '.join(RAW_MODES)}")
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, BaseResponse):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_plain(item) for key, item in value.items()}
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            item.name: _to_plain(getattr(value, item.name))
+            for item in fields(value)
+            if item.name != "raw"
+        }
+    return value
+
 
 @dataclass
 class BaseResponse:
     """Base type for parsed NOWPayments API responses."""
 
-    raw: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    raw: Mapping[str, Any] = field(default_factory=dict, repr=False, compare=False)
 
     @classmethod
-    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    def from_dict(cls: Type[T], data: Dict[str, Any], raw_mode: str = RAW_KEEP) -> T:
         if not isinstance(data, dict):
             raise TypeError(f"{cls.__name__}.from_dict() expects a dict, got {type(data).__name__}")
-        names = {item.name for item in fields(cls) if item.name != "raw"}
+        names, interned_names = _model_fields(cls)
         values = {name: data.get(name) for name in names}
-        return cls(**values, raw=data)
+        for name in interned_names:
+            value = values[name]
+            if type(value) is str:
+                # Only the model's copy is interned; ``data`` belongs to the
+                # caller and is retained as ``raw`` unchanged.
+                values[name] = sys.intern(value)
+        return cls(**values, raw=retain_raw(data, raw_mode))
+
+    def to_dict(self) -> Mapping[str, Any]:
+        """
+        Return the response payload.
 
-    def to_dict(self) -> Dict[str, Any]:
+        Models parsed with ``raw_mode="view"`` return their read-only view
+        without copying; models parsed with ``raw_mode="drop"`` rebuild a
+        dict from the parsed fields.
+        """
+        if self.raw is _DROPPED_RAW:
+            return {
+                item.metadata.get("wire", item.name): _to_plain(getattr(self, item.name))
+                for item in fields(self)
+                if item.name != "raw" and getattr(self, item.name) is not None
+            }
+        if isinstance(self.raw, MappingProxyType):
+            return self.raw
         return dict(self.raw)
 
 
@@ -26,7 +123,8 @@ def parse_response(
     data: Dict[str, Any],
     model: Type[T],
     as_model: bool,
+    raw_mode: str = RAW_KEEP,
 ) -> Union[Dict[str, Any], T]:
     if as_model:
-        return model.from_dict(data)
+        return model.from_dict(data, raw_mode=raw_mode)
     return data
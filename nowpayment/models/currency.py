@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 from typing import List, Optional, Union
 
-from nowpayment.models.base import BaseResponse
+from nowpayment.constants import RAW_KEEP
+from nowpayment.models.base import BaseResponse, interned, retain_raw
 
 
 @dataclass
 class Currency(BaseResponse):
     id: Optional[Union[int, str]] = None
-    code: Optional[str] = None
+    code: Optional[str] = interned()
     name: Optional[str] = None
     enable: Optional[bool] = None
     wallet_regex: Optional[str] = None
@@ -18,7 +19,7 @@ class Currency(BaseResponse):
     track: Optional[bool] = None
     cg_id: Optional[str] = None
     is_maxlimit: Optional[bool] = None
-    network: Optional[str] = None
+    network: Optional[str] = interned()
     smart_contract: Optional[str] = None
     network_precision: Optional[Union[int, str]] = None
 
@@ -28,14 +29,14 @@ class CurrencyList(BaseResponse):
     currencies: Optional[List[Union[str, Currency]]] = None
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("CurrencyList.from_dict() expects a dict")
         currencies = data.get("currencies", [])
         parsed: List[Union[str, Currency]] = []
         for item in currencies:
             if isinstance(item, dict):
-                parsed.append(Currency.from_dict(item))
+                parsed.append(Currency.from_dict(item, raw_mode=raw_mode))
             else:
                 parsed.append(item)
-        return cls(currencies=parsed, raw=data)
+        return cls(currencies=parsed, raw=retain_raw(data, raw_mode))
@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Optional, Union
 
-from nowpayment.models.base import BaseResponse
+from nowpayment.constants import RAW_KEEP
+from nowpayment.models.base import BaseResponse, interned, retain_raw, wire_name
 
 
 @dataclass
@@ -29,18 +30,18 @@ class MinAmount(BaseResponse):
 @dataclass
 class Payment(BaseResponse):
     payment_id: Optional[Union[str, int]] = None
-    payment_status: Optional[str] = None
+    payment_status: Optional[str] = interned()
     pay_address: Optional[str] = None
     price_amount: Optional[Union[int, float, str]] = None
-    price_currency: Optional[str] = None
+    price_currency: Optional[str] = interned()
     pay_amount: Optional[Union[int, float, str]] = None
-    pay_currency: Optional[str] = None
+    pay_currency: Optional[str] = interned()
     order_id: Optional[str] = None
     order_description: Optional[str] = None
     purchase_id: Optional[str] = None
     actually_paid: Optional[Union[int, float, str]] = None
     outcome_amount: Optional[Union[int, float, str]] = None
-    outcome_currency: Optional[str] = None
+    outcome_currency: Optional[str] = interned()
     invoice_id: Optional[Union[str, int]] = None
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
@@ -67,19 +68,19 @@ class PaymentList(BaseResponse):
     data: Optional[List[Payment]] = None
     limit: Optional[int] = None
     page: Optional[int] = None
-    pages_count: Optional[int] = None
+    pages_count: Optional[int] = wire_name("pagesCount")
     total: Optional[int] = None
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("PaymentList.from_dict() expects a dict")
-        items = [Payment.from_dict(item) for item in data.get("data", []) if isinstance(item, dict)]
+        items = [Payment.from_dict(item, raw_mode=raw_mode) for item in data.get("data", []) if isinstance(item, dict)]
         return cls(
             data=items,
             limit=data.get("limit"),
             page=data.get("page"),
             pages_count=data.get("pagesCount") or data.get("pages_count"),
             total=data.get("total"),
-            raw=data,
+            raw=retain_raw(data, raw_mode),
         )
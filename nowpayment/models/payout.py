@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Mapping, Optional, Union
 
-from nowpayment.models.base import BaseResponse
+from nowpayment.constants import RAW_KEEP
+from nowpayment.models.base import BaseResponse, interned, retain_raw
 
 
 @dataclass
@@ -13,7 +14,7 @@ class AuthToken(BaseResponse):
 class BalanceEntry:
     amount: Union[int, float] = 0
     pending_amount: Union[int, float] = 0
-    raw: Dict[str, Any] = field(default_factory=dict)
+    raw: Mapping[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -21,7 +22,7 @@ class Balance(BaseResponse):
     balances: Dict[str, BalanceEntry] = field(default_factory=dict)
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("Balance.from_dict() expects a dict")
         balances: Dict[str, BalanceEntry] = {}
@@ -30,18 +31,18 @@ class Balance(BaseResponse):
                 balances[currency] = BalanceEntry(
                     amount=entry.get("amount", 0),
                     pending_amount=entry.get("pendingAmount", entry.get("pending_amount", 0)),
-                    raw=entry,
+                    raw=retain_raw(entry, raw_mode),
                 )
-        return cls(balances=balances, raw=data)
+        return cls(balances=balances, raw=retain_raw(data, raw_mode))
 
 
 @dataclass
 class PayoutWithdrawal(BaseResponse):
     id: Optional[Union[str, int]] = None
     address: Optional[str] = None
-    currency: Optional[str] = None
+    currency: Optional[str] = interned()
     amount: Optional[Union[str, int, float]] = None
-    status: Optional[str] = None
+    status: Optional[str] = interned()
     hash: Optional[str] = None
     error: Optional[str] = None
     created_at: Optional[str] = None
@@ -55,11 +56,11 @@ class Payout(BaseResponse):
     status: Optional[str] = None
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("Payout.from_dict() expects a dict")
         withdrawals = [
-            PayoutWithdrawal.from_dict(item)
+            PayoutWithdrawal.from_dict(item, raw_mode=raw_mode)
             for item in data.get("withdrawals", [])
             if isinstance(item, dict)
         ]
@@ -67,7 +68,7 @@ class Payout(BaseResponse):
             id=data.get("id"),
             withdrawals=withdrawals,
             status=data.get("status"),
-            raw=data,
+            raw=retain_raw(data, raw_mode),
         )
 
 
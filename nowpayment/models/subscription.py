@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Optional, Union
 
-from nowpayment.models.base import BaseResponse
+from nowpayment.constants import RAW_KEEP
+from nowpayment.models.base import BaseResponse, retain_raw
 
 
 @dataclass
@@ -25,19 +26,19 @@ class SubscriptionPlanList(BaseResponse):
     count: Optional[int] = None
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("SubscriptionPlanList.from_dict() expects a dict")
         items = data.get("result", data.get("plans", []))
         plans = [
-            SubscriptionPlan.from_dict(item)
+            SubscriptionPlan.from_dict(item, raw_mode=raw_mode)
             for item in items
             if isinstance(item, dict)
         ]
         return cls(
             result=plans,
             count=data.get("count"),
-            raw=data,
+            raw=retain_raw(data, raw_mode),
         )
 
 
@@ -59,19 +60,19 @@ class SubscriptionList(BaseResponse):
     count: Optional[int] = None
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, raw_mode=RAW_KEEP):
         if not isinstance(data, dict):
             raise TypeError("SubscriptionList.from_dict() expects a dict")
         items = data.get("result", data.get("subscriptions", []))
         subscriptions = [
-            Subscription.from_dict(item)
+            Subscription.from_dict(item, raw_mode=raw_mode)
             for item in items
             if isinstance(item, dict)
         ]
         return cls(
             result=subscriptions,
             count=data.get("count"),
-            raw=data,
+            raw=retain_raw(data, raw_mode),
         )
 
 
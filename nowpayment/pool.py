@@ -0,0 +1,251 @@
+"""
+Clients for many NOWPayments accounts over one connection pool.
+
+``ClientPool`` hands out a ``NowPayments`` client per API key. All clients
+share one transport (and so one set of keep-alive connections), one metrics
+registry and one hooks registry; each key keeps its own JWT token and its
+own ``RateLimiter``. Clients of keys that have not been used for
+``idle_timeout`` seconds, or that fall off the end of the ``max_clients``
+LRU, are dropped and rebuilt on next use. Limiters and JWT tokens live at
+pool level and survive eviction, so a caller still holding an evicted client
+shares the key's token bucket with its replacement.
+
+Usage:
+  pool = ClientPool(rate=5, burst=10)
+  pool.register("MERCHANT_KEY", jwt_token="JWT")
+  pool.get("MERCHANT_KEY").payment.get_payment_status(payment_id)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from nowpayment.client import NowPayments
+from nowpayment.constants import RAW_KEEP
+from nowpayment.hooks import RequestHooks
+from nowpayment.metrics import ClientMetrics
+from nowpayment.ratelimit import RateLimiter
+from nowpayment.timeouts import TimeoutSpec
+from nowpayment.transports.base import Transport
+from nowpayment.transports.direct import Urllib3Transport
+
+
+@dataclass
+class AccountConfig:
+    """Per-key settings kept for the lifetime of the pool."""
+
+    jwt_token: Optional[str] = None
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+
+
+class _AccountState:
+    __slots__ = ("client", "last_used")
+
+    def __init__(self, client: NowPayments, now: float):
+        self.client = client
+        self.last_used = now
+
+
+class ClientPool:
+    """
+    Registry of per-account clients sharing one transport.
+
+    The default transport is a ``Urllib3Transport``: it is thread-safe and
+    keeps no cookie jar, so nothing set by one account's responses is sent
+    with another account's requests.
+
+    :param transport: Shared transport; a ``Urllib3Transport`` with
+        ``maxsize`` connections per host is created when omitted.
+    :param rate: Default requests per second per key; ``None`` disables rate limiting.
+    :param burst: Default burst size per key (see ``RateLimiter``).
+    :param bulk_share: Minimum share of each key's rate kept for bulk requests.
+    :param max_clients: Clients kept before the least recently used is dropped.
+    :param idle_timeout: Seconds after which an unused client is dropped;
+        ``None`` keeps clients until ``max_clients`` is reached.
+    :param maxsize: Connections per host for the default transport.
+    :param sandbox: Use the sandbox API.
+    :param base_url: Override the API base URL.
+    :param timeout: Request timeout passed to every client.
+    :param raw_mode: ``raw_mode`` passed to every client.
+    :param metrics: ``True`` or a ``ClientMetrics`` shared by every client.
+    :param hooks: ``RequestHooks`` shared by every client.
+    :param max_retries: Retries per call (see ``NowPayments``).
+    :param retry_backoff: Base retry delay in seconds.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        bulk_share: float = 0.1,
+        max_clients: int = 1024,
+        idle_timeout: Optional[float] = 600.0,
+        maxsize: int = 10,
+        sandbox: bool = False,
+        base_url: Optional[str] = None,
+        timeout: TimeoutSpec = None,
+        raw_mode: str = RAW_KEEP,
+        metrics: Union[bool, ClientMetrics, None] = None,
+        hooks: Optional[RequestHooks] = None,
+        max_retries: int = 0,
+        retry_backoff: float = 0.5,
+    ):
+        if max_clients < 1:
+            raise ValueError("max_clients must be at least 1")
+        self._owns_transport = transport is None
+        self.transport = transport if transport is not None else Urllib3Transport(maxsize=maxsize)
+        self.rate = rate
+        self.burst = burst
+        self.bulk_share = bulk_share
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.sandbox = sandbox
+        self.base_url = base_url
+        self.timeout = timeout
+        self.raw_mode = raw_mode
+        self.metrics: Optional[ClientMetrics] = ClientMetrics() if metrics is True else (metrics or None)
+        self.hooks = hooks if hooks is not None else RequestHooks()
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._configs: Dict[str, AccountConfig] = {}
+        self._states: "OrderedDict[str, _AccountState]" = OrderedDict()
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        api_key: str,
+        jwt_token: Optional[str] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        """
+        Set the JWT token and rate limit overrides for ``api_key``.
+
+        Keys do not have to be registered; unregistered keys use the pool defaults.
+        A live client for the key is dropped so the next ``get`` uses the new
+        settings; the key's limiter is only replaced if its rate or burst changes.
+        """
+        with self._lock:
+            self._configs[api_key] = AccountConfig(jwt_token, rate, burst)
+            self._states.pop(api_key, None)
+            limiter = self._limiters.get(api_key)
+            if limiter is not None and self._limit_for(api_key) != (limiter.rate, limiter.burst):
+                del self._limiters[api_key]
+
+    def set_jwt_token(self, api_key: str, jwt_token: Optional[str]) -> None:
+        """Replace the JWT token of ``api_key``, e.g. after ``payout.login()``."""
+        with self._lock:
+            self._configs.setdefault(api_key, AccountConfig()).jwt_token = jwt_token
+            state = self._states.get(api_key)
+            if state is not None:
+                state.client.jwt_token = jwt_token
+
+    def get(self, api_key: str) -> NowPayments:
+        """
+        Return the client for ``api_key``, creating it if needed.
+
+        :param api_key: Account API key.
+        :return: ``NowPayments`` client using the shared transport.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.get(api_key)
+            if state is None:
+                state = _AccountState(self._build_client(api_key), now)
+                self._states[api_key] = state
+            else:
+                state.last_used = now
+                self._states.move_to_end(api_key)
+            self._evict(now)
+            return state.client
+
+    __getitem__ = get
+
+    def _limit_for(self, api_key: str) -> Tuple[Optional[float], Optional[float]]:
+        config = self._configs.get(api_key) or AccountConfig()
+        rate = config.rate if config.rate is not None else self.rate
+        burst = config.burst if config.burst is not None else self.burst
+        if rate is None:
+            return None, None
+        # Normalized the way ``RateLimiter`` stores them.
+        return float(rate), float(burst if burst is not None else max(1.0, rate))
+
+    def _limiter(self, api_key: str) -> Optional[RateLimiter]:
+        limiter = self._limiters.get(api_key)
+        if limiter is None:
+            rate, burst = self._limit_for(api_key)
+            if rate is None:
+                return None
+            limiter = self._limiters[api_key] = RateLimiter(rate, burst, self.bulk_share)
+        return limiter
+
+    def _build_client(self, api_key: str) -> NowPayments:
+        config = self._configs.get(api_key) or AccountConfig()
+        return NowPayments(
+            api_key,
+            jwt_token=config.jwt_token,
+            timeout=self.timeout,
+            sandbox=self.sandbox,
+            raw_mode=self.raw_mode,
+            base_url=self.base_url,
+            metrics=self.metrics,
+            hooks=self.hooks,
+            max_retries=self.max_retries,
+            retry_backoff=self.retry_backoff,
+            transport=self.transport,
+            rate_limiter=self._limiter(api_key),
+        )
+
+    def _evict(self, now: float) -> None:
+        # Entries are kept in use order, so idle ones are at the front.
+        while len(self._states) > self.max_clients:
+            self._states.popitem(last=False)
+        if self.idle_timeout is None:
+            return
+        while self._states:
+            state = next(iter(self._states.values()))
+            if now - state.last_used < self.idle_timeout:
+                break
+            self._states.popitem(last=False)
+
+    def evict_idle(self) -> int:
+        """
+        Drop clients idle for longer than ``idle_timeout``.
+
+        :return: Number of clients dropped.
+        """
+        with self._lock:
+            before = len(self._states)
+            self._evict(time.monotonic())
+            return before - len(self._states)
+
+    @property
+    def active_keys(self) -> List[str]:
+        """Keys with a live client, least recently used first."""
+        with self._lock:
+            return list(self._states)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, api_key: object) -> bool:
+        return api_key in self._states
+
+    def close(self) -> None:
+        """Drop every client and limiter and close the transport if the pool created it."""
+        with self._lock:
+            self._states.clear()
+            self._limiters.clear()
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,194 @@
+"""
+Client-side rate limiting with priority classes.
+
+``RateLimiter`` is a thread-safe token bucket. A client with a limiter takes
+one token before every HTTP attempt (retries included), so calls from all
+threads sharing the limiter stay under the account's request rate instead
+of running into ``429`` responses.
+
+When callers have to wait, ``interactive`` calls are served before
+``normal`` ones and ``normal`` before ``bulk``, first come first served
+within a class. Bulk work is still guaranteed ``bulk_share`` of the tokens
+while it is waiting, so a backfill slows down under checkout traffic but is
+never starved. A call's class comes from ``request_priority()`` or the
+client's ``priority``; ``PaymentExporter`` and ``PaymentSync`` run as bulk.
+
+Usage:
+  limiter = RateLimiter(rate=5, burst=10, bulk_share=0.2)
+  checkout = NowPayments("API_KEY", rate_limiter=limiter, priority=PRIORITY_INTERACTIVE)
+  backfill = NowPayments("API_KEY", rate_limiter=limiter, priority=PRIORITY_BULK)
+
+  with request_priority(PRIORITY_INTERACTIVE):
+      np.payment.get_estimated_price(...)
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, Optional
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_NORMAL = "normal"
+PRIORITY_BULK = "bulk"
+# Highest priority first.
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK)
+
+_current_priority: ContextVar[Optional[str]] = ContextVar("nowpayment_priority", default=None)
+
+
+def current_priority() -> Optional[str]:
+    """Return the priority set by ``request_priority()`` for the calling context, if any."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Send the API calls made in the ``with`` block at ``priority``.
+
+    Overrides the client's ``priority`` for the block.
+
+    :param priority: One of ``PRIORITIES``.
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of ``burst``.
+
+    :param rate: Sustained requests per second.
+    :param burst: Bucket size; defaults to ``rate`` (at least one request).
+    :param bulk_share: Minimum fraction of tokens handed to waiting bulk
+        callers while higher classes are also waiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, bulk_share: float = 0.1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not 0 <= bulk_share < 1:
+            raise ValueError("bulk_share must be in [0, 1)")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.bulk_share = bulk_share
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._condition = threading.Condition(threading.Lock())
+        self._waiting: Dict[str, Deque[object]] = {priority: deque() for priority in PRIORITIES}
+        # Tokens owed to bulk; each grant to a higher class while bulk waits
+        # adds enough that bulk receives ``bulk_share`` of all grants.
+        self._bulk_credit = 0.0
+        self._granted: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """Tokens available right now."""
+        with self._condition:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def waiting(self) -> Dict[str, int]:
+        """Number of callers waiting per priority."""
+        with self._condition:
+            return {priority: len(queue) for priority, queue in self._waiting.items()}
+
+    @property
+    def granted(self) -> Dict[str, int]:
+        """Tokens handed out per priority since the limiter was created."""
+        with self._condition:
+            return dict(self._granted)
+
+    def _next_waiter(self) -> Optional[object]:
+        bulk = self._waiting[PRIORITY_BULK]
+        if bulk and self._bulk_credit >= 1:
+            return bulk[0]
+        for priority in PRIORITIES:
+            if self._waiting[priority]:
+                return self._waiting[priority][0]
+        return None
+
+    def _grant(self, priority: str) -> None:
+        self._tokens -= 1
+        self._granted[priority] += 1
+        if priority == PRIORITY_BULK:
+            self._bulk_credit = max(0.0, self._bulk_credit - 1)
+        elif self._waiting[PRIORITY_BULK] and self.bulk_share:
+            self._bulk_credit = min(1.0, self._bulk_credit + self.bulk_share / (1 - self.bulk_share))
+
+    def try_acquire(self, priority: str = PRIORITY_NORMAL) -> bool:
+        """
+        Take a token if one is available and nobody is waiting.
+
+        :param priority: One of ``PRIORITIES``.
+        :return: ``True`` if a token was taken.
+        """
+        if priority not in self._waiting:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+        with self._condition:
+            self._refill(time.monotonic())
+            if self._tokens >= 1 and self._next_waiter() is None:
+                self._grant(priority)
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None, priority: str = PRIORITY_NORMAL) -> bool:
+        """
+        Take a token, waiting for one if necessary.
+
+        :param timeout: Longest time to wait in seconds; ``None`` waits as long as needed.
+        :param priority: One of ``PRIORITIES``.
+        :return: ``True`` once a token was taken, ``False`` if none was
+            granted within ``timeout``.
+        """
+        if priority not in self._waiting:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}")
+        now = time.monotonic()
+        give_up = None if timeout is None else now + timeout
+        with self._condition:
+            self._refill(now)
+            if self._tokens >= 1 and self._next_waiter() is None:
+                self._grant(priority)
+                return True
+            ticket = object()
+            queue = self._waiting[priority]
+            queue.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        if self._next_waiter() is ticket:
+                            queue.popleft()
+                            self._grant(priority)
+                            # Let the next waiter check for a remaining token.
+                            self._condition.notify_all()
+                            return True
+                        # A token is free but owed to someone else; wake them.
+                        self._condition.notify_all()
+                        wait = None
+                    else:
+                        wait = (1 - self._tokens) / self.rate
+                    if give_up is not None:
+                        if now >= give_up:
+                            return False
+                        wait = give_up - now if wait is None else min(wait, give_up - now)
+                    self._condition.wait(wait)
+            finally:
+                if ticket in queue:
+                    queue.remove(ticket)
+                    self._condition.notify_all()
@@ -1,8 +1,87 @@
 import hashlib
 import hmac
 import json
+from functools import lru_cache
 from typing import Optional, Union
 
+# ``sort_keys`` sorts nested objects too, in a single pass of the C encoder.
+_CANONICAL_ENCODER = json.JSONEncoder(separators=(",", ":"), sort_keys=True)
+
+
+def canonicalize_payload(data: dict) -> bytes:
+    """
+    Encode an IPN payload in the canonical form NOWPayments signs.
+
+    Keys are sorted at every nesting level (e.g. inside ``fee``) and the JSON
+    is written without whitespace.
+
+    :param data: Parsed IPN payload.
+    :return: UTF-8 encoded canonical JSON.
+    """
+    return _CANONICAL_ENCODER.encode(data).encode("utf-8")
+
+
+class PaymentSignatureVerifier:
+    """
+    Reusable IPN signature checker for one IPN secret.
+
+    The HMAC-SHA512 key schedule is computed once and copied for every
+    message, instead of re-encoding the secret and re-keying per callback.
+
+    :param ipn_secret: IPN secret from the NOWPayments dashboard.
+    """
+
+    __slots__ = ("_hmac",)
+
+    def __init__(self, ipn_secret: str):
+        if not isinstance(ipn_secret, str):
+            raise ValueError("IPN secret must be a string")
+        self._hmac = hmac.new(ipn_secret.encode("utf-8"), digestmod=hashlib.sha512)
+
+    def compute_canonical(self, canonical: bytes) -> str:
+        """
+        Compute the signature of an already canonicalized payload.
+
+        :param canonical: Output of ``canonicalize_payload``.
+        :return: Hex-encoded HMAC-SHA512 digest.
+        """
+        mac = self._hmac.copy()
+        mac.update(canonical)
+        return mac.hexdigest()
+
+    def compute(self, data: dict) -> str:
+        """
+        Compute the signature of an IPN payload.
+
+        :param data: Parsed IPN payload.
+        :return: Hex-encoded HMAC-SHA512 digest.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Data must be a dictionary")
+        return self.compute_canonical(canonicalize_payload(data))
+
+    def verify(self, data: dict, signature: str) -> bool:
+        """
+        Check an IPN payload against the ``x-nowpayments-sig`` header value.
+
+        :param data: Parsed IPN payload.
+        :param signature: Signature to check.
+        :return: ``True`` when the signature matches.
+        """
+        return hmac.compare_digest(self.compute(data), signature)
+
+
+# Key states of recently used secrets for ``compute_payment_signature``;
+# long-lived callers should hold their own ``PaymentSignatureVerifier``.
+@lru_cache(maxsize=4)
+def _cached_verifier(ipn_secret: str) -> PaymentSignatureVerifier:
+    return PaymentSignatureVerifier(ipn_secret)
+
+
+def clear_signature_cache() -> None:
+    """Forget the IPN secrets cached by ``compute_payment_signature``, e.g. after rotating them."""
+    _cached_verifier.cache_clear()
+
 
 def compute_payment_signature(data: dict, ipn_secret: str) -> str:
     """
@@ -13,13 +92,7 @@ def compute_payment_signature(data: dict, ipn_secret: str) -> str:
     if not isinstance(ipn_secret, str):
         raise ValueError("IPN secret must be a string")
 
-    request_data = dict(sorted(data.items()))
-    sorted_request_json = json.dumps(request_data, separators=(",", ":"))
-    return hmac.new(
-        ipn_secret.encode("utf-8"),
-        sorted_request_json.encode("utf-8"),
-        hashlib.sha512,
-    ).hexdigest()
+    return _cached_verifier(ipn_secret).compute_canonical(canonicalize_payload(data))
 
 
 def verify_payment_signature(
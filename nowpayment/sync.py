@@ -0,0 +1,241 @@
+"""
+Incremental payment sync into a local SQLite mirror.
+
+Each ``PaymentSync.sync()`` run pages through ``get_payment_list`` sorted by
+``updated_at``, newest first, and stops at the first payment older than the
+stored high-water mark (minus a small overlap window). ``dateFrom`` filters
+on ``created_at``, so it is only used to bound the very first run; old
+payments that change status are still picked up. Payments without an
+``updated_at`` are stored; ones with an unparseable value are logged and
+skipped. Every page is upserted in
+one transaction and the high-water mark is saved once the run completes.
+Status lookups can then be served from the local database without calling
+the API.
+"""
+
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from nowpayment.apis.payment import PaymentAPI
+from nowpayment.ratelimit import PRIORITY_BULK, request_priority
+
+HIGH_WATER_MARK_KEY = "payments_updated_at"
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    payment_id TEXT PRIMARY KEY,
+    order_id TEXT,
+    payment_status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS payments_order_id ON payments (order_id);
+CREATE INDEX IF NOT EXISTS payments_payment_status ON payments (payment_status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_UPSERT = """
+INSERT INTO payments (payment_id, order_id, payment_status, created_at, updated_at, payload)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (payment_id) DO UPDATE SET
+    order_id = excluded.order_id,
+    payment_status = excluded.payment_status,
+    created_at = excluded.created_at,
+    updated_at = excluded.updated_at,
+    payload = excluded.payload
+WHERE payments.updated_at IS NULL
+    OR excluded.updated_at IS NULL
+    OR excluded.updated_at >= payments.updated_at
+"""
+
+
+def _parse_timestamp(value: str) -> datetime:
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _format_timestamp(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+@dataclass
+class SyncResult:
+    """
+    Outcome of a single ``PaymentSync.sync()`` run.
+
+    ``date_from`` is the ``created_at`` bound sent to the API (first run
+    only); ``updated_since`` is the ``updated_at`` cutoff the run stopped at.
+    """
+
+    fetched: int
+    date_from: Optional[str]
+    high_water_mark: Optional[str]
+    updated_since: Optional[str] = None
+
+
+class PaymentSync:
+    """
+    Keep a local SQLite mirror of payments up to date.
+
+    :param payment_api: ``PaymentAPI`` with a JWT token (``client.payment``).
+    :param db_path: SQLite database path (``":memory:"`` for an in-process mirror).
+    :param overlap: How far before the high-water mark each run starts, to catch
+        payments updated while the previous run was paging.
+    :param limit: Page size requested from the API.
+    :param initial_date_from: ``created_at`` lower bound for the very first run.
+    :param priority: Rate limiter priority of the page requests.
+    """
+
+    def __init__(
+        self,
+        payment_api: PaymentAPI,
+        db_path: str,
+        overlap: timedelta = timedelta(minutes=5),
+        limit: int = 100,
+        initial_date_from: Optional[str] = None,
+        priority: str = PRIORITY_BULK,
+    ):
+        self.payment_api = payment_api
+        self.overlap = overlap
+        self.limit = limit
+        self.initial_date_from = initial_date_from
+        self.priority = priority
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "PaymentSync":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Latest ``updated_at`` stored by a previous run."""
+        row = self.connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?",
+            (HIGH_WATER_MARK_KEY,),
+        ).fetchone()
+        return row["value"] if row else None
+
+    def sync(self) -> SyncResult:
+        """
+        Fetch payments updated since the high-water mark and upsert them.
+
+        :return: Number of fetched payments and the new high-water mark.
+        """
+        high_water_mark = self.high_water_mark
+        if high_water_mark is not None:
+            date_from = None
+            updated_since: Optional[datetime] = _parse_timestamp(high_water_mark) - self.overlap
+        else:
+            date_from = self.initial_date_from
+            updated_since = None
+
+        with request_priority(self.priority):
+            return self._sync_pages(date_from, updated_since, high_water_mark)
+
+    def _sync_pages(
+        self,
+        date_from: Optional[str],
+        updated_since: Optional[datetime],
+        high_water_mark: Optional[str],
+    ) -> SyncResult:
+        fetched = 0
+        for page in self.payment_api.iter_payment_pages(
+            limit=self.limit,
+            sort_by="updated_at",
+            order_by="desc",
+            date_from=date_from,
+        ):
+            items = []
+            reached_mark = False
+            for item in page.get("data") or []:
+                if item.get("payment_id") is None:
+                    continue
+                value = item.get("updated_at")
+                if value:
+                    try:
+                        updated_at = _parse_timestamp(value)
+                    except (TypeError, ValueError):
+                        logger.warning("Skipping payment %s with invalid updated_at %r", item["payment_id"], value)
+                        continue
+                    if updated_since is not None and updated_at < updated_since:
+                        reached_mark = True
+                        continue
+                # Payments without ``updated_at`` cannot be ordered against the mark; store them.
+                items.append(item)
+            if items:
+                rows = [
+                    (
+                        str(item["payment_id"]),
+                        item.get("order_id"),
+                        item.get("payment_status"),
+                        item.get("created_at"),
+                        item.get("updated_at"),
+                        json.dumps(item, separators=(",", ":")),
+                    )
+                    for item in items
+                ]
+                page_mark = max((row[4] for row in rows if row[4]), default=None)
+                if page_mark is not None and (high_water_mark is None or page_mark > high_water_mark):
+                    high_water_mark = page_mark
+                with self.connection:
+                    self.connection.executemany(_UPSERT, rows)
+                fetched += len(items)
+            if reached_mark:
+                break
+
+        # Pages run newest first, so the mark may only move once every page
+        # down to the old mark has been stored.
+        if high_water_mark is not None:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                    (HIGH_WATER_MARK_KEY, high_water_mark),
+                )
+        return SyncResult(
+            fetched=fetched,
+            date_from=date_from,
+            high_water_mark=high_water_mark,
+            updated_since=_format_timestamp(updated_since) if updated_since is not None else None,
+        )
+
+    def _select(self, where: str, value: Any) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            f"SELECT payload FROM payments WHERE {where} = ? ORDER BY updated_at",
+            (value,),
+        ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def get_payment(self, payment_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the mirrored payment payload, or ``None`` if unknown."""
+        rows = self._select("payment_id", str(payment_id))
+        return rows[0] if rows else None
+
+    def get_payments_by_order(self, order_id: str) -> List[Dict[str, Any]]:
+        """Return mirrored payments for an order ID."""
+        return self._select("order_id", order_id)
+
+    def get_payments_by_status(self, payment_status: str) -> List[Dict[str, Any]]:
+        """Return mirrored payments with the given status."""
+        return self._select("payment_status", payment_status)
@@ -0,0 +1,11 @@
+from nowpayment.testing.server import (
+    MockAPIError,
+    MockNowPaymentsServer,
+    MockNowPaymentsState,
+)
+
+__all__ = [
+    "MockAPIError",
+    "MockNowPaymentsServer",
+    "MockNowPaymentsState",
+]
@@ -0,0 +1,835 @@
+"""
+Local mock of the NOWPayments HTTP API.
+
+``MockNowPaymentsServer`` runs a threaded HTTP server on localhost that
+answers the endpoints used by this client with realistic payloads and
+pagination, keeping state in memory. Latency, server errors and ``429``
+responses can be injected to exercise retry, connection reuse and
+concurrency behaviour without a network.
+
+Usage:
+  with MockNowPaymentsServer(latency=0.02, rate_limit_rate=0.05) as server:
+      np = NowPayments("test-key", jwt_token="test-jwt", base_url=server.base_url)
+      np.payment.get_payment_list(limit=50)
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/v1"
+
+DEFAULT_RATES = {
+    "usd": 1.0,
+    "eur": 1.08,
+    "btc": 65000.0,
+    "eth": 3200.0,
+    "ltc": 80.0,
+    "trx": 0.12,
+    "usdttrc20": 1.0,
+    "usdterc20": 1.0,
+}
+PAYMENT_STATUSES = ("waiting", "confirming", "confirmed", "sending", "partially_paid", "finished", "failed", "expired")
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+Route = Tuple[str, "re.Pattern[str]", Callable[..., Any], bool]
+Latency = Union[float, Tuple[float, float]]
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+def _now() -> str:
+    return _timestamp(datetime.now(timezone.utc))
+
+
+class MockAPIError(Exception):
+    """Raised by route handlers to answer with an error status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MockNowPaymentsState:
+    """
+    In-memory data behind the mock server.
+
+    :param payments: Number of payments seeded for the payment list.
+    :param seed: Seed for the generated data.
+    """
+
+    def __init__(self, payments: int = 250, seed: Optional[int] = 0):
+        self.lock = threading.Lock()
+        self.rates = dict(DEFAULT_RATES)
+        self.payments: Dict[int, Dict[str, Any]] = {}
+        self.invoices: Dict[int, Dict[str, Any]] = {}
+        self.payouts: Dict[int, Dict[str, Any]] = {}
+        self.withdrawals: Dict[int, Dict[str, Any]] = {}
+        self.sub_partners: Dict[int, Dict[str, Any]] = {}
+        self.transfers: Dict[int, Dict[str, Any]] = {}
+        self.plans: Dict[int, Dict[str, Any]] = {}
+        self.subscriptions: Dict[int, Dict[str, Any]] = {}
+        self.balance: Dict[str, Dict[str, float]] = {
+            "btc": {"amount": 0.5, "pendingAmount": 0.0},
+            "usdttrc20": {"amount": 1250.0, "pendingAmount": 25.0},
+        }
+        self._ids = count(5_000_000_000)
+        self._seed_payments(payments, random.Random(seed))
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def _seed_payments(self, total: int, rng: random.Random) -> None:
+        currencies = [code for code in self.rates if code not in ("usd", "eur")]
+        for index in range(total):
+            created = _BASE_TIME + timedelta(minutes=7 * index)
+            pay_currency = rng.choice(currencies)
+            price_amount = round(rng.uniform(5, 500), 2)
+            status = rng.choice(PAYMENT_STATUSES)
+            payment = self.new_payment(price_amount, "usd", pay_currency, order_id=f"order-{index}")
+            payment.update(
+                payment_status=status,
+                actually_paid=payment["pay_amount"] if status == "finished" else 0,
+                created_at=_timestamp(created),
+                updated_at=_timestamp(created + timedelta(minutes=rng.randint(1, 90))),
+            )
+
+    def estimate(self, amount: float, currency_from: str, currency_to: str) -> float:
+        try:
+            rate_from = self.rates[currency_from.lower()]
+            rate_to = self.rates[currency_to.lower()]
+        except KeyError as exc:
+            raise MockAPIError(400, f"Currency {exc.args[0]} was not found") from None
+        return round(amount * rate_from / rate_to, 8)
+
+    def new_payment(
+        self,
+        price_amount: float,
+        price_currency: str,
+        pay_currency: str,
+        order_id: Optional[str] = None,
+        order_description: Optional[str] = None,
+        invoice_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        payment_id = self.next_id()
+        now = _now()
+        payment = {
+            "payment_id": payment_id,
+            "invoice_id": invoice_id,
+            "payment_status": "waiting",
+            "pay_address": f"T{payment_id:033d}",
+            "price_amount": price_amount,
+            "price_currency": price_currency.lower(),
+            "pay_amount": self.estimate(price_amount, price_currency, pay_currency),
+            "actually_paid": 0,
+            "pay_currency": pay_currency.lower(),
+            "order_id": order_id,
+            "order_description": order_description,
+            "purchase_id": str(payment_id + 1),
+            "outcome_amount": self.estimate(price_amount, price_currency, pay_currency),
+            "outcome_currency": pay_currency.lower(),
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.payments[payment_id] = payment
+        return payment
+
+
+def _page(items: List[Dict[str, Any]], query: Dict[str, str]) -> Dict[str, Any]:
+    offset = int(query.get("offset", 0))
+    limit = int(query.get("limit", 10))
+    return {"result": items[offset:offset + limit], "count": len(items)}
+
+
+def _lookup(table: Dict[int, Dict[str, Any]], key: str, name: str) -> Dict[str, Any]:
+    try:
+        return table[int(key)]
+    except (KeyError, ValueError):
+        raise MockAPIError(404, f"{name} {key} not found") from None
+
+
+def _require(body: Dict[str, Any], *fields: str) -> None:
+    missing = [name for name in fields if body.get(name) in (None, "")]
+    if missing:
+        raise MockAPIError(400, f"{missing[0]} is required")
+
+
+class _Routes:
+    """Route handlers; each takes ``(state, match, query, body)`` and returns a JSON payload."""
+
+    @staticmethod
+    def status(state, match, query, body):
+        return {"message": "OK"}
+
+    @staticmethod
+    def currencies(state, match, query, body):
+        return {"currencies": sorted(code for code in state.rates if code not in ("usd", "eur"))}
+
+    @staticmethod
+    def full_currencies(state, match, query, body):
+        codes = sorted(code for code in state.rates if code not in ("usd", "eur"))
+        return {
+            "currencies": [
+                {
+                    "id": index + 1,
+                    "code": code.upper(),
+                    "name": code.upper(),
+                    "enable": True,
+                    "wallet_regex": "^.+$",
+                    "priority": index,
+                    "extra_id_exists": False,
+                    "extra_id_regex": None,
+                    "logo_url": f"/images/coins/{code}.svg",
+                    "track": True,
+                    "cg_id": code,
+                    "is_maxlimit": False,
+                    "network": code[4:] if code.startswith("usdt") else code,
+                    "smart_contract": None,
+                    "network_precision": None,
+                }
+                for index, code in enumerate(codes)
+            ]
+        }
+
+    @staticmethod
+    def merchant_coins(state, match, query, body):
+        return {"selectedCurrencies": sorted(code.upper() for code in state.rates if code not in ("usd", "eur"))}
+
+    @staticmethod
+    def estimate(state, match, query, body):
+        _require(query, "amount", "currency_from", "currency_to")
+        amount = float(query["amount"])
+        return {
+            "currency_from": query["currency_from"].lower(),
+            "amount_from": amount,
+            "currency_to": query["currency_to"].lower(),
+            "estimated_amount": state.estimate(amount, query["currency_from"], query["currency_to"]),
+        }
+
+    @staticmethod
+    def min_amount(state, match, query, body):
+        _require(query, "currency_from", "currency_to")
+        return {
+            "currency_from": query["currency_from"].lower(),
+            "currency_to": query["currency_to"].lower(),
+            "min_amount": state.estimate(1.0, "usd", query["currency_from"]),
+            "fiat_equivalent": 1.0,
+        }
+
+    @staticmethod
+    def create_payment(state, match, query, body):
+        _require(body, "price_amount", "price_currency", "pay_currency")
+        return dict(state.new_payment(
+            float(body["price_amount"]),
+            body["price_currency"],
+            body["pay_currency"],
+            order_id=body.get("order_id"),
+            order_description=body.get("order_description"),
+        ))
+
+    @staticmethod
+    def get_payment(state, match, query, body):
+        return dict(_lookup(state.payments, match.group(1), "Payment"))
+
+    @staticmethod
+    def update_estimate(state, match, query, body):
+        payment = _lookup(state.payments, match.group(1), "Payment")
+        return {
+            "id": str(payment["payment_id"]),
+            "token_id": str(payment["payment_id"]),
+            "pay_amount": payment["pay_amount"],
+            "expiration_estimate_date": _timestamp(datetime.now(timezone.utc) + timedelta(minutes=20)),
+        }
+
+    @staticmethod
+    def list_payments(state, match, query, body):
+        limit = max(1, min(int(query.get("limit", 10)), 500))
+        page = max(0, int(query.get("page", 0)))
+        sort_by = query.get("sortBy", "created_at")
+        items = list(state.payments.values())
+        date_from = query.get("dateFrom")
+        date_to = query.get("dateTo")
+        if date_from:
+            items = [item for item in items if item["created_at"] >= date_from]
+        if date_to:
+            items = [item for item in items if item["created_at"] <= date_to]
+        items.sort(key=lambda item: (item.get(sort_by) is None, item.get(sort_by) or 0))
+        if query.get("orderBy", "desc").lower() == "desc":
+            items.reverse()
+        pages_count = (len(items) + limit - 1) // limit
+        return {
+            "data": [dict(item) for item in items[page * limit:(page + 1) * limit]],
+            "limit": limit,
+            "page": page,
+            "pagesCount": pages_count,
+            "total": len(items),
+        }
+
+    @staticmethod
+    def create_invoice(state, match, query, body):
+        _require(body, "price_amount", "price_currency")
+        invoice_id = state.next_id()
+        now = _now()
+        invoice = {
+            "id": str(invoice_id),
+            "token_id": str(invoice_id),
+            "order_id": body.get("order_id"),
+            "order_description": body.get("order_description"),
+            "price_amount": str(body["price_amount"]),
+            "price_currency": body["price_currency"].lower(),
+            "pay_currency": body.get("pay_currency"),
+            "ipn_callback_url": body.get("ipn_callback_url"),
+            "invoice_url": f"https://nowpayments.io/payment/?iid={invoice_id}",
+            "success_url": body.get("success_url"),
+            "cancel_url": body.get("cancel_url"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        state.invoices[invoice_id] = invoice
+        return dict(invoice)
+
+    @staticmethod
+    def create_invoice_payment(state, match, query, body):
+        _require(body, "iid", "pay_currency")
+        invoice = _lookup(state.invoices, body["iid"], "Invoice")
+        return dict(state.new_payment(
+            float(invoice["price_amount"]),
+            invoice["price_currency"],
+            body["pay_currency"],
+            order_id=invoice["order_id"],
+            order_description=invoice["order_description"],
+            invoice_id=int(invoice["id"]),
+        ))
+
+    @staticmethod
+    def auth(state, match, query, body):
+        _require(body, "email", "password")
+        return {"token": f"mock-jwt-{state.next_id()}"}
+
+    @staticmethod
+    def balance(state, match, query, body):
+        return {currency: dict(entry) for currency, entry in state.balance.items()}
+
+    @staticmethod
+    def create_payout(state, match, query, body):
+        withdrawals = body.get("withdrawals") or []
+        if not withdrawals:
+            raise MockAPIError(400, "withdrawals is required")
+        batch_id = state.next_id()
+        now = _now()
+        created = []
+        for withdrawal in withdrawals:
+            _require(withdrawal, "address", "currency", "amount")
+            withdrawal_id = state.next_id()
+            entry = {
+                "id": str(withdrawal_id),
+                "address": withdrawal["address"],
+                "currency": withdrawal["currency"].lower(),
+                "amount": str(withdrawal["amount"]),
+                "batch_withdrawal_id": str(batch_id),
+                "ipn_callback_url": body.get("ipn_callback_url"),
+                "status": "WAITING",
+                "extra_id": withdrawal.get("extra_id"),
+                "hash": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": None,
+            }
+            state.withdrawals[withdrawal_id] = entry
+            created.append(entry)
+        state.payouts[batch_id] = {"id": str(batch_id), "withdrawals": created}
+        return {"id": str(batch_id), "withdrawals": [dict(entry) for entry in created]}
+
+    @staticmethod
+    def get_payout(state, match, query, body):
+        payout = state.payouts.get(int(match.group(1)))
+        if payout is not None:
+            return [dict(entry) for entry in payout["withdrawals"]]
+        return [dict(_lookup(state.withdrawals, match.group(1), "Payout"))]
+
+    @staticmethod
+    def validate_address(state, match, query, body):
+        _require(body, "address", "currency")
+        if len(str(body["address"])) < 20:
+            raise MockAPIError(400, "Invalid payout_address")
+        return "OK"
+
+    @staticmethod
+    def payout_fee(state, match, query, body):
+        _require(query, "currency", "amount")
+        return {"currency": query["currency"].lower(), "fee": round(float(query["amount"]) * 0.005, 8)}
+
+    @staticmethod
+    def cancel_payout(state, match, query, body):
+        withdrawal = _lookup(state.withdrawals, match.group(1), "Withdrawal")
+        if withdrawal["status"] != "WAITING":
+            raise MockAPIError(400, "Payout cannot be cancelled")
+        withdrawal.update(status="REJECTED", updated_at=_now())
+        return {"status": "REJECTED"}
+
+    @staticmethod
+    def verify_payout(state, match, query, body):
+        payout = _lookup(state.payouts, match.group(1), "Payout")
+        _require(body, "verification_code")
+        for withdrawal in payout["withdrawals"]:
+            if withdrawal["status"] == "WAITING":
+                withdrawal.update(status="SENDING", updated_at=_now())
+        return "OK"
+
+    @staticmethod
+    def create_sub_partner(state, match, query, body):
+        _require(body, "name")
+        sub_partner_id = state.next_id()
+        now = _now()
+        user = {"id": str(sub_partner_id), "name": body["name"], "created_at": now, "updated_at": now}
+        state.sub_partners[sub_partner_id] = {"user": user, "balances": {}}
+        return {"result": dict(user)}
+
+    @staticmethod
+    def sub_partner_balance(state, match, query, body):
+        entry = _lookup(state.sub_partners, match.group(1), "Sub-partner")
+        balances = {
+            currency: {"amount": amount, "pendingAmount": 0}
+            for currency, amount in entry["balances"].items()
+        }
+        return {"result": {"subPartnerId": entry["user"]["id"], "balances": balances}}
+
+    @staticmethod
+    def list_sub_partners(state, match, query, body):
+        users = [entry["user"] for entry in state.sub_partners.values()]
+        if query.get("id"):
+            wanted = set(query["id"].split(","))
+            users = [user for user in users if user["id"] in wanted]
+        if query.get("order", "ASC").upper() == "DESC":
+            users.reverse()
+        return _page([dict(user) for user in users], query)
+
+    @staticmethod
+    def _move(state, sub_partner_id: Any, currency: str, amount: float) -> None:
+        entry = _lookup(state.sub_partners, str(sub_partner_id), "Sub-partner")
+        balances = entry["balances"]
+        new_amount = round(balances.get(currency, 0) + amount, 8)
+        if new_amount < 0:
+            raise MockAPIError(400, "Insufficient balance")
+        balances[currency] = new_amount
+
+    @staticmethod
+    def _transfer(state, from_id: Any, to_id: Any, currency: str, amount: float) -> Dict[str, Any]:
+        transfer_id = state.next_id()
+        now = _now()
+        transfer = {
+            "id": str(transfer_id),
+            "from_sub_id": str(from_id),
+            "to_sub_id": str(to_id),
+            "status": "FINISHED",
+            "created_at": now,
+            "updated_at": now,
+            "amount": str(amount),
+            "currency": currency,
+        }
+        state.transfers[transfer_id] = transfer
+        return {"result": dict(transfer)}
+
+    @staticmethod
+    def transfer(state, match, query, body):
+        _require(body, "currency", "amount", "from_id", "to_id")
+        currency, amount = body["currency"].lower(), float(body["amount"])
+        _Routes._move(state, body["from_id"], currency, -amount)
+        _Routes._move(state, body["to_id"], currency, amount)
+        return _Routes._transfer(state, body["from_id"], body["to_id"], currency, amount)
+
+    @staticmethod
+    def deposit(state, match, query, body):
+        _require(body, "currency", "amount", "sub_partner_id")
+        currency, amount = body["currency"].lower(), float(body["amount"])
+        _Routes._move(state, body["sub_partner_id"], currency, amount)
+        return _Routes._transfer(state, "master", body["sub_partner_id"], currency, amount)
+
+    @staticmethod
+    def write_off(state, match, query, body):
+        _require(body, "currency", "amount", "sub_partner_id")
+        currency, amount = body["currency"].lower(), float(body["amount"])
+        _Routes._move(state, body["sub_partner_id"], currency, -amount)
+        return _Routes._transfer(state, body["sub_partner_id"], "master", currency, amount)
+
+    @staticmethod
+    def list_transfers(state, match, query, body):
+        transfers = list(state.transfers.values())
+        if query.get("id"):
+            wanted = set(query["id"].split(","))
+            transfers = [item for item in transfers if wanted & {item["from_sub_id"], item["to_sub_id"]}]
+        if query.get("status"):
+            statuses = {status.upper() for status in query["status"].split(",")}
+            transfers = [item for item in transfers if item["status"] in statuses]
+        return _page([dict(item) for item in transfers], query)
+
+    @staticmethod
+    def get_transfer(state, match, query, body):
+        return {"result": dict(_lookup(state.transfers, match.group(1), "Transfer"))}
+
+    @staticmethod
+    def sub_partner_payment(state, match, query, body):
+        _require(body, "currency", "amount", "sub_partner_id")
+        _lookup(state.sub_partners, str(body["sub_partner_id"]), "Sub-partner")
+        payment = state.new_payment(float(body["amount"]), body["currency"], body["currency"])
+        payment["sub_partner_id"] = str(body["sub_partner_id"])
+        return {"result": dict(payment)}
+
+    @staticmethod
+    def sub_partner_payments(state, match, query, body):
+        payments = [item for item in state.payments.values() if item.get("sub_partner_id")]
+        if query.get("id"):
+            wanted = set(query["id"].split(","))
+            payments = [item for item in payments if item["sub_partner_id"] in wanted]
+        return _page([dict(item) for item in payments], query)
+
+    @staticmethod
+    def create_plan(state, match, query, body):
+        _require(body, "title", "interval_day", "amount", "currency")
+        plan_id = state.next_id()
+        now = _now()
+        plan = {
+            "id": str(plan_id),
+            "title": body["title"],
+            "interval_day": str(body["interval_day"]),
+            "ipn_callback_url": body.get("ipn_callback_url"),
+            "success_url": body.get("success_url"),
+            "cancel_url": body.get("cancel_url"),
+            "partially_paid_url": body.get("partially_paid_url"),
+            "amount": body["amount"],
+            "currency": body["currency"].upper(),
+            "created_at": now,
+            "updated_at": now,
+        }
+        state.plans[plan_id] = plan
+        return {"result": dict(plan)}
+
+    @staticmethod
+    def list_plans(state, match, query, body):
+        return _page([dict(plan) for plan in state.plans.values()], query)
+
+    @staticmethod
+    def get_plan(state, match, query, body):
+        return {"result": dict(_lookup(state.plans, match.group(1), "Plan"))}
+
+    @staticmethod
+    def update_plan(state, match, query, body):
+        plan = _lookup(state.plans, match.group(1), "Plan")
+        plan.update({key: value for key, value in body.items() if key in plan and key != "id"})
+        plan["updated_at"] = _now()
+        return {"result": dict(plan)}
+
+    @staticmethod
+    def create_subscription(state, match, query, body):
+        _require(body, "subscription_plan_id")
+        _lookup(state.plans, str(body["subscription_plan_id"]), "Plan")
+        subscription_id = state.next_id()
+        now = _now()
+        subscription = {
+            "id": str(subscription_id),
+            "subscription_plan_id": str(body["subscription_plan_id"]),
+            "is_active": False,
+            "status": "WAITING_PAY",
+            "expire_date": _timestamp(datetime.now(timezone.utc) + timedelta(days=7)),
+            "subscriber": {"email": body.get("email"), "sub_partner_id": body.get("sub_partner_id")},
+            "email": body.get("email"),
+            "sub_partner_id": body.get("sub_partner_id"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        state.subscriptions[subscription_id] = subscription
+        return {"result": [dict(subscription)]}
+
+    @staticmethod
+    def list_subscriptions(state, match, query, body):
+        subscriptions = list(state.subscriptions.values())
+        if query.get("status"):
+            subscriptions = [item for item in subscriptions if item["status"] == query["status"].upper()]
+        if query.get("subscription_plan_id"):
+            subscriptions = [
+                item for item in subscriptions
+                if item["subscription_plan_id"] == str(query["subscription_plan_id"])
+            ]
+        if query.get("is_active"):
+            active = query["is_active"] == "true"
+            subscriptions = [item for item in subscriptions if item["is_active"] is active]
+        return _page([dict(item) for item in subscriptions], query)
+
+    @staticmethod
+    def get_subscription(state, match, query, body):
+        return {"result": dict(_lookup(state.subscriptions, match.group(1), "Subscription"))}
+
+    @staticmethod
+    def delete_subscription(state, match, query, body):
+        _lookup(state.subscriptions, match.group(1), "Subscription")
+        del state.subscriptions[int(match.group(1))]
+        return {"result": "ok"}
+
+
+def _route(method: str, pattern: str, handler: Callable[..., Any], jwt: bool = False) -> Route:
+    return method, re.compile(f"^{pattern}$"), handler, jwt
+
+
+ROUTES: List[Route] = [
+    _route("GET", "status", _Routes.status),
+    _route("GET", "currencies", _Routes.currencies),
+    _route("GET", "full-currencies", _Routes.full_currencies),
+    _route("GET", "merchant/coins", _Routes.merchant_coins),
+    _route("GET", "estimate", _Routes.estimate),
+    _route("GET", "min-amount", _Routes.min_amount),
+    _route("POST", "payment", _Routes.create_payment),
+    _route("GET", "payment", _Routes.list_payments, jwt=True),
+    _route("GET", r"payment/(\d+)", _Routes.get_payment),
+    _route("POST", r"payment/(\d+)/update-merchant-estimate", _Routes.update_estimate),
+    _route("POST", "invoice", _Routes.create_invoice),
+    _route("POST", "invoice-payment", _Routes.create_invoice_payment),
+    _route("POST", "auth", _Routes.auth),
+    _route("GET", "balance", _Routes.balance),
+    _route("POST", "payout", _Routes.create_payout, jwt=True),
+    _route("POST", "payout/validate-address", _Routes.validate_address),
+    _route("GET", "payout/fee", _Routes.payout_fee),
+    _route("GET", r"payout/(\d+)", _Routes.get_payout),
+    _route("POST", r"payout/(\d+)/cancel", _Routes.cancel_payout, jwt=True),
+    _route("POST", r"payout/(\d+)/verify", _Routes.verify_payout, jwt=True),
+    _route("POST", "sub-partner/balance", _Routes.create_sub_partner, jwt=True),
+    _route("GET", r"sub-partner/balance/(\d+)", _Routes.sub_partner_balance),
+    _route("GET", "sub-partner", _Routes.list_sub_partners, jwt=True),
+    _route("GET", "sub-partner/transfers", _Routes.list_transfers, jwt=True),
+    _route("GET", r"sub-partner/transfer/(\d+)", _Routes.get_transfer, jwt=True),
+    _route("POST", "sub-partner/transfer", _Routes.transfer, jwt=True),
+    _route("POST", "sub-partner/payment", _Routes.sub_partner_payment, jwt=True),
+    _route("GET", "sub-partner/payments", _Routes.sub_partner_payments, jwt=True),
+    _route("POST", "sub-partner/deposit", _Routes.deposit, jwt=True),
+    _route("POST", "sub-partner/write-off", _Routes.write_off, jwt=True),
+    _route("POST", "subscriptions/plans", _Routes.create_plan, jwt=True),
+    _route("GET", "subscriptions/plans", _Routes.list_plans),
+    _route("GET", r"subscriptions/plans/(\d+)", _Routes.get_plan),
+    _route("PATCH", r"subscriptions/plans/(\d+)", _Routes.update_plan, jwt=True),
+    _route("POST", "subscriptions", _Routes.create_subscription, jwt=True),
+    _route("GET", "subscriptions", _Routes.list_subscriptions, jwt=True),
+    _route("GET", r"subscriptions/(\d+)", _Routes.get_subscription),
+    _route("DELETE", r"subscriptions/(\d+)", _Routes.delete_subscription, jwt=True),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY a
+    # kept-alive connection stalls on delayed ACKs for ~40ms per response.
+    disable_nagle_algorithm = True
+    server: "_MockHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._serve("GET")
+
+    def do_POST(self) -> None:
+        self._serve("POST")
+
+    def do_PATCH(self) -> None:
+        self._serve("PATCH")
+
+    def do_DELETE(self) -> None:
+        self._serve("DELETE")
+
+    def _serve(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        mock = self.server.mock
+        status, headers, payload = mock.respond(method, self.path, self.headers, raw_body)
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if payload == b"OK" else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockNowPaymentsServer"
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients that time out hang up before the delayed response is sent.
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def process_request(self, request, client_address) -> None:
+        with self.mock._lock:
+            self.mock.connection_count += 1
+        super().process_request(request, client_address)
+
+
+class MockNowPaymentsServer:
+    """
+    Threaded local HTTP server imitating the NOWPayments API.
+
+    :param host: Interface to bind.
+    :param port: Port to bind; ``0`` picks a free port.
+    :param latency: Seconds added to every response, or a ``(low, high)``
+        range sampled uniformly per request.
+    :param error_rate: Fraction of requests answered with ``500``.
+    :param rate_limit_rate: Fraction of requests answered with ``429``.
+    :param retry_after: Seconds sent in ``Retry-After`` with ``429`` responses.
+    :param payments: Number of payments seeded for the payment list.
+    :param api_key: Accepted ``x-api-key``; any non-empty key when ``None``.
+    :param seed: Seed for generated data and injected failures.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Latency = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        payments: int = 250,
+        api_key: Optional[str] = None,
+        seed: Optional[int] = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.state = MockNowPaymentsState(payments=payments, seed=seed)
+        self.request_count = 0
+        self.connection_count = 0
+        self.requests: Deque[Tuple[str, str]] = deque(maxlen=1000)
+        self._forced: Deque[int] = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_MockHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to pass to ``NowPayments(base_url=...)``."""
+        if self._server is None:
+            raise RuntimeError("MockNowPaymentsServer is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}{API_PREFIX}"
+
+    def start(self) -> "MockNowPaymentsServer":
+        if self._server is not None:
+            return self
+        self._server = _MockHTTPServer((self.host, self.port), _Handler)
+        self._server.mock = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="nowpayment-mock-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "MockNowPaymentsServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def fail_next(self, status: int = 500, times: int = 1) -> None:
+        """
+        Answer the next ``times`` requests with ``status`` regardless of rates.
+
+        :param status: HTTP status to return, e.g. ``429`` or ``503``.
+        :param times: Number of requests affected.
+        """
+        with self._lock:
+            self._forced.extend([status] * times)
+
+    def respond(
+        self,
+        method: str,
+        target: str,
+        headers: Any,
+        body: bytes,
+    ) -> Tuple[int, List[Tuple[str, str]], Union[bytes, Dict[str, Any], List[Any]]]:
+        """
+        Produce the response for one request independently of the HTTP layer.
+
+        :return: Status code, extra headers and a JSON payload or raw bytes.
+        """
+        url = urlsplit(target)
+        with self._lock:
+            self.request_count += 1
+            self.requests.append((method, url.path))
+            forced = self._forced.popleft() if self._forced else None
+            roll = self._random.random()
+            delay = self._random.uniform(*self.latency) if isinstance(self.latency, tuple) else self.latency
+        if delay:
+            time.sleep(delay)
+
+        if forced is None:
+            if roll < self.rate_limit_rate:
+                forced = 429
+            elif roll < self.rate_limit_rate + self.error_rate:
+                forced = 500
+        if forced == 429:
+            return 429, [("Retry-After", str(self.retry_after))], {"message": "Too many requests"}
+        if forced is not None:
+            return forced, [], {"message": "Internal server error"}
+
+        api_key = headers.get("x-api-key")
+        if not api_key or (self.api_key is not None and api_key != self.api_key):
+            return 403, [], {"message": "Invalid api key"}
+        if not url.path.startswith(API_PREFIX + "/"):
+            return 404, [], {"message": "Not found"}
+        path = url.path[len(API_PREFIX) + 1:].rstrip("/")
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        allowed = False
+        for route_method, pattern, handler, jwt in ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            if jwt and not (headers.get("Authorization") or "").startswith("Bearer "):
+                return 401, [], {"message": "Authorization header is empty (Bearer JWTtoken is required)"}
+            try:
+                data = json.loads(body) if body else {}
+                with self.state.lock:
+                    result = handler(self.state, match, query, data)
+            except MockAPIError as exc:
+                return exc.status, [], {"message": exc.message}
+            except (ValueError, TypeError, AttributeError) as exc:
+                return 400, [], {"message": str(exc)}
+            if result == "OK":
+                return 200, [], b"OK"
+            return 200, [], result
+        if allowed:
+            return 405, [], {"message": "Method not allowed"}
+        return 404, [], {"message": "Not found"}
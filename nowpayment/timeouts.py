@@ -0,0 +1,127 @@
+"""
+Structured timeouts and per-operation deadlines.
+
+``Timeout`` splits the per-attempt timeout into connect and read parts.
+``deadline()`` gives everything inside a ``with`` block one time budget:
+every API call made in it, including retries, rate-limiter waits, pages of
+``iter_payment_pages`` and the concurrent fetches of ``PaymentExporter``,
+caps its connect and read timeouts at the time left and fails with
+``DeadlineExceededError`` once it is used up. Deadlines nest; the earlier
+one wins.
+
+Usage:
+  np = NowPayments("API_KEY", timeout=Timeout(connect=3.05, read=10))
+
+  with deadline(2.0):
+      np.payment.create_payment(...)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple, Union
+
+from nowpayment.exceptions import NowPaymentsError
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """
+    Per-attempt timeouts in seconds; ``None`` waits indefinitely.
+
+    :param connect: Time allowed to open the connection.
+    :param read: Time allowed between bytes of the response.
+    """
+
+    connect: Optional[float] = None
+    read: Optional[float] = None
+
+    def as_tuple(self) -> Tuple[Optional[float], Optional[float]]:
+        return self.connect, self.read
+
+
+TimeoutSpec = Union[None, int, float, Tuple[Optional[float], Optional[float]], Timeout]
+
+
+class DeadlineExceededError(NowPaymentsError, TimeoutError):
+    """Raised when an operation's deadline passes before it completes."""
+
+
+class Deadline:
+    """
+    Point in time an operation must finish by.
+
+    :param seconds: Budget from now.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left; zero or negative once expired."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def __repr__(self) -> str:
+        return f"<Deadline remaining={self.remaining():.3f}s>"
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("nowpayment_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline in effect for the calling context, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline(budget: Union[float, Deadline, None]) -> Iterator[Optional[Deadline]]:
+    """
+    Run the ``with`` block under a deadline.
+
+    :param budget: Seconds from now, an existing ``Deadline`` (e.g. to carry
+        one into another thread), or ``None`` to keep the current one.
+    :return: Context manager yielding the deadline in effect.
+    """
+    if budget is None:
+        yield _current_deadline.get()
+        return
+    selected = budget if isinstance(budget, Deadline) else Deadline(budget)
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < selected.expires_at:
+        selected = outer
+    token = _current_deadline.set(selected)
+    try:
+        yield selected
+    finally:
+        _current_deadline.reset(token)
+
+
+def attempt_timeout(timeout: TimeoutSpec, remaining: Optional[float] = None) -> TimeoutSpec:
+    """
+    Build the timeout passed to a transport for one attempt.
+
+    :param timeout: Configured timeout: seconds, ``(connect, read)`` or ``Timeout``.
+    :param remaining: Seconds left before the deadline, if there is one.
+    :return: ``None``, seconds or a ``(connect, read)`` tuple, each part
+        capped at ``remaining``.
+    """
+    if isinstance(timeout, Timeout):
+        timeout = timeout.as_tuple()
+    if remaining is None:
+        return timeout
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return (
+            remaining if connect is None else min(connect, remaining),
+            remaining if read is None else min(read, remaining),
+        )
+    return min(timeout, remaining)
@@ -0,0 +1,31 @@
+from nowpayment.transports.base import (
+    RequestsTransport,
+    SentRequest,
+    Transport,
+    TransportResponse,
+    query_pairs,
+)
+from nowpayment.transports.cassette import (
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+    match_key,
+    normalize_params,
+)
+from nowpayment.transports.direct import Urllib3Transport
+from nowpayment.transports.http2 import HTTP2Transport
+
+__all__ = [
+    "CassetteMissError",
+    "HTTP2Transport",
+    "RecordingTransport",
+    "ReplayTransport",
+    "RequestsTransport",
+    "SentRequest",
+    "Transport",
+    "TransportResponse",
+    "Urllib3Transport",
+    "match_key",
+    "normalize_params",
+    "query_pairs",
+]
@@ -0,0 +1,297 @@
+import abc
+import json
+import os
+import threading
+from datetime import timedelta
+from typing import Any, List, Mapping, NamedTuple, Optional, Tuple, Union
+from weakref import WeakSet
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.exceptions import ReadTimeoutError
+
+from nowpayment.constants import SESSION_PROCESS, SESSION_SCOPES, SESSION_THREAD
+from nowpayment.timeouts import Deadline, current_deadline
+
+# What a transport receives as ``timeout``: seconds or ``(connect, read)``.
+TimeoutValue = Optional[Union[int, float, Tuple[Optional[float], Optional[float]]]]
+
+
+class Transport(abc.ABC):
+    """
+    Sends HTTP requests for ``BaseAPI``.
+
+    Implementations return a ``requests.Response`` (or an object with the
+    same ``status_code``, ``ok``, ``reason``, ``text``, ``content``,
+    ``headers``, ``elapsed``, ``request`` and ``json()`` members). ``timeout``
+    is ``None``, seconds or a ``(connect, read)`` tuple, as in ``requests``.
+
+    ``timeout`` alone bounds each socket operation, not the whole attempt.
+    Inside a ``deadline()`` block the built-in transports also bound the
+    attempt as a whole by ``current_deadline()``; custom transports should
+    do the same.
+
+    ``last_activity`` is the ``time.monotonic()`` of the last response
+    received through the transport; clients update it after every attempt.
+    """
+
+    last_activity: float = 0.0
+
+    @abc.abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send one request and return its response."""
+
+    def close(self) -> None:
+        """Release resources held by the transport."""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def query_pairs(params: Any) -> List[Tuple[str, str]]:
+    """
+    Flatten query params the way ``requests`` encodes them, keeping order.
+
+    ``None`` values are dropped and list values expand to repeated keys.
+    """
+    if not params:
+        return []
+    items = params.items() if isinstance(params, Mapping) else params
+    pairs = []
+    for key, value in items:
+        if value is None:
+            continue
+        values = value if isinstance(value, (list, tuple)) else [value]
+        pairs.extend((str(key), str(item)) for item in values if item is not None)
+    return pairs
+
+
+class SentRequest(NamedTuple):
+    """What a non-``requests`` transport sent, exposed as ``response.request``."""
+
+    method: str
+    url: str
+    body: Optional[bytes] = None
+
+
+class TransportResponse:
+    """
+    Minimal ``requests.Response`` stand-in returned by lean transports.
+
+    :param status_code: HTTP status code.
+    :param reason: Status reason phrase.
+    :param headers: Response headers; lookups should be case-insensitive.
+    :param content: Raw response body.
+    :param elapsed: Time from sending the request to receiving the headers.
+    :param request: What was sent.
+    :param connect_time: Seconds spent opening a new connection, when the
+        transport opened one for this request and could measure it.
+    """
+
+    __slots__ = ("status_code", "reason", "headers", "content", "elapsed", "request", "connect_time", "url")
+
+    def __init__(
+        self,
+        status_code: int,
+        reason: str,
+        headers: Mapping[str, str],
+        content: bytes,
+        elapsed: timedelta,
+        request: SentRequest,
+        connect_time: Optional[float] = None,
+    ):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.elapsed = elapsed
+        self.request = request
+        self.connect_time = connect_time
+        self.url = request.url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def __repr__(self) -> str:
+        return f"<TransportResponse [{self.status_code}]>"
+
+
+def deadline_timeout(timeout: TimeoutValue, budget: Deadline) -> urllib3.Timeout:
+    """
+    Build a ``urllib3.Timeout`` whose ``total`` is the time left before ``budget``.
+
+    urllib3 takes the time spent connecting out of ``total`` before it waits
+    for the response, so connect and read share the budget instead of each
+    getting all of it.
+    """
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return urllib3.Timeout(connect=connect, read=read, total=max(budget.remaining(), 0.001))
+
+
+def read_body(raw: Any, timeout: TimeoutValue, budget: Deadline, chunk_size: int = 16 * 1024) -> bytes:
+    """
+    Read a streamed ``urllib3`` response body without running past ``budget``.
+
+    Before every chunk the socket timeout is lowered to the time left, so a
+    body trickling in byte by byte fails at the deadline rather than after
+    another full read timeout.
+
+    :param raw: ``urllib3.HTTPResponse`` opened with ``preload_content=False``.
+    :param timeout: The attempt's timeout; its read part still applies per chunk.
+    :param budget: Deadline of the operation.
+    :raises requests.ReadTimeout: If the deadline passes before the body is complete.
+    :raises requests.ConnectionError: If the connection breaks while reading.
+    """
+    read = timeout[1] if isinstance(timeout, tuple) else timeout
+    # ``read1`` (urllib3 2) returns after one socket read instead of waiting
+    # for a full chunk, so the deadline is checked as bytes arrive.
+    read_chunk = getattr(raw, "read1", None) or raw.read
+    chunks = []
+    try:
+        while True:
+            remaining = budget.remaining()
+            if remaining <= 0:
+                raise requests.ReadTimeout("Deadline passed while reading the response body")
+            sock = getattr(getattr(raw, "connection", None), "sock", None)
+            if sock is not None:
+                sock.settimeout(remaining if read is None else min(read, remaining))
+            chunk = read_chunk(chunk_size, decode_content=True)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    except (requests.RequestException, ReadTimeoutError, Urllib3HTTPError) as exc:
+        # A half-read connection must not go back to the pool.
+        raw.close()
+        if isinstance(exc, requests.RequestException):
+            raise
+        if isinstance(exc, ReadTimeoutError):
+            raise requests.ReadTimeout(str(exc)) from exc
+        raise requests.ConnectionError(str(exc)) from exc
+
+
+def reset_connection_pools(session: requests.Session) -> None:
+    """
+    Give ``session`` fresh connection pools without closing the current ones.
+
+    Used after ``fork()``: the inherited connections still belong to the
+    parent, so they are dropped rather than closed. Session settings
+    (headers, auth, cookies, mounted adapters) are kept.
+    """
+    for adapter in session.adapters.values():
+        if isinstance(adapter, HTTPAdapter):
+            # Same re-initialisation HTTPAdapter performs when unpickled.
+            adapter.proxy_manager = {}
+            adapter.init_poolmanager(adapter._pool_connections, adapter._pool_maxsize, block=adapter._pool_block)
+
+
+class RequestsTransport(Transport):
+    """
+    Default transport backed by a ``requests.Session``.
+
+    The transport notices when it is used in a forked child process and
+    moves to fresh connection pools there, so a client created before
+    ``fork()`` (gunicorn prefork, ``multiprocessing``) never shares sockets
+    with its parent. With ``scope="thread"`` every thread gets its own
+    session, as ``requests`` does not guarantee a session is thread-safe.
+
+    :param session: Session to send requests with; created on first use when omitted.
+    :param scope: ``"process"`` (one session per process) or ``"thread"``
+        (one session per thread; cannot be combined with ``session``).
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, scope: str = SESSION_PROCESS):
+        if scope not in SESSION_SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SESSION_SCOPES)}")
+        if scope == SESSION_THREAD and session is not None:
+            raise ValueError("scope='thread' creates a session per thread and cannot use a given session")
+        self.scope = scope
+        self._session = session
+        self._owns_session = session is None
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_sessions: "WeakSet[requests.Session]" = WeakSet()
+
+    @property
+    def session(self) -> requests.Session:
+        """Session for the calling process and, with ``scope="thread"``, thread."""
+        if self._pid != os.getpid():
+            self._after_fork()
+        if self.scope == SESSION_THREAD:
+            session = getattr(self._local, "session", None)
+            if session is None:
+                session = self._local.session = requests.Session()
+                with self._lock:
+                    self._thread_sessions.add(session)
+            return session
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = requests.Session()
+        return self._session
+
+    def _after_fork(self) -> None:
+        # A lock held by another parent thread at fork time stays locked in
+        # the child, so the locks are replaced rather than acquired.
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_sessions = WeakSet()
+        if self._session is not None:
+            reset_connection_pools(self._session)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        budget = current_deadline()
+        if budget is None:
+            return self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        response = self.session.request(
+            method,
+            url,
+            headers=headers,
+            timeout=deadline_timeout(timeout, budget),
+            stream=True,
+            **kwargs,
+        )
+        response._content = read_body(response.raw, timeout, budget)
+        response._content_consumed = True
+        # Hands the fully read connection back to the pool.
+        response.close()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._thread_sessions)
+            self._thread_sessions = WeakSet()
+        self._local = threading.local()
+        for session in sessions:
+            session.close()
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,239 @@
+"""
+Record and replay API interactions.
+
+``RecordingTransport`` wraps another transport and appends every
+request/response pair to an NDJSON cassette. ``ReplayTransport`` serves those
+responses back without a network, matching on method, URL path and
+normalized query params. Credentials are never written: request headers are
+not recorded, and values of ``REDACTED_FIELDS`` (the ``/auth`` email and
+password, the returned JWT, ...) are replaced with ``"[REDACTED]"`` in both
+request and response bodies, at any nesting level.
+
+Usage:
+  recorder = RecordingTransport("sandbox.ndjson")
+  NowPayments(SANDBOX_KEY, sandbox=True, transport=recorder).payment.get_payment_list()
+
+  replay = ReplayTransport("sandbox.ndjson")
+  NowPayments("any-key", sandbox=True, transport=replay).payment.get_payment_list()
+"""
+
+import json
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import IO, Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from nowpayment.exceptions import NowPaymentsError
+from nowpayment.transports.base import RequestsTransport, TimeoutValue, Transport, query_pairs
+
+CASSETTE_VERSION = 1
+
+# Response headers that can carry credentials or per-session state.
+_SKIPPED_RESPONSE_HEADERS = frozenset({"set-cookie", "authorization", "x-api-key"})
+
+# Body fields whose values are credentials; matched case-insensitively.
+REDACTED_FIELDS = frozenset({
+    "email",
+    "password",
+    "token",
+    "access_token",
+    "refresh_token",
+    "jwt",
+    "authorization",
+    "api_key",
+    "x-api-key",
+    "ipn_secret",
+    "verification_code",
+})
+REDACTED = "[REDACTED]"
+
+MatchKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class CassetteMissError(NowPaymentsError):
+    """Raised when a replayed request has no recorded response."""
+
+
+def normalize_params(params: Any) -> Tuple[Tuple[str, str], ...]:
+    """
+    Normalize query params the way ``requests`` encodes them.
+
+    ``None`` values are dropped, list values expand to repeated keys, values
+    become strings and pairs are sorted, so dict order does not matter.
+    """
+    return tuple(sorted(query_pairs(params)))
+
+
+def match_key(method: str, url: str, params: Any = None) -> MatchKey:
+    """Build the key a request is matched on: method, path and normalized params."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    merged = normalize_params(query) + normalize_params(params)
+    return method.upper(), parts.path.rstrip("/"), tuple(sorted(merged))
+
+
+def redact(value: Any) -> Any:
+    """Return ``value`` with every ``REDACTED_FIELDS`` entry of nested objects replaced."""
+    if isinstance(value, dict):
+        return {
+            name: REDACTED if str(name).lower() in REDACTED_FIELDS else redact(item)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def _redact_body(text: str) -> str:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return text
+    if not isinstance(data, (dict, list)):
+        return text
+    return json.dumps(redact(data), separators=(",", ":"))
+
+
+class RecordingTransport(Transport):
+    """
+    Send requests through ``transport`` and append each interaction to a cassette.
+
+    :param path: Cassette file; interactions are appended.
+    :param transport: Transport doing the real work; a ``RequestsTransport`` by
+        default. Only a transport created here is closed by ``close()``.
+    """
+
+    def __init__(self, path: str, transport: Optional[Transport] = None):
+        self.path = path
+        self.transport = transport if transport is not None else RequestsTransport()
+        self._owns_transport = transport is None
+        self._lock = threading.Lock()
+        self._handle: Optional[IO[str]] = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        response = self.transport.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        key = match_key(method, url, kwargs.get("params"))
+        interaction = {
+            "version": CASSETTE_VERSION,
+            "request": {
+                "method": key[0],
+                "path": key[1],
+                "params": [list(pair) for pair in key[2]],
+                "json": redact(kwargs.get("json")),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() not in _SKIPPED_RESPONSE_HEADERS
+                },
+                "body": _redact_body(response.text),
+                "elapsed": response.elapsed.total_seconds(),
+            },
+        }
+        line = json.dumps(interaction, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, "a", encoding="utf-8")
+            self._handle.write(line)
+            self._handle.flush()
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+        if self._owns_transport:
+            self.transport.close()
+
+
+class _RecordedResponse:
+    __slots__ = ("status", "reason", "headers", "content", "elapsed")
+
+    def __init__(self, data: Dict[str, Any], keep_elapsed: bool):
+        self.status = data["status"]
+        self.reason = data.get("reason") or ""
+        self.headers = data.get("headers") or {}
+        self.content = (data.get("body") or "").encode("utf-8")
+        self.elapsed = timedelta(seconds=data.get("elapsed", 0.0) if keep_elapsed else 0.0)
+
+    def build(self, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = self.elapsed
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Serve recorded responses without a network.
+
+    Responses recorded for the same request are returned in recording order.
+    Once they are used up the last one keeps being returned, so a short
+    cassette can drive load tests and benchmarks indefinitely; with
+    ``strict`` a further request raises ``CassetteMissError`` instead.
+
+    :param path: Cassette file written by ``RecordingTransport``.
+    :param strict: Raise ``CassetteMissError`` once a request's recordings are used up.
+    :param keep_elapsed: Report the recorded ``elapsed`` instead of zero.
+    """
+
+    def __init__(self, path: str, strict: bool = False, keep_elapsed: bool = False):
+        self.path = path
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._responses: Dict[MatchKey, Deque[_RecordedResponse]] = {}
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                request = interaction["request"]
+                key = (
+                    request["method"],
+                    request["path"],
+                    tuple(tuple(pair) for pair in request.get("params") or ()),
+                )
+                self._responses.setdefault(key, deque()).append(
+                    _RecordedResponse(interaction["response"], keep_elapsed)
+                )
+
+    @property
+    def recorded(self) -> List[MatchKey]:
+        """Match keys present in the cassette."""
+        return list(self._responses)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        key = match_key(method, url, kwargs.get("params"))
+        with self._lock:
+            queue = self._responses.get(key)
+            if not queue:
+                raise CassetteMissError(f"No recorded response for {key[0]} {key[1]} params={list(key[2])}")
+            recorded = queue.popleft() if len(queue) > 1 or self.strict else queue[0]
+        return recorded.build(url)
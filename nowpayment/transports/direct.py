@@ -0,0 +1,206 @@
+"""
+Lean transport that talks to urllib3 directly.
+
+``Urllib3Transport`` skips the ``requests`` session machinery (hooks,
+adapters, cookie jar, redirect handling, environment proxy lookup) and sends
+each call straight through a ``urllib3.PoolManager``. It also measures the
+time spent opening new connections, which ``ClientMetrics`` reports as the
+``connect`` phase.
+
+Errors are raised as the matching ``requests`` exceptions, so retries and
+error handling behave the same as with the default transport. Redirects are
+returned rather than followed. ``urllib3`` pools are thread-safe, and a
+forked child process starts with fresh pools.
+
+Usage:
+  np = NowPayments("API_KEY", transport=Urllib3Transport(maxsize=20))
+"""
+
+import json
+import os
+import time
+from datetime import timedelta
+from typing import Any, Optional, Type
+from urllib.parse import urlencode
+
+import requests
+import urllib3
+from urllib3._collections import RecentlyUsedContainer
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    LocationValueError,
+    NewConnectionError,
+    ReadTimeoutError,
+    SSLError,
+)
+from urllib3.exceptions import TimeoutError as Urllib3TimeoutError
+
+from nowpayment.timeouts import current_deadline
+from nowpayment.transports.base import (
+    SentRequest,
+    TimeoutValue,
+    Transport,
+    TransportResponse,
+    deadline_timeout,
+    query_pairs,
+    read_body,
+)
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    connect_time: Optional[float] = None
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        self.connect_time = time.perf_counter() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    connect_time: Optional[float] = None
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        self.connect_time = time.perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def _timeout(timeout: TimeoutValue) -> urllib3.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return urllib3.Timeout(connect=connect, read=read)
+    return urllib3.Timeout(connect=timeout, read=timeout)
+
+
+def _requests_error(exc: Exception) -> Type[requests.RequestException]:
+    # NewConnectionError subclasses ConnectTimeoutError for historical
+    # reasons, so it has to be checked first.
+    if isinstance(exc, NewConnectionError):
+        return requests.ConnectionError
+    if isinstance(exc, ConnectTimeoutError):
+        return requests.ConnectTimeout
+    if isinstance(exc, (ReadTimeoutError, Urllib3TimeoutError)):
+        return requests.ReadTimeout
+    if isinstance(exc, SSLError):
+        return requests.exceptions.SSLError
+    if isinstance(exc, LocationValueError):
+        return requests.exceptions.InvalidURL
+    return requests.ConnectionError
+
+
+class Urllib3Transport(Transport):
+    """
+    Transport sending requests through a ``urllib3.PoolManager``.
+
+    :param pool_manager: Pool manager to use; created on first use when
+        omitted. Connect time is only measured for the pools this transport creates.
+    :param num_pools: Number of per-host connection pools to cache.
+    :param maxsize: Connections kept open per host.
+    :param block: Wait for a free connection instead of opening extra ones
+        beyond ``maxsize``.
+    """
+
+    def __init__(
+        self,
+        pool_manager: Optional[urllib3.PoolManager] = None,
+        num_pools: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+    ):
+        self._pool_manager = pool_manager
+        self._owns_pool_manager = pool_manager is None
+        self.num_pools = num_pools
+        self.maxsize = maxsize
+        self.block = block
+        self._pid = os.getpid()
+
+    @property
+    def pool_manager(self) -> urllib3.PoolManager:
+        if self._pid != os.getpid():
+            self._after_fork()
+        if self._pool_manager is None:
+            manager = urllib3.PoolManager(num_pools=self.num_pools, maxsize=self.maxsize, block=self.block)
+            manager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+            self._pool_manager = manager
+        return self._pool_manager
+
+    def _after_fork(self) -> None:
+        # Connections inherited from the parent are still in use there, so
+        # they are dropped without being closed.
+        self._pid = os.getpid()
+        if self._owns_pool_manager:
+            self._pool_manager = None
+        elif self._pool_manager is not None:
+            self._pool_manager.pools = RecentlyUsedContainer(self.num_pools, dispose_func=lambda pool: pool.close())
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> TransportResponse:
+        pairs = query_pairs(kwargs.get("params"))
+        if pairs:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(pairs)}"
+        body: Optional[bytes] = None
+        if kwargs.get("json") is not None:
+            body = json.dumps(kwargs["json"], allow_nan=False).encode("utf-8")
+        elif kwargs.get("data") is not None:
+            data = kwargs["data"]
+            body = data.encode("utf-8") if isinstance(data, str) else data
+        request_headers = {"Accept-Encoding": "gzip, deflate"}
+        if headers:
+            request_headers.update(headers)
+
+        budget = current_deadline()
+        started = time.perf_counter()
+        try:
+            raw = self.pool_manager.urlopen(
+                method,
+                url,
+                body=body,
+                headers=request_headers,
+                timeout=_timeout(timeout) if budget is None else deadline_timeout(timeout, budget),
+                retries=False,
+                redirect=False,
+                preload_content=False,
+            )
+        except urllib3.exceptions.HTTPError as exc:
+            raise _requests_error(exc)(str(exc)) from exc
+        elapsed = time.perf_counter() - started
+        connection = getattr(raw, "connection", None)
+        connect_time = getattr(connection, "connect_time", None)
+        if connect_time is not None:
+            connection.connect_time = None
+        try:
+            content = raw.read() if budget is None else read_body(raw, timeout, budget)
+        except urllib3.exceptions.HTTPError as exc:
+            raise _requests_error(exc)(str(exc)) from exc
+        finally:
+            raw.release_conn()
+        return TransportResponse(
+            raw.status,
+            raw.reason or "",
+            raw.headers,
+            content,
+            timedelta(seconds=elapsed),
+            SentRequest(method, url, body),
+            connect_time,
+        )
+
+    def close(self) -> None:
+        if self._owns_pool_manager and self._pool_manager is not None:
+            self._pool_manager.clear()
+            self._pool_manager = None
@@ -0,0 +1,134 @@
+"""
+HTTP/2 transport backed by ``httpx``.
+
+``HTTP2Transport`` multiplexes concurrent calls as streams over one TLS
+connection per host instead of opening a connection per in-flight request,
+which helps when many threads share one client. A forked child process
+starts with a fresh client unless the client was passed in. It needs the
+optional ``httpx[http2]`` dependency (``pip install nowpayment[http2]``).
+Servers that do not negotiate HTTP/2 are spoken to over HTTP/1.1.
+
+Errors are raised as the matching ``requests`` exceptions, so retries and
+error handling behave the same as with the default transport. Inside a
+``deadline()`` block the wait for a connection is capped at the time left
+and the body is checked against the deadline after every chunk; httpx has no
+total timeout, so one slow read can still overrun by up to the read timeout.
+
+Usage:
+  np = NowPayments("API_KEY", transport=HTTP2Transport())
+"""
+
+import os
+import time
+from datetime import timedelta
+from typing import Any, Optional, Type
+
+import requests
+
+from nowpayment.timeouts import Deadline, current_deadline
+from nowpayment.transports.base import (
+    SentRequest,
+    TimeoutValue,
+    Transport,
+    TransportResponse,
+    query_pairs,
+)
+
+
+def _import_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError as exc:
+        raise ImportError(
+            "HTTP2Transport requires httpx with HTTP/2 support; install it with "
+            "`pip install nowpayment[http2]`"
+        ) from exc
+    return httpx
+
+
+class HTTP2Transport(Transport):
+    """
+    Transport sending requests through an ``httpx.Client`` with HTTP/2 enabled.
+
+    :param client: Client to use; created on first use when omitted.
+    :param max_connections: Upper bound on open connections across hosts.
+    :raises ImportError: If httpx is not installed.
+    """
+
+    def __init__(self, client: Optional[Any] = None, max_connections: int = 10):
+        self._httpx = _import_httpx()
+        self._client = client
+        self._owns_client = client is None
+        self.max_connections = max_connections
+        self._pid = os.getpid()
+
+    @property
+    def client(self) -> Any:
+        if self._pid != os.getpid():
+            # Drop, without closing, the connections inherited from the parent.
+            self._pid = os.getpid()
+            if self._owns_client:
+                self._client = None
+        if self._client is None:
+            limits = self._httpx.Limits(max_connections=self.max_connections)
+            self._client = self._httpx.Client(http2=True, limits=limits)
+        return self._client
+
+    def _timeout(self, timeout: TimeoutValue, budget: Optional[Deadline] = None) -> Any:
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        if budget is None:
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(read, connect=connect, pool=max(budget.remaining(), 0.001))
+
+    def _requests_error(self, exc: Exception) -> Type[requests.RequestException]:
+        httpx = self._httpx
+        if isinstance(exc, httpx.ConnectTimeout):
+            return requests.ConnectTimeout
+        if isinstance(exc, httpx.TimeoutException):
+            return requests.ReadTimeout
+        if isinstance(exc, httpx.InvalidURL):
+            return requests.exceptions.InvalidURL
+        return requests.ConnectionError
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        timeout: TimeoutValue = None,
+        **kwargs: Any,
+    ) -> TransportResponse:
+        budget = current_deadline()
+        started = time.perf_counter()
+        try:
+            with self.client.stream(
+                method,
+                url,
+                params=query_pairs(kwargs.get("params")) or None,
+                json=kwargs.get("json"),
+                content=kwargs.get("data"),
+                headers=headers,
+                timeout=self._timeout(timeout, budget),
+            ) as response:
+                elapsed = time.perf_counter() - started
+                chunks = []
+                for chunk in response.iter_bytes():
+                    chunks.append(chunk)
+                    if budget is not None and budget.expired:
+                        raise requests.ReadTimeout("Deadline passed while reading the response body")
+                content = b"".join(chunks)
+        except (self._httpx.TransportError, self._httpx.InvalidURL) as exc:
+            raise self._requests_error(exc)(str(exc)) from exc
+        return TransportResponse(
+            response.status_code,
+            response.reason_phrase,
+            response.headers,
+            content,
+            timedelta(seconds=elapsed),
+            SentRequest(method, str(response.request.url), response.request.content),
+        )
+
+    def close(self) -> None:
+        if self._owns_client and self._client is not None:
+            self._client.close()
+            self._client = None
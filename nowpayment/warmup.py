@@ -0,0 +1,162 @@
+"""
+Connection pre-warming and keep-alive pings.
+
+``warm_up()`` opens keep-alive connections before the first real call by
+sending ``connections`` concurrent ``status`` requests, so DNS, TCP and TLS
+setup happens at startup instead of on the first checkout. ``KeepAlive``
+repeats the pings from a background thread whenever the client has been idle
+for ``interval`` seconds, so the pooled connections are not closed by the
+server or a load balancer in quiet periods. Pings are sent at bulk priority
+and never raise; failures are logged.
+
+Only as many connections stay pooled as the transport keeps per host
+(``pool_maxsize`` of the session's adapter, ``maxsize`` of
+``Urllib3Transport``). With ``session_scope="thread"`` only the calling
+thread's session is warmed. The background thread does not survive a fork;
+start the keep-alive in each worker process.
+
+Usage:
+  np = NowPayments("API_KEY", warm_connections=4, keepalive_interval=30)
+
+  np.warm_up(connections=4)
+  np.start_keepalive(interval=30)
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+
+import requests
+
+from nowpayment.constants import SESSION_THREAD
+from nowpayment.exceptions import NowPaymentsError
+from nowpayment.ratelimit import PRIORITY_BULK, request_priority
+from nowpayment.timeouts import deadline
+
+if TYPE_CHECKING:
+    from nowpayment.client import NowPayments
+
+logger = logging.getLogger(__name__)
+
+# Default time budget of a warm-up, so an unreachable host cannot stall
+# client construction.
+DEFAULT_WARM_UP_TIMEOUT = 10.0
+# Longest time a ping waits for the others before going ahead alone.
+_BARRIER_TIMEOUT = 5.0
+
+
+def _ping(client: "NowPayments", barrier: Optional[threading.Barrier]) -> bool:
+    if barrier is not None:
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+    try:
+        client.get_api_status()
+    except (NowPaymentsError, requests.RequestException) as exc:
+        logger.debug("Warm-up ping failed: %s", exc)
+        return False
+    return True
+
+
+def warm_up(
+    client: "NowPayments",
+    connections: int = 1,
+    timeout: Optional[float] = DEFAULT_WARM_UP_TIMEOUT,
+) -> int:
+    """
+    Open up to ``connections`` pooled connections with concurrent ``status`` calls.
+
+    The pings are held back until all of them are ready, so each one needs
+    its own connection. They inherit the caller's deadline and priority.
+
+    :param client: Client to warm up.
+    :param connections: Number of concurrent pings.
+    :param timeout: Time budget for all pings in seconds; ``None`` for no limit.
+    :return: Number of pings that succeeded.
+    """
+    if connections < 1:
+        raise ValueError("connections must be at least 1")
+    if client.transport is None and client._requests_transport.scope == SESSION_THREAD:
+        # Sessions of worker threads would be dropped with the threads.
+        connections = 1
+    with deadline(timeout):
+        if connections == 1:
+            return int(_ping(client, None))
+        barrier = threading.Barrier(connections, timeout=min(_BARRIER_TIMEOUT, timeout or _BARRIER_TIMEOUT))
+        with ThreadPoolExecutor(connections, thread_name_prefix="nowpayment-warm-up") as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _ping, client, barrier)
+                for _ in range(connections)
+            ]
+            return sum(future.result() for future in futures)
+
+
+class KeepAlive:
+    """
+    Background thread pinging the API when a client has been idle.
+
+    Activity is read from the ``last_activity`` timestamp of the client's
+    transport, so every client sharing the transport (e.g. all clients of a
+    ``ClientPool``) counts as activity and no hooks are needed.
+
+    :param client: Client to keep warm.
+    :param interval: Idle seconds before a ping is sent.
+    :param connections: Concurrent pings sent each time (see ``warm_up``).
+    """
+
+    def __init__(self, client: "NowPayments", interval: float = 30.0, connections: int = 1):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        self.client = client
+        self.interval = interval
+        self.connections = connections
+        self.pings = 0
+        self._last_ping = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _idle(self) -> float:
+        last = max(self.client._active_transport.last_activity, self._last_ping)
+        return time.monotonic() - last
+
+    def start(self) -> "KeepAlive":
+        if self.running:
+            return self
+        self._stopped.clear()
+        self._last_ping = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="nowpayment-keepalive", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopped.set()
+        thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(max(0.0, self.interval - self._idle())):
+            if self._idle() < self.interval:
+                continue
+            with request_priority(PRIORITY_BULK):
+                warm_up(self.client, self.connections, timeout=self.interval)
+            self.pings += 1
+            # Failed pings leave ``last_activity`` alone; wait a full interval anyway.
+            self._last_ping = time.monotonic()
+
+    def __enter__(self) -> "KeepAlive":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
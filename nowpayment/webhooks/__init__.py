@@ -0,0 +1,78 @@
+"""
+IPN (webhook) verification, receiving, deduplication and dispatch.
+
+Names are resolved lazily so that serverless handlers importing only the
+verification helpers do not load SQLite, threading or model modules.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "DedupStore": "nowpayment.webhooks.dedup",
+    "IPNDeduplicator": "nowpayment.webhooks.dedup",
+    "MemoryDedupStore": "nowpayment.webhooks.dedup",
+    "SQLiteDedupStore": "nowpayment.webhooks.dedup",
+    "ipn_fingerprint": "nowpayment.webhooks.dedup",
+    "IPNDispatcher": "nowpayment.webhooks.dispatcher",
+    "IPNEvent": "nowpayment.webhooks.dispatcher",
+    "IPNReceiver": "nowpayment.webhooks.receiver",
+    "DEFAULT_MAX_IPN_BODY_SIZE": "nowpayment.webhooks.verification",
+    "IPN_SIGNATURE_HEADER": "nowpayment.webhooks.verification",
+    "IPNVerificationError": "nowpayment.webhooks.verification",
+    "IPNVerifier": "nowpayment.webhooks.verification",
+    "extract_ipn_signature": "nowpayment.webhooks.verification",
+    "verify_ipn_body": "nowpayment.webhooks.verification",
+    "verify_ipn_payload": "nowpayment.webhooks.verification",
+}
+
+__all__ = [
+    "DEFAULT_MAX_IPN_BODY_SIZE",
+    "DedupStore",
+    "IPN_SIGNATURE_HEADER",
+    "IPNDeduplicator",
+    "IPNDispatcher",
+    "IPNEvent",
+    "IPNReceiver",
+    "IPNVerificationError",
+    "IPNVerifier",
+    "MemoryDedupStore",
+    "SQLiteDedupStore",
+    "extract_ipn_signature",
+    "ipn_fingerprint",
+    "verify_ipn_body",
+    "verify_ipn_payload",
+]
+
+if TYPE_CHECKING:
+    from nowpayment.webhooks.dedup import (
+        DedupStore,
+        IPNDeduplicator,
+        MemoryDedupStore,
+        SQLiteDedupStore,
+        ipn_fingerprint,
+    )
+    from nowpayment.webhooks.dispatcher import IPNDispatcher, IPNEvent
+    from nowpayment.webhooks.receiver import IPNReceiver
+    from nowpayment.webhooks.verification import (
+        DEFAULT_MAX_IPN_BODY_SIZE,
+        IPN_SIGNATURE_HEADER,
+        IPNVerificationError,
+        IPNVerifier,
+        extract_ipn_signature,
+        verify_ipn_body,
+        verify_ipn_payload,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
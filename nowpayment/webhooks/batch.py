@@ -0,0 +1,227 @@
+"""
+Parallel re-verification of archived IPN logs.
+
+Reads an NDJSON file where each line holds a stored IPN body and its
+signature, spreads canonicalization and HMAC over a process pool in chunks,
+and reports mismatches plus summary statistics.
+
+Usage:
+  export NOWPAYMENTS_IPN_SECRET=your_ipn_secret
+  python -m nowpayment.webhooks.batch ipn-log.ndjson --workers 8 > mismatches.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from nowpayment.webhooks.verification import IPNVerificationError, IPNVerifier
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_ARCHIVED_BODY_SIZE = 1024 * 1024
+
+
+@dataclass
+class IPNMismatch:
+    """A log record that failed verification."""
+
+    line: int
+    reason: str
+    payment_id: Optional[Any] = None
+
+
+@dataclass
+class BatchVerificationReport:
+    """Summary of a batch verification run."""
+
+    total: int = 0
+    valid: int = 0
+    invalid: int = 0
+    malformed: int = 0
+    matches_by_key: Dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["records_per_second"] = round(self.records_per_second, 1)
+        return data
+
+
+_ChunkResult = Tuple[int, int, int, Dict[int, int], List[IPNMismatch]]
+_WORKER_VERIFIERS: Dict[Tuple[Tuple[str, ...], int], IPNVerifier] = {}
+
+
+def _verify_chunk(
+    lines: List[str],
+    first_line: int,
+    secrets: Tuple[str, ...],
+    body_field: str,
+    signature_field: str,
+    max_body_size: int,
+) -> _ChunkResult:
+    cache_key = (secrets, max_body_size)
+    verifier = _WORKER_VERIFIERS.get(cache_key)
+    if verifier is None:
+        verifier = _WORKER_VERIFIERS[cache_key] = IPNVerifier(secrets, max_body_size=max_body_size)
+
+    valid = invalid = malformed = 0
+    matches: Dict[int, int] = {}
+    mismatches: List[IPNMismatch] = []
+    for offset, line in enumerate(lines):
+        line_number = first_line + offset
+        data: Any = None
+        try:
+            record = json.loads(line)
+            body = record[body_field]
+            data = verifier.parse_body(body.encode("utf-8")) if isinstance(body, str) else body
+            if not isinstance(data, dict):
+                raise IPNVerificationError("IPN body must be a JSON object")
+            signature = record.get(signature_field)
+            if signature is not None and not isinstance(signature, str):
+                raise IPNVerificationError("IPN signature must be a string")
+        except (ValueError, KeyError, TypeError, IPNVerificationError) as exc:
+            malformed += 1
+            mismatches.append(IPNMismatch(line_number, f"malformed: {exc}"))
+            continue
+        try:
+            index = verifier.match_key(data, signature)
+        except IPNVerificationError as exc:
+            invalid += 1
+            mismatches.append(IPNMismatch(line_number, str(exc), data.get("payment_id")))
+            continue
+        valid += 1
+        matches[index] = matches.get(index, 0) + 1
+    return valid, invalid, malformed, matches, mismatches
+
+
+def _chunks(path: str, chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    with open(path, "r", encoding="utf-8") as handle:
+        first_line = 1
+        while True:
+            lines = list(islice(handle, chunk_size))
+            if not lines:
+                return
+            yield first_line, lines
+            first_line += len(lines)
+
+
+def verify_ipn_log(
+    path: str,
+    ipn_secret: Union[str, Sequence[str]],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    body_field: str = "body",
+    signature_field: str = "signature",
+    max_body_size: int = DEFAULT_MAX_ARCHIVED_BODY_SIZE,
+    on_mismatch: Optional[Callable[[IPNMismatch], None]] = None,
+) -> BatchVerificationReport:
+    """
+    Re-verify every IPN stored in an NDJSON log.
+
+    Each line is a JSON object whose ``body_field`` holds the raw request body
+    (string) or the decoded payload (object), and whose ``signature_field``
+    holds the ``x-nowpayments-sig`` value.
+
+    :param path: NDJSON file path.
+    :param ipn_secret: IPN secret, or a sequence of secrets valid over the log's period.
+    :param workers: Worker processes; defaults to the CPU count, ``1`` runs in-process.
+    :param chunk_size: Lines sent to a worker at a time.
+    :param body_field: Record field holding the IPN body.
+    :param signature_field: Record field holding the signature.
+    :param max_body_size: Largest accepted body in bytes.
+    :param on_mismatch: Called in line order for every failed record.
+    :return: Summary statistics.
+    """
+    secrets = (ipn_secret,) if isinstance(ipn_secret, str) else tuple(ipn_secret)
+    if not secrets:
+        raise ValueError("At least one IPN secret is required")
+    workers = workers or os.cpu_count() or 1
+    report = BatchVerificationReport()
+    started = time.perf_counter()
+
+    def collect(result: _ChunkResult) -> None:
+        valid, invalid, malformed, matches, mismatches = result
+        report.valid += valid
+        report.invalid += invalid
+        report.malformed += malformed
+        report.total += valid + invalid + malformed
+        for index, count in matches.items():
+            report.matches_by_key[index] = report.matches_by_key.get(index, 0) + count
+        if on_mismatch is not None:
+            for mismatch in mismatches:
+                on_mismatch(mismatch)
+
+    args = (secrets, body_field, signature_field, max_body_size)
+    if workers == 1:
+        for first_line, lines in _chunks(path, chunk_size):
+            collect(_verify_chunk(lines, first_line, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: deque = deque()
+            for first_line, lines in _chunks(path, chunk_size):
+                pending.append(executor.submit(_verify_chunk, lines, first_line, *args))
+                # Bound memory: keep a couple of chunks per worker in flight.
+                if len(pending) >= workers * 2:
+                    collect(pending.popleft().result())
+            while pending:
+                collect(pending.popleft().result())
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="nowpayment-verify-ipn-log",
+        description="Re-verify archived NOWPayments IPN bodies and signatures.",
+    )
+    parser.add_argument("path", help="NDJSON file with one stored IPN per line")
+    parser.add_argument(
+        "--secret-env",
+        action="append",
+        help="Environment variable holding an IPN secret (repeatable; default NOWPAYMENTS_IPN_SECRET)",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--body-field", default="body")
+    parser.add_argument("--signature-field", default="signature")
+    parser.add_argument("--output", help="Write mismatches here instead of stdout")
+    args = parser.parse_args(argv)
+
+    secrets = []
+    for name in args.secret_env or ["NOWPAYMENTS_IPN_SECRET"]:
+        value = os.environ.get(name)
+        if not value:
+            parser.error(f"environment variable {name} is not set")
+        secrets.append(value)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        report = verify_ipn_log(
+            args.path,
+            secrets,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            body_field=args.body_field,
+            signature_field=args.signature_field,
+            on_mismatch=lambda mismatch: output.write(json.dumps(asdict(mismatch)) + "\n"),
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(json.dumps(report.to_dict()), file=sys.stderr)
+    return 1 if report.invalid or report.malformed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
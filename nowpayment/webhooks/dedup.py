@@ -0,0 +1,209 @@
+"""
+Deduplication of repeated IPN callbacks.
+
+NOWPayments re-sends the same IPN several times. ``IPNDeduplicator`` keys each
+payload on a fingerprint of the fields that change between meaningful updates
+and remembers recently seen fingerprints, so repeats can be acknowledged
+without reaching business logic.
+"""
+
+import abc
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Payment IPNs carry ``payment_id``/``payment_status``; payout IPNs carry
+# ``id``/``status``/``batch_withdrawal_id``.
+DEDUP_FIELDS = (
+    "payment_id",
+    "payment_status",
+    "actually_paid",
+    "id",
+    "status",
+    "batch_withdrawal_id",
+    "updated_at",
+)
+_IDENTIFIER_FIELDS = ("payment_id", "id")
+DEFAULT_DEDUP_TTL = 24 * 60 * 60
+
+
+def ipn_fingerprint(payload: Dict[str, Any]) -> str:
+    """
+    Fingerprint an IPN payload on ``DEDUP_FIELDS``.
+
+    :param payload: Parsed IPN payload.
+    :return: Hex-encoded SHA-256 digest.
+    """
+    values = [payload.get(name) for name in DEDUP_FIELDS]
+    encoded = json.dumps(values, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class DedupStore(abc.ABC):
+    """Storage backend interface for seen IPN fingerprints."""
+
+    @abc.abstractmethod
+    def contains(self, key: str) -> bool:
+        """Return ``True`` if ``key`` was added and has not expired."""
+
+    @abc.abstractmethod
+    def add(self, key: str, ttl: float) -> bool:
+        """
+        Remember ``key`` for ``ttl`` seconds.
+
+        :return: ``False`` if the key was already present.
+        """
+
+    @abc.abstractmethod
+    def discard(self, key: str) -> None:
+        """Forget ``key`` if present."""
+
+
+class MemoryDedupStore(DedupStore):
+    """
+    Bounded in-memory store with LRU eviction and per-key TTL.
+
+    :param maxsize: Maximum number of fingerprints kept.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key: str, ttl: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at > now:
+                self._entries.move_to_end(key)
+                return False
+            self._entries[key] = now + ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Persistent store backed by SQLite, shared across restarts and processes.
+
+    :param db_path: SQLite database path.
+    """
+
+    def __init__(self, db_path: str):
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS ipn_dedup ("
+                "fingerprint TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM ipn_dedup WHERE fingerprint = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def add(self, key: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock, self.connection:
+            self.connection.execute(
+                "DELETE FROM ipn_dedup WHERE fingerprint = ? AND expires_at <= ?",
+                (key, now),
+            )
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO ipn_dedup (fingerprint, expires_at) VALUES (?, ?)",
+                (key, now + ttl),
+            )
+        return cursor.rowcount == 1
+
+    def discard(self, key: str) -> None:
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM ipn_dedup WHERE fingerprint = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Delete expired fingerprints and return how many were removed."""
+        with self._lock, self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM ipn_dedup WHERE expires_at <= ?",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+
+def _fingerprint(payload: Dict[str, Any]) -> Optional[str]:
+    # Payloads without a payment or payout ID cannot be told apart safely.
+    if all(payload.get(name) is None for name in _IDENTIFIER_FIELDS):
+        return None
+    return ipn_fingerprint(payload)
+
+
+class IPNDeduplicator:
+    """
+    Track recently processed IPNs by fingerprint.
+
+    Payloads with neither ``payment_id`` nor ``id`` are never treated as duplicates.
+
+    :param store: Backend; defaults to a ``MemoryDedupStore``.
+    :param ttl: Seconds a fingerprint is remembered.
+    :param maxsize: Size of the default in-memory store.
+    """
+
+    def __init__(
+        self,
+        store: Optional[DedupStore] = None,
+        ttl: float = DEFAULT_DEDUP_TTL,
+        maxsize: int = 100_000,
+    ):
+        self.store = store if store is not None else MemoryDedupStore(maxsize=maxsize)
+        self.ttl = ttl
+
+    def is_duplicate(self, payload: Dict[str, Any]) -> bool:
+        """Return ``True`` if an identical IPN was recorded recently."""
+        key = _fingerprint(payload)
+        return key is not None and self.store.contains(key)
+
+    def mark(self, payload: Dict[str, Any]) -> bool:
+        """
+        Record a payload as processed.
+
+        :return: ``False`` if it had already been recorded.
+        """
+        key = _fingerprint(payload)
+        return key is None or self.store.add(key, self.ttl)
+
+    def forget(self, payload: Dict[str, Any]) -> None:
+        """Remove a payload so its next delivery is processed again."""
+        key = _fingerprint(payload)
+        if key is not None:
+            self.store.discard(key)
@@ -0,0 +1,192 @@
+"""
+Typed IPN dispatch with per-payment ordering.
+
+``IPNDispatcher`` parses verified IPNs into models and routes them to handlers
+registered by status. Events are spread over shard queues keyed by payment or
+withdrawal ID: each shard is drained by one thread, so events for the same ID
+run strictly in arrival order while different IDs run in parallel.
+"""
+
+import logging
+import queue
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from nowpayment.constants import RAW_KEEP
+from nowpayment.models import Payment, PayoutWithdrawal
+
+logger = logging.getLogger(__name__)
+
+IPN_KIND_PAYMENT = "payment"
+IPN_KIND_PAYOUT = "payout"
+
+
+@dataclass
+class IPNEvent:
+    """A verified IPN parsed into its model."""
+
+    kind: str
+    key: str
+    status: Optional[str]
+    model: Union[Payment, PayoutWithdrawal]
+    payload: Dict[str, Any]
+
+
+IPNEventHandler = Callable[[IPNEvent], None]
+
+
+class IPNDispatcher:
+    """
+    Route verified IPNs to handlers registered per status.
+
+    Payment IPNs (with ``payment_id``) become ``Payment`` models; payout IPNs
+    (one per withdrawal) become ``PayoutWithdrawal`` models.
+
+    :param shards: Number of shard queues and worker threads.
+    :param queue_size: Maximum pending events per shard.
+    :param raw_mode: ``raw_mode`` used when parsing models.
+    """
+
+    def __init__(self, shards: int = 4, queue_size: int = 1000, raw_mode: str = RAW_KEEP):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.raw_mode = raw_mode
+        self._handlers: Dict[str, List[Tuple[Optional[frozenset], IPNEventHandler]]] = {
+            IPN_KIND_PAYMENT: [],
+            IPN_KIND_PAYOUT: [],
+        }
+        self._queues: List["queue.Queue[Optional[IPNEvent]]"] = [
+            queue.Queue(maxsize=queue_size) for _ in range(shards)
+        ]
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def add_handler(
+        self,
+        kind: str,
+        handler: IPNEventHandler,
+        statuses: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        """
+        Register a handler.
+
+        :param kind: ``"payment"`` or ``"payout"``.
+        :param handler: Called with each matching ``IPNEvent``.
+        :param statuses: Statuses to match (case-insensitive); all when empty.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"kind must be {IPN_KIND_PAYMENT!r} or {IPN_KIND_PAYOUT!r}")
+        wanted = frozenset(status.lower() for status in statuses) if statuses else None
+        self._handlers[kind].append((wanted, handler))
+
+    def on_payment(self, *statuses: str) -> Callable[[IPNEventHandler], IPNEventHandler]:
+        """Decorator registering a payment handler, e.g. ``@dispatcher.on_payment("finished")``."""
+        def decorator(handler: IPNEventHandler) -> IPNEventHandler:
+            self.add_handler(IPN_KIND_PAYMENT, handler, statuses)
+            return handler
+        return decorator
+
+    def on_payout(self, *statuses: str) -> Callable[[IPNEventHandler], IPNEventHandler]:
+        """Decorator registering a payout handler, e.g. ``@dispatcher.on_payout("FINISHED")``."""
+        def decorator(handler: IPNEventHandler) -> IPNEventHandler:
+            self.add_handler(IPN_KIND_PAYOUT, handler, statuses)
+            return handler
+        return decorator
+
+    def parse(self, payload: Dict[str, Any]) -> IPNEvent:
+        """
+        Parse a verified IPN payload into an ``IPNEvent``.
+
+        :raises ValueError: If the payload is neither a payment nor a payout IPN.
+        """
+        if payload.get("payment_id") is not None:
+            model = Payment.from_dict(payload, raw_mode=self.raw_mode)
+            return IPNEvent(IPN_KIND_PAYMENT, str(model.payment_id), model.payment_status, model, payload)
+        if payload.get("id") is not None:
+            model = PayoutWithdrawal.from_dict(payload, raw_mode=self.raw_mode)
+            return IPNEvent(IPN_KIND_PAYOUT, str(model.id), model.status, model, payload)
+        raise ValueError("IPN payload has neither payment_id nor id")
+
+    def dispatch(self, event: Union[IPNEvent, Dict[str, Any]]) -> None:
+        """Run the matching handlers for one event on the calling thread."""
+        if not isinstance(event, IPNEvent):
+            event = self.parse(event)
+        status = (event.status or "").lower()
+        for statuses, handler in self._handlers[event.kind]:
+            if statuses is None or status in statuses:
+                handler(event)
+
+    def shard_for(self, key: str) -> int:
+        """Return the shard index that owns ``key``."""
+        return zlib.crc32(key.encode("utf-8")) % len(self._queues)
+
+    def submit(self, payload: Dict[str, Any]) -> bool:
+        """
+        Queue a verified payload on the shard owning its payment or withdrawal ID.
+
+        :return: ``False`` when that shard's queue is full.
+        """
+        event = self.parse(payload)
+        if not self._threads:
+            self.start()
+        try:
+            self._queues[self.shard_for(event.key)].put_nowait(event)
+        except queue.Full:
+            return False
+        return True
+
+    def start(self) -> None:
+        """Start one worker thread per shard; called automatically on first submit."""
+        with self._lock:
+            if self._threads:
+                return
+            for index, shard in enumerate(self._queues):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(shard,),
+                    name=f"nowpayment-ipn-shard-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def join(self) -> None:
+        """Block until every queued event has been handled."""
+        for shard in self._queues:
+            shard.join()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the shard workers after queued events have been handled.
+
+        :param timeout: Seconds to wait for each worker to finish.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        for shard in self._queues:
+            shard.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def __enter__(self) -> "IPNDispatcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _work(self, shard: "queue.Queue[Optional[IPNEvent]]") -> None:
+        while True:
+            event = shard.get()
+            try:
+                if event is None:
+                    return
+                self.dispatch(event)
+            except Exception:
+                logger.exception("IPN handler failed for %s %s", event.kind, event.key)
+            finally:
+                shard.task_done()
@@ -0,0 +1,299 @@
+"""
+IPN receiver mountable as a WSGI or ASGI application.
+
+Callbacks are verified and acknowledged immediately; verified payloads are put
+on a bounded queue drained by a pool of worker threads. When the queue is full
+the receiver answers ``503`` with ``Retry-After`` so NOWPayments retries later
+instead of the process falling over.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from nowpayment.webhooks.verification import (
+    DEFAULT_MAX_IPN_BODY_SIZE,
+    IPNVerificationError,
+    IPNVerifier,
+    extract_ipn_signature,
+)
+
+if TYPE_CHECKING:
+    from nowpayment.webhooks.dedup import IPNDeduplicator
+    from nowpayment.webhooks.dispatcher import IPNDispatcher
+
+logger = logging.getLogger(__name__)
+
+_STATUS_TEXT = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    405: "405 Method Not Allowed",
+    413: "413 Payload Too Large",
+    503: "503 Service Unavailable",
+}
+
+IPNHandler = Callable[[Dict[str, Any]], None]
+
+# Seconds the ASGI lifespan shutdown waits for each worker to drain the queue.
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+
+
+class IPNReceiver:
+    """
+    Verify IPN callbacks and process them on a bounded worker pool.
+
+    Use ``wsgi_app`` with WSGI servers (gunicorn, uWSGI, Flask/Django mounts)
+    and ``asgi_app`` with ASGI servers (uvicorn, hypercorn, Starlette mounts).
+
+    Pass either ``handler`` (run on the receiver's worker pool) or
+    ``dispatcher`` (an ``IPNDispatcher`` whose shard queues replace the pool
+    and keep events for the same payment in order).
+
+    :param ipn_secret: IPN secret, or a sequence of active secrets.
+    :param handler: Called with each verified payload on a worker thread.
+    :param workers: Number of worker threads draining the queue.
+    :param queue_size: Maximum number of verified events waiting for a worker.
+    :param max_body_size: Largest accepted body in bytes.
+    :param retry_after: Seconds sent in ``Retry-After`` when the queue is full.
+    :param dedup: Optional ``IPNDeduplicator``; repeated deliveries of an
+        already queued IPN are acknowledged without verification or processing.
+    :param dispatcher: Optional ``IPNDispatcher`` receiving verified payloads.
+    :param shutdown_timeout: Seconds the ASGI lifespan shutdown waits for each
+        worker to finish; ``None`` waits until the queue is drained.
+    """
+
+    def __init__(
+        self,
+        ipn_secret: Union[str, Sequence[str]],
+        handler: Optional[IPNHandler] = None,
+        workers: int = 4,
+        queue_size: int = 1000,
+        max_body_size: int = DEFAULT_MAX_IPN_BODY_SIZE,
+        retry_after: int = 5,
+        dedup: Optional["IPNDeduplicator"] = None,
+        dispatcher: Optional["IPNDispatcher"] = None,
+        shutdown_timeout: Optional[float] = DEFAULT_SHUTDOWN_TIMEOUT,
+    ):
+        if (handler is None) == (dispatcher is None):
+            raise ValueError("Pass exactly one of handler or dispatcher")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.verifier = IPNVerifier(ipn_secret, max_body_size=max_body_size)
+        self.handler = handler
+        self.workers = workers
+        self.retry_after = retry_after
+        self.dedup = dedup
+        self.dispatcher = dispatcher
+        self.shutdown_timeout = shutdown_timeout
+        self.queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_body_size(self) -> int:
+        return self.verifier.max_body_size
+
+    def start(self) -> None:
+        """Start the worker threads; called automatically on the first callback."""
+        if self.dispatcher is not None:
+            self.dispatcher.start()
+            return
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"nowpayment-ipn-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the workers after the queued events have been processed.
+
+        :param timeout: Seconds to wait for each worker to finish.
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.stop(timeout)
+            return
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self.queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def __enter__(self) -> "IPNReceiver":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _work(self) -> None:
+        while True:
+            payload = self.queue.get()
+            try:
+                if payload is None:
+                    return
+                self.handler(payload)
+            except Exception:
+                logger.exception("IPN handler failed for payment %s", payload.get("payment_id"))
+            finally:
+                self.queue.task_done()
+
+    def submit(self, payload: Dict[str, Any]) -> bool:
+        """
+        Queue a verified payload for the workers.
+
+        :param payload: Verified IPN payload.
+        :return: ``False`` when the queue is full.
+        """
+        if self.dispatcher is not None:
+            return self.dispatcher.submit(payload)
+        if not self._threads:
+            self.start()
+        try:
+            self.queue.put_nowait(payload)
+        except queue.Full:
+            return False
+        return True
+
+    def handle(
+        self,
+        method: str,
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """
+        Process one IPN request independently of the server interface.
+
+        :param method: HTTP method.
+        :param body: Raw request body.
+        :param headers: Request headers.
+        :return: Status code, response headers and response body.
+        """
+        if method != "POST":
+            return 405, [("Allow", "POST")], b"Method Not Allowed"
+        signature = extract_ipn_signature(headers)
+        try:
+            data = self.verifier.parse_body(body)
+        except IPNVerificationError as exc:
+            status = 413 if len(body) > self.max_body_size else 400
+            return status, [], str(exc).encode("utf-8")
+        # A fingerprint is only recorded after a verified delivery, so an
+        # unsigned copy can at most be acknowledged and dropped here.
+        if self.dedup is not None and self.dedup.is_duplicate(data):
+            return 200, [], b"OK"
+        try:
+            self.verifier.match_key(data, signature)
+        except IPNVerificationError as exc:
+            return 401, [], str(exc).encode("utf-8")
+        if self.dedup is not None and not self.dedup.mark(data):
+            return 200, [], b"OK"
+        try:
+            accepted = self.submit(data)
+        except ValueError:
+            # Verified but not a payment or payout IPN; acknowledge so it is not retried.
+            logger.warning("Ignoring unsupported IPN payload with keys %s", sorted(data))
+            return 200, [], b"OK"
+        if not accepted:
+            if self.dedup is not None:
+                self.dedup.forget(data)
+            return 503, [("Retry-After", str(self.retry_after))], b"Busy"
+        return 200, [], b"OK"
+
+    def wsgi_app(
+        self,
+        environ: Dict[str, Any],
+        start_response: Callable[..., Any],
+    ) -> Iterable[bytes]:
+        """WSGI entry point."""
+        try:
+            length = int(environ.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            length = 0
+        if length > self.max_body_size:
+            status, headers, body = 413, [], b"Payload Too Large"
+        else:
+            body = environ["wsgi.input"].read(length) if length else b""
+            request_headers = {
+                key[5:].replace("_", "-").lower(): value
+                for key, value in environ.items()
+                if key.startswith("HTTP_")
+            }
+            status, headers, body = self.handle(environ.get("REQUEST_METHOD", "GET"), body, request_headers)
+        start_response(
+            _STATUS_TEXT[status],
+            [("Content-Type", "text/plain"), ("Content-Length", str(len(body))), *headers],
+        )
+        return [body]
+
+    async def asgi_app(
+        self,
+        scope: Dict[str, Any],
+        receive: Callable[[], Any],
+        send: Callable[[Dict[str, Any]], Any],
+    ) -> None:
+        """ASGI entry point (HTTP and lifespan scopes)."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    self.start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    # Joining the workers blocks; keep the event loop serving meanwhile.
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, self.stop, self.shutdown_timeout)
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        chunks: List[bytes] = []
+        size = 0
+        too_large = False
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                too_large = True
+            elif chunk:
+                chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+
+        if too_large:
+            status, headers, body = 413, [], b"Payload Too Large"
+        else:
+            request_headers = {
+                key.decode("latin-1").lower(): value.decode("latin-1")
+                for key, value in scope.get("headers", [])
+            }
+            status, headers, body = self.handle(scope.get("method", "GET"), b"".join(chunks), request_headers)
+        response_headers = [(b"content-type", b"text/plain"), (b"content-length", str(len(body)).encode())]
+        response_headers.extend((key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers)
+        await send({"type": "http.response.start", "status": status, "headers": response_headers})
+        await send({"type": "http.response.body", "body": body})
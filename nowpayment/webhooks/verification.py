@@ -0,0 +1,176 @@
+import hmac
+import json
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+from nowpayment.exceptions import NowPaymentsError
+from nowpayment.signatures import (
+    PaymentSignatureVerifier,
+    canonicalize_payload,
+    verify_payment_signature,
+)
+
+IPN_SIGNATURE_HEADER = "x-nowpayments-sig"
+DEFAULT_MAX_IPN_BODY_SIZE = 64 * 1024
+
+
+class IPNVerificationError(NowPaymentsError):
+    """Raised when an IPN callback signature does not match."""
+
+
+def extract_ipn_signature(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Read the NOWPayments IPN signature header from request headers.
+
+    Header name is matched case-insensitively.
+
+    :param headers: Request headers mapping.
+    :return: Signature value or ``None`` if missing.
+    """
+    for key, value in headers.items():
+        if key.lower() == IPN_SIGNATURE_HEADER:
+            return value
+    return None
+
+
+def verify_ipn_payload(
+    data: Dict[str, Any],
+    ipn_secret: str,
+    signature: str,
+) -> Dict[str, Any]:
+    """
+    Verify an IPN callback payload and return it when valid.
+
+    :param data: Parsed JSON body from the IPN request.
+    :param ipn_secret: IPN secret from the NOWPayments dashboard.
+    :param signature: Value of the ``x-nowpayments-sig`` header.
+    :return: The verified payload.
+    :raises IPNVerificationError: If the signature is invalid.
+    :raises ValueError: If inputs are invalid.
+    """
+    if not signature:
+        raise IPNVerificationError("Missing IPN signature header")
+    is_valid = verify_payment_signature(data, ipn_secret, signature)
+    if not is_valid:
+        raise IPNVerificationError("Invalid IPN signature")
+    return data
+
+
+class IPNVerifier:
+    """
+    Reusable IPN verifier that works on raw request bodies.
+
+    The body is parsed once and canonicalized once; oversized bodies are
+    rejected before parsing. Pass several secrets during IPN secret rotation:
+    the single canonical encoding is checked against each precomputed key.
+
+    :param ipn_secret: IPN secret, or a sequence of active secrets.
+    :param max_body_size: Largest accepted body in bytes.
+    """
+
+    def __init__(
+        self,
+        ipn_secret: Union[str, Sequence[str]],
+        max_body_size: int = DEFAULT_MAX_IPN_BODY_SIZE,
+    ):
+        secrets = [ipn_secret] if isinstance(ipn_secret, str) else list(ipn_secret)
+        if not secrets:
+            raise ValueError("At least one IPN secret is required")
+        self._signers = [PaymentSignatureVerifier(secret) for secret in secrets]
+        self.max_body_size = max_body_size
+
+    def parse_body(self, body: bytes) -> Dict[str, Any]:
+        """
+        Decode a raw IPN body after checking its size.
+
+        :param body: Raw request body.
+        :return: Decoded JSON object.
+        :raises IPNVerificationError: If the body is too large or not a JSON object.
+        """
+        if len(body) > self.max_body_size:
+            raise IPNVerificationError(f"IPN body exceeds {self.max_body_size} bytes")
+        try:
+            data = json.loads(body)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise IPNVerificationError("IPN body is not valid JSON") from exc
+        if not isinstance(data, dict):
+            raise IPNVerificationError("IPN body must be a JSON object")
+        return data
+
+    def match_key(self, data: Dict[str, Any], signature: Optional[str]) -> int:
+        """
+        Return the index of the secret that signed a parsed IPN payload.
+
+        :param data: Parsed JSON body from the IPN request.
+        :param signature: Value of the ``x-nowpayments-sig`` header.
+        :return: Position of the matching secret in ``ipn_secret``.
+        :raises IPNVerificationError: If the signature is missing or matches no secret.
+        """
+        if not signature:
+            raise IPNVerificationError("Missing IPN signature header")
+        canonical = canonicalize_payload(data)
+        expected = signature.encode("utf-8")
+        for index, signer in enumerate(self._signers):
+            if hmac.compare_digest(signer.compute_canonical(canonical).encode("ascii"), expected):
+                return index
+        raise IPNVerificationError("Invalid IPN signature")
+
+    def verify(self, data: Dict[str, Any], signature: Optional[str]) -> Dict[str, Any]:
+        """
+        Verify a parsed IPN payload and return it when valid.
+
+        :param data: Parsed JSON body from the IPN request.
+        :param signature: Value of the ``x-nowpayments-sig`` header.
+        :return: The verified payload.
+        :raises IPNVerificationError: If the signature is missing or invalid.
+        """
+        self.match_key(data, signature)
+        return data
+
+    def verify_body_with_key(
+        self,
+        body: bytes,
+        headers: Mapping[str, str],
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Verify a raw IPN request and report which secret matched.
+
+        :param body: Raw request body.
+        :param headers: Request headers containing ``x-nowpayments-sig``.
+        :return: The verified payload and the index of the matching secret.
+        :raises IPNVerificationError: If the body or signature is invalid.
+        """
+        signature = extract_ipn_signature(headers)
+        if not signature:
+            raise IPNVerificationError("Missing IPN signature header")
+        data = self.parse_body(body)
+        return data, self.match_key(data, signature)
+
+    def verify_body(self, body: bytes, headers: Mapping[str, str]) -> Dict[str, Any]:
+        """
+        Verify a raw IPN request and return the decoded payload.
+
+        :param body: Raw request body.
+        :param headers: Request headers containing ``x-nowpayments-sig``.
+        :return: The verified payload.
+        :raises IPNVerificationError: If the body or signature is invalid.
+        """
+        return self.verify_body_with_key(body, headers)[0]
+
+
+def verify_ipn_body(
+    body: bytes,
+    headers: Mapping[str, str],
+    ipn_secret: Union[str, Sequence[str]],
+    max_body_size: int = DEFAULT_MAX_IPN_BODY_SIZE,
+) -> Dict[str, Any]:
+    """
+    Verify a raw IPN request body and return the decoded payload.
+
+    :param body: Raw request body bytes.
+    :param headers: Request headers containing ``x-nowpayments-sig``.
+    :param ipn_secret: IPN secret, or a sequence of active secrets.
+    :param max_body_size: Largest accepted body in bytes.
+    :return: The verified payload.
+    :raises IPNVerificationError: If the body or signature is invalid.
+    """
+    return IPNVerifier(ipn_secret, max_body_size=max_body_size).verify_body(body, headers)
@@ -3,6 +3,8 @@ from unittest.mock import MagicMock
 import pytest
 import requests
 
+from nowpayment.testing import MockNowPaymentsServer
+
 
 @pytest.fixture
 def mock_response():
@@ -21,3 +23,21 @@ def mock_response():
         return response
 
     return _factory
+
+
+@pytest.fixture
+def server(request):
+    """
+    Running ``MockNowPaymentsServer``.
+
+    Constructor arguments come from indirect parametrization
+    (``@pytest.mark.parametrize("server", [{"payments": 5}], indirect=True)``)
+    or from the closest ``mock_server`` marker
+    (``pytestmark = pytest.mark.mock_server(payments=5)``).
+    """
+    kwargs = getattr(request, "param", None)
+    if kwargs is None:
+        marker = request.node.get_closest_marker("mock_server")
+        kwargs = marker.kwargs if marker is not None else {}
+    with MockNowPaymentsServer(**kwargs) as running:
+        yield running
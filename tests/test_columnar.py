@@ -0,0 +1,63 @@
+import math
+
+import pytest
+
+from nowpayment.columnar import MISSING_TIMESTAMP, PaymentColumns
+from nowpayment.models import PaymentList
+
+PAGE = {
+    "data": [
+        {
+            "payment_id": 1,
+            "payment_status": "finished",
+            "price_amount": 10,
+            "price_currency": "usd",
+            "pay_amount": "0.00025",
+            "pay_currency": "btc",
+            "actually_paid": 0.00025,
+            "created_at": "2024-01-01T00:00:00.000Z",
+            "updated_at": "2024-01-01T00:00:01.500Z",
+        },
+        {
+            "payment_id": 2,
+            "payment_status": "waiting",
+            "price_amount": "5.5",
+            "price_currency": "usd",
+            "pay_currency": "trx",
+            "created_at": None,
+        },
+    ],
+    "pagesCount": 1,
+}
+
+
+def test_float_columns_are_typed():
+    columns = PaymentColumns.from_pages([PAGE]).columns()
+
+    assert list(columns["price_amount"]) == [10.0, 5.5]
+    assert columns["pay_amount"][0] == 0.00025
+    assert math.isnan(columns["actually_paid"][1])
+    assert columns["price_currency"].categories == ["usd"]
+    assert columns["pay_currency"].decode() == ["btc", "trx"]
+    assert list(columns["outcome_currency"].codes) == [-1, -1]
+    assert columns["created_at"][0] == 1704067200000
+    assert columns["updated_at"][0] == 1704067201500
+    assert columns["created_at"][1] == MISSING_TIMESTAMP
+
+
+def test_decimal_amounts_and_model_pages():
+    columns = PaymentColumns.from_pages([PaymentList.from_dict(PAGE)], amounts="decimal")
+
+    assert columns.columns()["pay_amount"] == ["0.00025", None]
+    assert len(columns) == 2
+
+
+def test_to_numpy_supports_vectorized_aggregation():
+    numpy = pytest.importorskip("numpy")
+    arrays = PaymentColumns.from_pages([PAGE]).to_numpy()
+
+    assert arrays["price_amount"].dtype == numpy.float64
+    assert numpy.nansum(arrays["price_amount"]) == 15.5
+    codes, categories = arrays["payment_status"]
+    assert list(categories[codes]) == ["finished", "waiting"]
+    assert numpy.isnat(arrays["created_at"][1])
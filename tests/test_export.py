@@ -0,0 +1,119 @@
+import csv
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from nowpayment.export import ExportCheckpoint, PaymentExporter
+
+
+def _payment_api(total=5, limit=2, fail_on_page=None):
+    pages_count = (total + limit - 1) // limit
+
+    def get_payment_list(limit, page, **kwargs):
+        if page == fail_on_page:
+            raise ConnectionError("network down")
+        start = page * limit
+        items = [
+            {"payment_id": i, "payment_status": "finished", "created_at": f"2024-01-0{i + 1}"}
+            for i in range(start, min(start + limit, total))
+        ]
+        return {"data": items, "page": page, "pagesCount": pages_count}
+
+    api = MagicMock()
+    api.get_payment_list.side_effect = get_payment_list
+    return api
+
+
+def _read_ids(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line)["payment_id"] for line in handle]
+
+
+def test_export_streams_ndjson_and_marks_checkpoint_done(tmp_path):
+    path = str(tmp_path / "payments.ndjson")
+    checkpoint = PaymentExporter(_payment_api(), path, limit=2, date_to="2024-02-01").run()
+
+    assert _read_ids(path) == [0, 1, 2, 3, 4]
+    assert checkpoint.done is True
+    assert checkpoint.rows == 5
+    assert checkpoint.last_created_at == "2024-01-05"
+    assert ExportCheckpoint.load(f"{path}.checkpoint").next_page == 3
+
+
+def test_export_resumes_after_failure_without_duplicates(tmp_path):
+    path = str(tmp_path / "payments.ndjson")
+    with pytest.raises(ConnectionError):
+        PaymentExporter(_payment_api(fail_on_page=2), path, limit=2).run()
+    assert _read_ids(path) == [0, 1, 2, 3]
+
+    # Simulate a partially written page left behind by the crash.
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write('{"payment_id": 4')
+
+    api = _payment_api()
+    PaymentExporter(api, path, limit=2).run()
+
+    assert _read_ids(path) == [0, 1, 2, 3, 4]
+    assert [call.kwargs["page"] for call in api.get_payment_list.call_args_list] == [2]
+
+
+@pytest.mark.parametrize("damage", ["delete", "truncate"])
+def test_export_starts_over_when_output_is_missing_or_short(tmp_path, damage):
+    path = str(tmp_path / "payments.ndjson")
+    with pytest.raises(ConnectionError):
+        PaymentExporter(_payment_api(fail_on_page=2), path, limit=2).run()
+    if damage == "delete":
+        (tmp_path / "payments.ndjson").unlink()
+    else:
+        with open(path, "r+b") as handle:
+            handle.truncate(5)
+
+    api = _payment_api()
+    checkpoint = PaymentExporter(api, path, limit=2).run()
+
+    assert _read_ids(path) == [0, 1, 2, 3, 4]
+    assert checkpoint.rows == 5
+    assert [call.kwargs["page"] for call in api.get_payment_list.call_args_list] == [0, 1, 2]
+
+
+def test_concurrent_export_preserves_page_order(tmp_path):
+    path = str(tmp_path / "payments.csv")
+    PaymentExporter(_payment_api(total=9), path, format="csv", limit=2, concurrency=3).run()
+
+    with open(path, encoding="utf-8", newline="") as handle:
+        rows = list(csv.DictReader(handle))
+
+    assert [row["payment_id"] for row in rows] == [str(i) for i in range(9)]
+    assert rows[0]["payment_status"] == "finished"
+
+
+def test_finished_export_is_not_repeated_unless_a_new_window_is_requested(tmp_path, caplog):
+    path = str(tmp_path / "payments.ndjson")
+    PaymentExporter(_payment_api(total=3), path, limit=2, date_to="2024-02-01").run()
+
+    api = _payment_api(total=3)
+    checkpoint = PaymentExporter(api, path, limit=2, date_to="2024-03-01").run()
+    assert checkpoint.date_to == "2024-02-01"
+    assert not api.get_payment_list.called
+    assert "already complete" in caplog.text
+
+    checkpoint = PaymentExporter(api, path, limit=2, date_to="2024-03-01").run(new_window=True)
+    assert checkpoint.done is True
+    assert (checkpoint.date_from, checkpoint.date_to) == ("2024-02-01", "2024-03-01")
+    assert api.get_payment_list.call_args_list[0].kwargs["date_from"] == "2024-02-01"
+    assert _read_ids(path) == [0, 1, 2]
+
+
+def test_csv_writes_nested_fields_as_json(tmp_path):
+    api = MagicMock()
+    api.get_payment_list.return_value = {
+        "data": [{"payment_id": 1, "order_description": {"sku": "A1", "qty": 2}}],
+        "pagesCount": 1,
+    }
+    path = str(tmp_path / "payments.csv")
+    PaymentExporter(api, path, format="csv").run()
+
+    with open(path, encoding="utf-8", newline="") as handle:
+        row = next(csv.DictReader(handle))
+    assert json.loads(row["order_description"]) == {"sku": "A1", "qty": 2}
@@ -0,0 +1,85 @@
+import os
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from nowpayment import NowPayments
+from nowpayment.transports import RequestsTransport, Urllib3Transport
+
+
+def _pool_managers(session):
+    return [adapter.poolmanager for adapter in session.adapters.values()]
+
+
+def test_pid_change_gives_fresh_pools_and_keeps_session_settings():
+    session = requests.Session()
+    session.headers["X-Tenant"] = "a"
+    transport = RequestsTransport(session)
+    inherited = _pool_managers(session)
+
+    with patch("nowpayment.transports.base.os.getpid", return_value=os.getpid() + 1):
+        assert transport.session is session
+    assert session.headers["X-Tenant"] == "a"
+    assert all(new is not old for new, old in zip(_pool_managers(session), inherited))
+
+
+def test_urllib3_transport_rebuilds_owned_pool_manager_after_fork():
+    transport = Urllib3Transport()
+    inherited = transport.pool_manager
+    assert transport.pool_manager is inherited
+    with patch("nowpayment.transports.direct.os.getpid", return_value=os.getpid() + 1):
+        assert transport.pool_manager is not inherited
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_client_created_before_fork_works_in_child(server):
+    np = NowPayments("key", base_url=server.base_url)
+    assert np.get_api_status() == {"message": "OK"}
+    parent_pools = _pool_managers(np.session)
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        try:
+            ok = np.get_api_status() == {"message": "OK"}
+            fresh = all(new is not old for new, old in zip(_pool_managers(np.session), parent_pools))
+            os.write(write_end, b"1" if ok and fresh else b"0")
+        finally:
+            os._exit(0)
+    os.close(write_end)
+    _, status = os.waitpid(pid, 0)
+    assert os.read(read_end, 1) == b"1"
+    os.close(read_end)
+    assert status == 0
+    assert np.get_api_status() == {"message": "OK"}
+    assert _pool_managers(np.session) == parent_pools
+
+
+def test_thread_scope_gives_each_thread_its_own_session(server):
+    np = NowPayments("key", base_url=server.base_url, session_scope="thread")
+    sessions = []
+
+    def call():
+        np.get_api_status()
+        sessions.append(np.session)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(session) for session in sessions}) == 4
+    assert np.session is np.session
+
+    with patch("requests.Session.close") as mock_close:
+        np.close()
+    assert mock_close.call_count == 5
+
+
+def test_session_scope_validation():
+    with pytest.raises(ValueError):
+        NowPayments("key", session_scope="request")
+    with pytest.raises(ValueError):
+        NowPayments("key", session=requests.Session(), session_scope="thread")
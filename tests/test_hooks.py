@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from nowpayment import NowPayments, NowPaymentsAPIError, RequestHooks
+from nowpayment.hooks import AFTER_PARSE, AFTER_RESPONSE, BEFORE_REQUEST, ON_ERROR, ON_RETRY
+from nowpayment.models import Payment, PaymentList
+
+pytestmark = pytest.mark.mock_server(payments=5)
+
+
+def _recorder(hooks, log):
+    for name in (BEFORE_REQUEST, AFTER_RESPONSE, ON_RETRY, ON_ERROR, AFTER_PARSE):
+        hooks.add(name, lambda event, name=name: log.append((name, event.endpoint, event.attempt, event.status_code)))
+
+
+def test_hooks_follow_call_lifecycle(server):
+    hooks = RequestHooks()
+    log, events = [], []
+    _recorder(hooks, log)
+    hooks.add(AFTER_PARSE, events.append)
+
+    np = NowPayments("key", base_url=server.base_url, hooks=hooks)
+    created = np.payment.create_payment(10, "usd", "trx", "https://example.com/ipn", "o-1")
+    payment = np.payment.get_payment_status(created["payment_id"], as_model=True)
+
+    assert isinstance(payment, Payment)
+    assert log == [
+        (BEFORE_REQUEST, "payment", 1, None),
+        (AFTER_RESPONSE, "payment", 1, 200),
+        (AFTER_PARSE, "payment", 1, 200),
+        (BEFORE_REQUEST, "payment/{id}", 1, None),
+        (AFTER_RESPONSE, "payment/{id}", 1, 200),
+        (AFTER_PARSE, "payment/{id}", 1, 200),
+    ]
+    first, second = events
+    assert first.model_type is dict
+    assert first.json["order_id"] == "o-1"
+    assert second.model_type is Payment
+    assert set(second.timings) == {"request", "decode", "total", "parse"}
+
+
+def test_untyped_calls_do_not_keep_their_event(server):
+    hooks = RequestHooks()
+    events = []
+    hooks.add(AFTER_PARSE, events.append)
+
+    np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, hooks=hooks)
+    np.currency.get_api_status()
+    np.billing.get_users()
+    assert hooks.pop_bound() is None
+
+    np.get_api_status(as_model=True)
+    assert [event.endpoint for event in events] == ["status"]
+    assert hooks.pop_bound() is None
+
+
+def test_iter_payment_pages_parses_each_page_once(server):
+    hooks = RequestHooks()
+    events = []
+    hooks.add(AFTER_PARSE, events.append)
+
+    np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, hooks=hooks)
+    pages = list(np.payment.iter_payment_pages(limit=2, as_model=True))
+
+    assert len(pages) == 3
+    assert [event.model_type for event in events] == [PaymentList] * 3
+
+
+def test_on_retry_and_on_error(server):
+    hooks = RequestHooks()
+    log = []
+    _recorder(hooks, log)
+    np = NowPayments("key", base_url=server.base_url, hooks=hooks, max_retries=2, retry_backoff=0)
+
+    server.fail_next(429)
+    assert np.get_api_status() == {"message": "OK"}
+    assert [entry[0] for entry in log] == [BEFORE_REQUEST, ON_RETRY, BEFORE_REQUEST, AFTER_RESPONSE, AFTER_PARSE]
+    assert log[1][3] == 429
+
+    log.clear()
+    server.fail_next(500, times=3)
+    with pytest.raises(NowPaymentsAPIError):
+        np.get_api_status()
+    assert [entry[0] for entry in log] == [
+        BEFORE_REQUEST, ON_RETRY, BEFORE_REQUEST, ON_RETRY, BEFORE_REQUEST, ON_ERROR,
+    ]
+    assert log[-1][2:] == (3, 500)
+
+
+def test_post_is_not_retried_on_server_error(server):
+    np = NowPayments("key", base_url=server.base_url, max_retries=3, retry_backoff=0)
+    server.fail_next(500)
+    with pytest.raises(NowPaymentsAPIError):
+        np.payment.create_invoice(10, "usd")
+    assert server.request_count == 1
+
+
+@patch("requests.Session.request", side_effect=requests.ConnectionError("down"))
+def test_connection_error_reaches_on_error(mock_request):
+    errors = []
+    np = NowPayments("key", hooks=RequestHooks(on_error=errors.append), max_retries=1, retry_backoff=0)
+    with pytest.raises(requests.ConnectionError):
+        np.get_api_status()
+    assert mock_request.call_count == 2
+    assert isinstance(errors[0].error, requests.ConnectionError)
+    assert errors[0].attempt == 2
+
+
+def test_failing_hook_does_not_break_call(server, caplog):
+    def broken(event):
+        raise RuntimeError("tracer down")
+
+    np = NowPayments("key", base_url=server.base_url, hooks=RequestHooks(before_request=broken))
+    assert np.get_api_status() == {"message": "OK"}
+    assert "before_request hook failed" in caplog.text
+
+
+def test_hooks_registry():
+    hooks = RequestHooks()
+    assert not hooks
+
+    @hooks.on(AFTER_RESPONSE)
+    def callback(event):
+        pass
+
+    assert hooks
+    hooks.remove(AFTER_RESPONSE, callback)
+    assert not hooks
+    with pytest.raises(ValueError):
+        hooks.add("after_everything", callback)
+    assert NowPayments("key").payment.hooks is not None
@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import nowpayment
+
+
+def _loaded_after(statement):
+    code = (
+        f"import sys, json; {statement}; "
+        "print(json.dumps([name for name in ('requests', 'urllib3', 'sqlite3', 'nowpayment.apis', "
+        "'nowpayment.models') if name in sys.modules]))"
+    )
+    return json.loads(subprocess.check_output([sys.executable, "-c", code]))
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import nowpayment",
+        "from nowpayment import verify_ipn_payload, verify_ipn_body, IPNVerifier",
+        "from nowpayment.webhooks import verify_ipn_payload",
+        "from nowpayment.signatures import verify_payment_signature",
+    ],
+)
+def test_lightweight_imports_skip_http_stack(statement):
+    assert _loaded_after(statement) == []
+
+
+def test_client_import_loads_http_stack():
+    assert "requests" in _loaded_after("from nowpayment import NowPayments")
+
+
+def test_lazy_attributes_resolve_and_cache():
+    client_class = nowpayment.NowPayments
+    assert client_class.__module__ == "nowpayment.client"
+    assert nowpayment.__dict__["NowPayments"] is client_class
+    assert set(nowpayment.__all__) <= set(dir(nowpayment))
+    for name in nowpayment.__all__:
+        assert getattr(nowpayment, name) is not None
+
+
+# Every public name importable from ``nowpayment`` before imports became lazy.
+BASELINE_PUBLIC_NAMES = (
+    "NowPayments", "NowPaymentsAPIError", "NowPaymentsError", "IPNVerificationError",
+    "APIStatus", "AddressValidation", "AuthToken", "Balance", "Currency", "CurrencyList",
+    "Estimate", "Invoice", "MinAmount", "Payment", "PaymentList", "Payout", "PayoutFee",
+    "PayoutVerification", "Subscription", "SubscriptionList", "SubscriptionPlan",
+    "SubscriptionPlanList", "WithdrawalModel", "extract_ipn_signature", "verify_ipn_payload",
+    "compute_payment_signature", "verify_payment_signature", "BillingAPI", "CurrencyAPI",
+    "PaymentAPI", "PayoutAPI", "SubscriptionAPI", "PRODUCTION_BASE_URL", "SANDBOX_BASE_URL",
+    "__version__",
+)
+
+
+@pytest.mark.parametrize("name", BASELINE_PUBLIC_NAMES)
+def test_baseline_public_names_still_import(name):
+    namespace = {}
+    exec(f"from nowpayment import {name}", namespace)
+    assert namespace[name] is not None
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        nowpayment.DoesNotExist
+    with pytest.raises(ImportError):
+        from nowpayment import DoesNotExist  # noqa: F401
@@ -0,0 +1,95 @@
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from nowpayment import ClientMetrics, NowPayments, NowPaymentsAPIError
+from nowpayment.metrics import LatencyHistogram, endpoint_template
+from nowpayment.testing import MockNowPaymentsServer
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("status", "status"),
+        ("payment/5077125051", "payment/{id}"),
+        ("/payment/123/update-merchant-estimate", "payment/{id}/update-merchant-estimate"),
+        ("sub-partner/balance/42", "sub-partner/balance/{id}"),
+        ("subscriptions/plans", "subscriptions/plans"),
+    ],
+)
+def test_endpoint_template(path, expected):
+    assert endpoint_template(path) == expected
+
+
+def test_histogram_quantiles_and_buckets():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in [0.05] * 98 + [0.5, 3.0]:
+        histogram.observe(seconds)
+
+    assert histogram.count == 100
+    assert histogram.cumulative() == [("0.1", 98), ("1.0", 99), ("+Inf", 100)]
+    assert histogram.quantile(0.5) == pytest.approx(0.1 * 50 / 98)
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+    assert histogram.quantile(1.0) == 3.0
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_client_records_endpoint_metrics():
+    metrics = ClientMetrics()
+    with MockNowPaymentsServer(payments=30) as server:
+        with NowPayments("key", jwt_token="jwt", base_url=server.base_url, metrics=metrics) as np:
+            created = np.payment.create_payment(10, "usd", "trx", "https://example.com/ipn", "o-1")
+            np.payment.get_payment_status(created["payment_id"])
+            np.payment.get_payment_status(created["payment_id"])
+            with pytest.raises(NowPaymentsAPIError):
+                np.payment.get_payment_status("404")
+            np.payment.get_payment_list(limit=10)
+
+    endpoints = metrics.snapshot()["endpoints"]
+    assert set(endpoints) == {"GET payment", "GET payment/{id}", "POST payment"}
+    status = endpoints["GET payment/{id}"]
+    assert status["count"] == 3
+    assert status["statuses"] == {"200": 2, "404": 1}
+    assert status["bytes_in"] > 0
+    assert set(status["latency"]) == {"wait", "read", "parse", "total"}
+    assert status["latency"]["total"]["count"] == 3
+    assert status["latency"]["total"]["p99"] >= status["latency"]["wait"]["p50"]
+    assert endpoints["POST payment"]["bytes_out"] > 0
+
+
+def test_client_metrics_true_creates_shared_instance():
+    np = NowPayments("key", metrics=True)
+    assert isinstance(np.metrics, ClientMetrics)
+    assert np.payment.metrics is np.metrics
+    assert NowPayments("key").payment.metrics is None
+
+
+@patch("requests.Session.request", side_effect=requests.ConnectionError("boom"))
+def test_connection_errors_are_counted(mock_request):
+    np = NowPayments("key", metrics=True)
+    with pytest.raises(requests.ConnectionError):
+        np.get_api_status()
+    entry = np.metrics.snapshot()["endpoints"]["GET status"]
+    assert entry["statuses"] == {"error": 1}
+    assert entry["latency"]["total"]["count"] == 1
+
+
+def test_prometheus_exposition():
+    metrics = ClientMetrics(buckets=(0.1, 1.0))
+    metrics.record("get", "payment/1", 200, bytes_in=120, phases={"wait": 0.05, "total": 0.2})
+    metrics.record("GET", "payment/2", 500, bytes_in=30, phases={"wait": 2.0, "total": 2.5})
+
+    text = metrics.to_prometheus()
+    labels = 'method="GET",endpoint="payment/{id}"'
+    assert "# TYPE nowpayment_requests_total counter" in text
+    assert f'nowpayment_requests_total{{{labels},status="200"}} 1' in text
+    assert f'nowpayment_requests_total{{{labels},status="500"}} 1' in text
+    assert f"nowpayment_response_bytes_total{{{labels}}} 150" in text
+    assert f'nowpayment_request_duration_seconds_bucket{{{labels},phase="wait",le="0.1"}} 1' in text
+    assert f'nowpayment_request_duration_seconds_bucket{{{labels},phase="wait",le="+Inf"}} 2' in text
+    assert f'nowpayment_request_duration_seconds_count{{{labels},phase="total"}} 2' in text
+    assert text.endswith("\n")
+
+    metrics.reset()
+    assert metrics.snapshot() == {"endpoints": {}}
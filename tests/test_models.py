@@ -1,3 +1,5 @@
+import dataclasses
+
 import pytest
 
 from nowpayment.models import (
@@ -7,6 +9,7 @@ from nowpayment.models import (
     Payment,
     PaymentList,
     Payout,
+    interned,
 )
 
 
@@ -88,3 +91,85 @@ def test_payout_parses_withdrawals():
 def test_from_dict_rejects_non_dict():
     with pytest.raises(TypeError):
         Payment.from_dict([])
+
+
+def test_view_raw_mode_shares_payload_without_copy():
+    data = {"payment_id": "1", "payment_status": "waiting"}
+    payment = Payment.from_dict(data, raw_mode="view")
+
+    assert payment.to_dict() is payment.raw
+    assert payment.to_dict() == data
+    with pytest.raises(TypeError):
+        payment.raw["payment_id"] = "2"
+
+
+def test_drop_raw_mode_rebuilds_dict_from_fields():
+    result = PaymentList.from_dict(
+        {"data": [{"payment_id": "1", "extra": "x"}], "total": 1},
+        raw_mode="drop",
+    )
+
+    assert not result.raw
+    assert not result.data[0].raw
+    assert result.to_dict() == {"data": [{"payment_id": "1"}], "total": 1}
+
+
+def test_drop_raw_mode_to_dict_matches_keep_mode_keys():
+    data = {"data": [{"payment_id": "1"}], "limit": 10, "page": 0, "pagesCount": 3, "total": 25}
+
+    kept = PaymentList.from_dict(data).to_dict()
+    dropped = PaymentList.from_dict(data, raw_mode="drop").to_dict()
+
+    assert dropped == kept
+    assert dropped["pagesCount"] == 3
+
+
+def test_unknown_raw_mode_is_rejected():
+    with pytest.raises(ValueError, match="raw_mode"):
+        Payment.from_dict({}, raw_mode="copy")
+
+
+def test_list_parsing_interns_low_cardinality_fields():
+    # Build strings at runtime so they are distinct objects, as from the JSON decoder.
+    items = [
+        {
+            "payment_id": str(i),
+            "payment_status": "".join(["fin", "ished"]),
+            "pay_currency": "".join(["tr", "x"]),
+        }
+        for i in range(3)
+    ]
+    statuses = [item["payment_status"] for item in items]
+    result = PaymentList.from_dict({"data": items})
+
+    first, second = result.data[0], result.data[1]
+    assert first.payment_status is second.payment_status
+    assert first.pay_currency is second.pay_currency
+    # The caller's payload is left untouched.
+    assert [item["payment_status"] for item in items] == statuses
+    assert all(item["payment_status"] is status for item, status in zip(items, statuses))
+
+
+def test_interned_field_is_configurable_per_model():
+    @dataclasses.dataclass
+    class Tagged(Payment):
+        order_description: str = interned()
+
+    a = Tagged.from_dict({"order_description": "".join(["sub", "scription"])})
+    b = Tagged.from_dict({"order_description": "".join(["sub", "scription"])})
+
+    assert a.order_description is b.order_description
+
+
+def test_currency_code_and_network_are_interned():
+    result = CurrencyList.from_dict(
+        {
+            "currencies": [
+                {"code": "".join(["US", "DT"]), "network": "".join(["tr", "x"])},
+                {"code": "".join(["US", "DT"]), "network": "".join(["tr", "x"])},
+            ]
+        }
+    )
+
+    assert result.currencies[0].code is result.currencies[1].code
+    assert result.currencies[0].network is result.currencies[1].network
@@ -67,3 +67,17 @@ def test_api_error_propagates(mock_request):
         client.currency.get_available_currencies()
 
     assert exc_info.value.status_code == 403
+
+
+@patch("requests.Session.request")
+def test_iter_payment_pages_stops_at_pages_count(mock_request, mock_response):
+    mock_request.side_effect = [
+        mock_response(json_data={"data": [{"payment_id": "1"}], "page": 0, "pagesCount": 2}),
+        mock_response(json_data={"data": [{"payment_id": "2"}], "page": 1, "pagesCount": 2}),
+    ]
+
+    client = NowPayments("api-key", jwt_token="jwt")
+    pages = list(client.payment.iter_payment_pages(limit=1, as_model=True))
+
+    assert [page.data[0].payment_id for page in pages] == ["1", "2"]
+    assert [call.kwargs["params"]["page"] for call in mock_request.call_args_list] == [0, 1]
@@ -88,3 +88,14 @@ def test_create_invoice_as_model(mock_request, mock_response):
     assert isinstance(invoice, Invoice)
     assert invoice.id == "invoice-1"
     assert invoice.invoice_url.endswith("invoice-1")
+
+
+@patch("requests.Session.request")
+def test_client_raw_mode_applies_to_models(mock_request, mock_response):
+    mock_request.return_value = mock_response(json_data={"payment_id": "123"})
+
+    client = NowPayments("api-key", raw_mode="drop")
+    payment = client.payment.get_payment_status("123", as_model=True)
+
+    assert payment.payment_id == "123"
+    assert not payment.raw
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+import pytest
+
+from nowpayment import ClientPool, NowPayments
+from nowpayment.transports import Urllib3Transport
+
+pytestmark = pytest.mark.mock_server(payments=5)
+
+
+def test_clients_share_one_transport(server):
+    with ClientPool(base_url=server.base_url, metrics=True) as pool:
+        first, second = pool.get("key-a"), pool["key-b"]
+        assert isinstance(first, NowPayments)
+        assert pool.get("key-a") is first
+        assert first.transport is second.transport
+        assert isinstance(first.transport, Urllib3Transport)
+        assert first.get_api_status() == {"message": "OK"}
+        assert second.get_api_status() == {"message": "OK"}
+        assert first.payment.transport is pool.transport
+        assert pool.metrics.snapshot()["endpoints"]["GET status"]["count"] == 2
+        assert len(pool.transport.pool_manager.pools) == 1
+
+
+def test_per_key_jwt_and_rate_limits(server):
+    pool = ClientPool(base_url=server.base_url, rate=5, burst=2)
+    pool.register("platform", jwt_token="jwt-1", rate=50)
+    platform = pool.get("platform")
+    assert platform.jwt_token == "jwt-1"
+    assert platform.rate_limiter.rate == 50
+    assert platform.rate_limiter.burst == 2
+    merchant = pool.get("merchant")
+    assert merchant.jwt_token is None
+    assert merchant.rate_limiter is not platform.rate_limiter
+
+    pool.set_jwt_token("platform", "jwt-2")
+    assert platform.jwt_token == "jwt-2"
+    assert len(platform.payment.get_payment_list(limit=2)["data"]) == 2
+    assert ClientPool().get("key").rate_limiter is None
+
+
+def test_lru_and_idle_eviction():
+    pool = ClientPool(max_clients=2, idle_timeout=60)
+    a = pool.get("a")
+    pool.get("b")
+    pool.get("a")
+    pool.get("c")
+    assert pool.active_keys == ["a", "c"]
+    assert "b" not in pool
+
+    with patch("nowpayment.pool.time.monotonic", return_value=1e12):
+        assert pool.evict_idle() == 2
+    assert len(pool) == 0
+    assert pool.get("a") is not a
+
+
+def test_register_replaces_live_client():
+    pool = ClientPool()
+    before = pool.get("a")
+    pool.register("a", jwt_token="jwt")
+    after = pool.get("a")
+    assert after is not before
+    assert after.jwt_token == "jwt"
+
+
+def test_evicted_keys_keep_their_limiter_and_jwt():
+    pool = ClientPool(rate=5, burst=2, max_clients=1)
+    pool.set_jwt_token("a", "jwt-a")
+    first = pool.get("a")
+    assert first.rate_limiter.try_acquire()
+    assert first.rate_limiter.try_acquire()
+    pool.get("b")
+    assert "a" not in pool
+
+    rebuilt = pool.get("a")
+    assert rebuilt is not first
+    assert rebuilt.rate_limiter is first.rate_limiter
+    assert not rebuilt.rate_limiter.try_acquire()
+    assert rebuilt.jwt_token == "jwt-a"
+
+    pool.register("a", jwt_token="jwt-a")
+    assert pool.get("a").rate_limiter is first.rate_limiter
+    pool.register("a", rate=10)
+    assert pool.get("a").rate_limiter.rate == 10
@@ -0,0 +1,117 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from nowpayment import NowPayments, RateLimiter, request_priority
+from nowpayment.export import PaymentExporter
+from nowpayment.ratelimit import PRIORITY_BULK, PRIORITY_INTERACTIVE, PRIORITY_NORMAL
+from nowpayment.testing import MockNowPaymentsServer
+
+
+def test_burst_then_rate():
+    limiter = RateLimiter(rate=50, burst=3)
+    assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+    started = time.monotonic()
+    assert limiter.acquire()
+    assert time.monotonic() - started >= 0.01
+
+
+def test_acquire_timeout_reserves_nothing():
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.05)
+    assert limiter.available > -0.5
+
+
+def test_limiter_spreads_threads_over_time():
+    limiter = RateLimiter(rate=100, burst=1)
+    started = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(11)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started >= 0.09
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, burst=0.5)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, bulk_share=1)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1).acquire(priority="urgent")
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1).try_acquire(priority="urgent")
+    with pytest.raises(ValueError):
+        NowPayments("key", priority="urgent")
+
+
+def _queue(limiter, priorities):
+    """Start one waiting thread per priority, in order; return the grant log and threads."""
+    order, threads = [], []
+    for index, priority in enumerate(priorities):
+        thread = threading.Thread(target=lambda p=priority: limiter.acquire(priority=p) and order.append(p))
+        thread.start()
+        threads.append(thread)
+        while sum(limiter.waiting.values()) < index + 1:
+            time.sleep(0.001)
+    return order, threads
+
+
+def _release(limiter, threads):
+    # The rate is negligible, so tokens only appear when handed out here.
+    for _ in threads:
+        granted = sum(limiter.granted.values())
+        with limiter._condition:
+            limiter._tokens += 1
+            limiter._condition.notify_all()
+        while sum(limiter.granted.values()) == granted:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+
+
+def test_higher_priority_jumps_the_queue():
+    limiter = RateLimiter(rate=1e-6, burst=1, bulk_share=0)
+    assert limiter.acquire()
+    order, threads = _queue(limiter, [PRIORITY_BULK, PRIORITY_NORMAL, PRIORITY_BULK, PRIORITY_INTERACTIVE])
+    _release(limiter, threads)
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK, PRIORITY_BULK]
+
+
+def test_bulk_keeps_minimum_share():
+    limiter = RateLimiter(rate=1e-6, burst=1, bulk_share=0.25)
+    assert limiter.acquire()
+    order, threads = _queue(limiter, [PRIORITY_BULK] * 3 + [PRIORITY_INTERACTIVE] * 9)
+    _release(limiter, threads)
+    assert order[:8] == [PRIORITY_INTERACTIVE] * 3 + [PRIORITY_BULK] + [PRIORITY_INTERACTIVE] * 3 + [PRIORITY_BULK]
+    assert limiter.granted == {PRIORITY_INTERACTIVE: 9, PRIORITY_NORMAL: 1, PRIORITY_BULK: 3}
+
+
+def test_client_takes_a_token_per_attempt():
+    limiter = RateLimiter(rate=1000, burst=1000)
+    with MockNowPaymentsServer() as server:
+        np = NowPayments("key", base_url=server.base_url, rate_limiter=limiter, max_retries=1, retry_backoff=0)
+        server.fail_next(429)
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            np.get_api_status()
+            with request_priority(PRIORITY_INTERACTIVE):
+                np.get_api_status()
+    assert acquire.call_count == 3
+    assert [call.kwargs["priority"] for call in acquire.call_args_list] == [
+        PRIORITY_NORMAL, PRIORITY_NORMAL, PRIORITY_INTERACTIVE,
+    ]
+
+
+def test_exporter_runs_as_bulk(tmp_path):
+    limiter = RateLimiter(rate=1000, burst=1000)
+    with MockNowPaymentsServer(payments=6) as server:
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, rate_limiter=limiter)
+        PaymentExporter(np.payment, str(tmp_path / "out.ndjson"), limit=2, concurrency=2).run()
+        np.get_api_status()
+    assert limiter.granted == {PRIORITY_INTERACTIVE: 0, PRIORITY_NORMAL: 1, PRIORITY_BULK: 3}
@@ -1,6 +1,13 @@
 import pytest
 
 from nowpayment import NowPayments
+from nowpayment.signatures import (
+    PaymentSignatureVerifier,
+    _cached_verifier,
+    canonicalize_payload,
+    clear_signature_cache,
+    compute_payment_signature,
+)
 
 
 def test_compute_payment_signature_is_deterministic():
@@ -37,3 +44,51 @@ def test_compute_payment_signature_validates_inputs():
 
     with pytest.raises(ValueError, match="string"):
         NowPayments.compute_payment_signature({}, None)
+
+
+def test_verifier_matches_function_and_is_reusable():
+    verifier = PaymentSignatureVerifier("secret")
+    first = {"payment_id": "1", "payment_status": "finished"}
+    second = {"payment_id": "2", "payment_status": "waiting"}
+
+    assert verifier.compute(first) == compute_payment_signature(first, "secret")
+    assert verifier.compute(second) == compute_payment_signature(second, "secret")
+    assert verifier.verify(first, verifier.compute(first)) is True
+    assert verifier.verify(first, verifier.compute(second)) is False
+
+
+def test_verifier_validates_inputs():
+    with pytest.raises(ValueError, match="string"):
+        PaymentSignatureVerifier(None)
+
+    with pytest.raises(ValueError, match="dictionary"):
+        PaymentSignatureVerifier("secret").compute([])
+
+
+def test_canonical_form_sorts_nested_objects():
+    payload = {
+        "payment_status": "finished",
+        "fee": {"withdrawalFee": 0, "currency": "trx", "depositFee": 0.85},
+        "actually_paid": 1.5,
+        "items": [{"b": 1, "a": 2}],
+    }
+
+    assert canonicalize_payload(payload) == (
+        b'{"actually_paid":1.5,"fee":{"currency":"trx","depositFee":0.85,"withdrawalFee":0},'
+        b'"items":[{"a":2,"b":1}],"payment_status":"finished"}'
+    )
+
+
+def test_signature_ignores_nested_key_order():
+    first = {"payment_id": 1, "fee": {"currency": "trx", "depositFee": 1}}
+    second = {"fee": {"depositFee": 1, "currency": "trx"}, "payment_id": 1}
+
+    assert compute_payment_signature(first, "secret") == compute_payment_signature(second, "secret")
+
+
+def test_signature_cache_can_be_cleared():
+    compute_payment_signature({"payment_id": "1"}, "secret")
+    assert _cached_verifier.cache_info().currsize >= 1
+
+    clear_signature_cache()
+    assert _cached_verifier.cache_info().currsize == 0
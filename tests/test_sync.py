@@ -0,0 +1,135 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from nowpayment import NowPayments
+from nowpayment.sync import PaymentSync
+from nowpayment.testing import MockNowPaymentsServer
+
+
+def _api(*runs):
+    api = MagicMock()
+    api.iter_payment_pages.side_effect = [iter(pages) for pages in runs]
+    return api
+
+
+def test_sync_upserts_pages_and_serves_local_queries():
+    api = _api(
+        [
+            {"data": [
+                {"payment_id": 1, "order_id": "A", "payment_status": "waiting",
+                 "updated_at": "2024-01-01T10:00:00.000Z"},
+                {"payment_id": 2, "order_id": "B", "payment_status": "finished",
+                 "updated_at": "2024-01-01T11:00:00.000Z"},
+            ]},
+        ],
+    )
+    with PaymentSync(api, ":memory:", initial_date_from="2024-01-01") as sync:
+        result = sync.sync()
+
+        assert result.fetched == 2
+        assert result.high_water_mark == "2024-01-01T11:00:00.000Z"
+        assert sync.get_payment(1)["payment_status"] == "waiting"
+        assert [p["payment_id"] for p in sync.get_payments_by_status("finished")] == [2]
+        assert api.iter_payment_pages.call_args.kwargs["date_from"] == "2024-01-01"
+        assert api.iter_payment_pages.call_args.kwargs["sort_by"] == "updated_at"
+        assert api.iter_payment_pages.call_args.kwargs["order_by"] == "desc"
+
+
+def test_sync_resumes_from_high_water_mark_with_overlap():
+    api = _api(
+        [{"data": [{"payment_id": 1, "order_id": "A", "payment_status": "waiting",
+                    "updated_at": "2024-01-01T10:00:00.000Z"}]}],
+        [{"data": [{"payment_id": 1, "order_id": "A", "payment_status": "finished",
+                    "updated_at": "2024-01-01T10:30:00.000Z"}]}],
+    )
+    with PaymentSync(api, ":memory:", overlap=timedelta(minutes=5)) as sync:
+        sync.sync()
+        result = sync.sync()
+
+        assert result.date_from is None
+        assert result.updated_since == "2024-01-01T09:55:00.000Z"
+        assert sync.high_water_mark == "2024-01-01T10:30:00.000Z"
+        assert sync.get_payments_by_order("A")[0]["payment_status"] == "finished"
+
+
+def test_sync_ignores_stale_updates_from_overlap_window():
+    api = _api(
+        [{"data": [{"payment_id": 1, "payment_status": "finished",
+                    "updated_at": "2024-01-01T10:00:00.000Z"}]}],
+        [{"data": [{"payment_id": 1, "payment_status": "waiting",
+                    "updated_at": "2024-01-01T09:00:00.000Z"}]}],
+    )
+    with PaymentSync(api, ":memory:") as sync:
+        sync.sync()
+        sync.sync()
+
+        assert sync.get_payment(1)["payment_status"] == "finished"
+
+
+def test_sync_stops_paging_at_the_high_water_mark():
+    pages = [
+        {"data": [{"payment_id": 3, "updated_at": "2024-01-01T12:00:00.000Z"}]},
+        {"data": [{"payment_id": 2, "updated_at": "2024-01-01T11:00:00.000Z"},
+                  {"payment_id": 1, "updated_at": "2024-01-01T08:00:00.000Z"}]},
+        {"data": [{"payment_id": 0, "updated_at": "2024-01-01T07:00:00.000Z"}]},
+    ]
+    consumed = []
+
+    def pages_after_mark():
+        for page in pages:
+            consumed.append(page)
+            yield page
+
+    api = MagicMock()
+    api.iter_payment_pages.side_effect = [iter([]), pages_after_mark()]
+    with PaymentSync(api, ":memory:") as sync:
+        sync.sync()
+        sync.connection.execute(
+            "INSERT INTO sync_state (key, value) VALUES ('payments_updated_at', '2024-01-01T10:00:00.000Z')"
+        )
+        result = sync.sync()
+
+        assert result.fetched == 2
+        assert len(consumed) == 2
+        assert sync.get_payment(1) is None
+        assert sync.high_water_mark == "2024-01-01T12:00:00.000Z"
+
+
+def test_sync_keeps_payments_without_updated_at_and_skips_invalid_ones(caplog):
+    api = _api(
+        [{"data": [{"payment_id": 1, "updated_at": "2024-01-01T10:00:00.000Z"}]}],
+        [
+            {"data": [{"payment_id": 4, "updated_at": "2024-01-01T12:00:00.000Z"},
+                      {"payment_id": 3, "updated_at": None},
+                      {"payment_id": 2, "updated_at": "yesterday"}]},
+            {"data": [{"payment_id": 5},
+                      {"payment_id": 0, "updated_at": "2024-01-01T08:00:00.000Z"}]},
+            {"data": [{"payment_id": 6, "updated_at": "2024-01-01T07:00:00.000Z"}]},
+        ],
+    )
+    with PaymentSync(api, ":memory:") as sync:
+        sync.sync()
+        result = sync.sync()
+
+        assert result.fetched == 3
+        assert sync.get_payment(3) is not None
+        assert sync.get_payment(5) is not None
+        assert sync.get_payment(2) is None
+        assert sync.get_payment(0) is None
+        assert sync.high_water_mark == "2024-01-01T12:00:00.000Z"
+        assert "invalid updated_at 'yesterday'" in caplog.text
+
+
+def test_sync_picks_up_status_change_of_an_old_payment():
+    with MockNowPaymentsServer(payments=30) as server:
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url)
+        with PaymentSync(np.payment, ":memory:", limit=10) as sync:
+            assert sync.sync().fetched == 30
+
+            oldest = min(server.state.payments.values(), key=lambda item: item["created_at"])
+            oldest.update(payment_status="finished", updated_at="2030-01-01T00:00:00.000Z")
+            result = sync.sync()
+
+            assert 1 <= result.fetched < 30
+            assert sync.get_payment(oldest["payment_id"])["payment_status"] == "finished"
+            assert sync.high_water_mark == "2030-01-01T00:00:00.000Z"
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from nowpayment import NowPayments, NowPaymentsAPIError
+from nowpayment.models import WithdrawalModel
+from nowpayment.testing import MockNowPaymentsServer
+
+pytestmark = pytest.mark.mock_server(payments=45)
+
+
+@pytest.fixture
+def client(server):
+    with NowPayments("test-key", jwt_token="test-jwt", base_url=server.base_url) as np:
+        yield np
+
+
+def test_status_and_estimate(client):
+    assert client.get_api_status() == {"message": "OK"}
+    estimate = client.payment.get_estimated_price(130, "usd", "btc", as_model=True)
+    assert estimate.currency_to == "btc"
+    assert estimate.estimated_amount == pytest.approx(0.002)
+
+
+def test_payment_lifecycle(client):
+    created = client.payment.create_payment(10, "usd", "trx", "https://example.com/ipn", "order-x")
+    assert created["payment_status"] == "waiting"
+    fetched = client.payment.get_payment_status(created["payment_id"], as_model=True)
+    assert fetched.order_id == "order-x"
+
+    invoice = client.payment.create_invoice(25, "usd", order_id="inv-1")
+    payment = client.payment.create_invoice_payment(invoice["id"], "btc")
+    assert payment["invoice_id"] == int(invoice["id"])
+
+
+def test_payment_pagination(client):
+    pages = list(client.payment.iter_payment_pages(limit=20, as_model=True))
+    assert [len(page.data) for page in pages] == [20, 20, 5]
+    assert pages[0].pages_count == 3
+    created = [payment.created_at for page in pages for payment in page.data]
+    assert created == sorted(created, reverse=True)
+
+
+def test_currencies(client):
+    codes = client.currency.get_available_currencies()["currencies"]
+    assert "btc" in codes
+    full = client.currency.get_available_currencies_v2(as_model=True)
+    assert {currency.code for currency in full.currencies} >= {"BTC", "ETH"}
+
+
+def test_payout_flow(client):
+    payout = client.payout.create_payout(
+        [WithdrawalModel("T" * 34, "trx", 100, "https://example.com/ipn")],
+        "https://example.com/ipn",
+        as_model=True,
+    )
+    withdrawal = payout.withdrawals[0]
+    assert withdrawal.status == "WAITING"
+    assert client.payout.validate_address("T" * 34, "trx") == {"status": "OK"}
+    assert client.payout.cancel_payout(withdrawal.id)["status"] == "REJECTED"
+    assert client.payout.get_balance(as_model=True).balances["btc"].amount == 0.5
+
+
+def test_sub_partner_and_subscriptions(client):
+    first = client.billing.create_new_user_account("alice")["result"]["id"]
+    second = client.billing.create_new_user_account("bob")["result"]["id"]
+    client.billing.deposit_from_master_account("usdttrc20", 50, int(first))
+    client.billing.transfer("usdttrc20", 20, int(first), int(second))
+    balance = client.billing.get_user_balance(int(second))["result"]["balances"]
+    assert balance["usdttrc20"]["amount"] == 20
+    assert client.billing.get_users(limit=1)["count"] == 2
+
+    plan = client.subscription.create_plan("Monthly", 30, 9.99, "usd")["result"]
+    client.subscription.create_subscription(plan["id"], email="user@example.com")
+    listed = client.subscription.get_subscriptions(as_model=True)
+    assert listed.count == 1
+    client.subscription.delete_subscription(listed.result[0].id)
+    assert client.subscription.get_subscriptions()["count"] == 0
+
+
+def test_errors_and_auth(server, client):
+    with pytest.raises(NowPaymentsAPIError) as excinfo:
+        client.payment.get_payment_status("999")
+    assert excinfo.value.status_code == 404
+
+    anonymous = requests.get(f"{server.base_url}/status")
+    assert anonymous.status_code == 403
+    no_jwt = requests.get(f"{server.base_url}/payment", headers={"x-api-key": "k"})
+    assert no_jwt.status_code == 401
+
+
+def test_injected_failures(server, client):
+    server.fail_next(429)
+    response = requests.get(f"{server.base_url}/status", headers={"x-api-key": "k"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    server.fail_next(500, times=2)
+    for _ in range(2):
+        with pytest.raises(NowPaymentsAPIError) as excinfo:
+            client.get_api_status()
+        assert excinfo.value.status_code == 500
+    assert client.get_api_status() == {"message": "OK"}
+
+
+def test_rate_injection_is_seeded():
+    with MockNowPaymentsServer(rate_limit_rate=0.5, seed=7) as server:
+        headers = {"x-api-key": "k"}
+        with requests.Session() as session:
+            statuses = [session.get(f"{server.base_url}/status", headers=headers).status_code for _ in range(40)]
+    assert set(statuses) == {200, 429}
+    assert 5 < statuses.count(429) < 35
+
+
+def test_concurrent_requests_share_state(server, client):
+    def create(index):
+        return client.payment.create_payment(1, "usd", "eth", "https://example.com/ipn", f"c-{index}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = list(pool.map(create, range(40)))
+    assert len({payment["payment_id"] for payment in created}) == 40
+    assert server.request_count == 40
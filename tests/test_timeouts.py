@@ -0,0 +1,171 @@
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from nowpayment import (
+    DeadlineExceededError,
+    NowPayments,
+    NowPaymentsAPIError,
+    RateLimiter,
+    Timeout,
+    deadline,
+)
+from nowpayment.export import PaymentExporter
+from nowpayment.testing import MockNowPaymentsServer
+from nowpayment.timeouts import attempt_timeout, current_deadline
+from nowpayment.transports import Transport, Urllib3Transport
+
+
+class Capture(Transport):
+    def __init__(self, mock_response):
+        self.timeouts = []
+        self.mock_response = mock_response
+
+    def request(self, method, url, headers=None, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        return self.mock_response(json_data={"message": "OK"})
+
+
+def test_attempt_timeout_caps_every_part():
+    assert attempt_timeout(5) == 5
+    assert attempt_timeout(Timeout(3, 10)) == (3, 10)
+    assert attempt_timeout(None, 2) == 2
+    assert attempt_timeout(5, 2) == 2
+    assert attempt_timeout(Timeout(1, 10), 2) == (1, 2)
+    assert attempt_timeout((None, 10), 2) == (2, 2)
+
+
+def test_structured_timeout_reaches_transport(mock_response):
+    capture = Capture(mock_response)
+    np = NowPayments("key", timeout=Timeout(connect=3.05, read=27), transport=capture)
+    np.get_api_status()
+    with deadline(1.0):
+        np.get_api_status()
+    assert capture.timeouts[0] == (3.05, 27)
+    connect, read = capture.timeouts[1]
+    assert connect <= 1.0 and read <= 1.0
+
+
+def test_deadlines_nest_and_earlier_wins():
+    assert current_deadline() is None
+    with deadline(10) as outer:
+        with deadline(0.5) as inner:
+            assert inner is not outer
+            with deadline(5) as innermost:
+                assert innermost is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_slow_response_raises_deadline_exceeded():
+    with MockNowPaymentsServer(latency=0.5) as server:
+        np = NowPayments("key", base_url=server.base_url, timeout=30, max_retries=3, retry_backoff=0)
+        started = time.monotonic()
+        with pytest.raises(DeadlineExceededError), deadline(0.2):
+            np.get_api_status()
+        assert time.monotonic() - started < 0.45
+
+
+def test_retry_that_does_not_fit_is_skipped():
+    with MockNowPaymentsServer(retry_after=5) as server:
+        np = NowPayments("key", base_url=server.base_url, max_retries=3)
+        server.fail_next(429)
+        started = time.monotonic()
+        with pytest.raises(NowPaymentsAPIError) as excinfo, deadline(1.0):
+            np.get_api_status()
+        assert time.monotonic() - started < 0.5
+    assert excinfo.value.status_code == 429
+    assert server.request_count == 1
+
+
+def test_rate_limiter_wait_counts_against_deadline(mock_response):
+    limiter = RateLimiter(rate=1, burst=1)
+    np = NowPayments("key", transport=Capture(mock_response), rate_limiter=limiter)
+    np.get_api_status()
+    with pytest.raises(DeadlineExceededError), deadline(0.1):
+        np.get_api_status()
+
+
+def test_deadline_follows_iterator_and_exporter(tmp_path):
+    with MockNowPaymentsServer(payments=20, latency=0.1) as server:
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url)
+        with deadline(0.25):
+            pages = np.payment.iter_payment_pages(limit=2)
+            next(pages)
+        with pytest.raises(DeadlineExceededError):
+            for _ in pages:
+                pass
+
+        exporter = PaymentExporter(np.payment, str(tmp_path / "out.ndjson"), limit=2, concurrency=4)
+        with pytest.raises(DeadlineExceededError), deadline(0.35):
+            exporter.run()
+
+
+@contextmanager
+def _trickling_server(body_size=40, interval=0.1):
+    """Serve a JSON body one byte every ``interval`` seconds on each connection."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    stop = threading.Event()
+
+    def serve(conn):
+        with conn:
+            conn.recv(65536)
+            body = b'"' + b"x" * (body_size - 2) + b'"'
+            try:
+                conn.sendall(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {body_size}\r\n\r\n".encode()
+                )
+                for byte in body:
+                    if stop.wait(interval):
+                        return
+                    conn.sendall(bytes([byte]))
+            except OSError:
+                pass
+
+    def accept():
+        while not stop.is_set():
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{listener.getsockname()[1]}/v1"
+    finally:
+        stop.set()
+        listener.close()
+
+
+@pytest.mark.parametrize("transport", [None, Urllib3Transport], ids=["requests", "urllib3"])
+def test_deadline_bounds_a_trickling_response_body(transport):
+    with _trickling_server() as base_url:
+        np = NowPayments(
+            "key",
+            base_url=base_url,
+            timeout=Timeout(connect=1, read=1),
+            transport=transport() if transport else None,
+        )
+        started = time.perf_counter()
+        with pytest.raises(DeadlineExceededError), deadline(0.5):
+            np.get_api_status()
+        # Each byte arrives well within the read timeout; only the deadline stops it.
+        assert time.perf_counter() - started < 0.8
+
+
+@pytest.mark.parametrize("transport", [None, Urllib3Transport], ids=["requests", "urllib3"])
+def test_calls_under_a_deadline_read_bodies_and_reuse_connections(transport):
+    with MockNowPaymentsServer(payments=30) as server:
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, transport=transport() if transport else None)
+        with deadline(5):
+            page = np.payment.get_payment_list(limit=30)
+            assert np.get_api_status() == {"message": "OK"}
+        assert len(page["data"]) == 30
+        assert server.connection_count == 1
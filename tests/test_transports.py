@@ -0,0 +1,191 @@
+import json
+import sys
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from nowpayment import ClientMetrics, NowPayments, NowPaymentsAPIError
+from nowpayment.metrics import PHASE_CONNECT
+from nowpayment.testing import MockNowPaymentsServer
+from nowpayment.transports import (
+    CassetteMissError,
+    HTTP2Transport,
+    RecordingTransport,
+    ReplayTransport,
+    RequestsTransport,
+    Transport,
+    Urllib3Transport,
+    match_key,
+    normalize_params,
+    query_pairs,
+)
+from nowpayment.transports.cassette import redact
+
+
+def test_query_pairs_keep_order_and_drop_none():
+    assert query_pairs({"b": 2, "a": None, "id": [1, None, 2]}) == [("b", "2"), ("id", "1"), ("id", "2")]
+    assert query_pairs(None) == []
+
+
+def test_normalize_params_ignores_order_and_none():
+    assert normalize_params({"b": 2, "a": "x", "c": None}) == (("a", "x"), ("b", "2"))
+    assert normalize_params({"id": [2, 1]}) == (("id", "1"), ("id", "2"))
+    assert normalize_params(None) == ()
+    assert match_key("get", "https://api.nowpayments.io/v1/payment/?limit=5", {"page": 0}) == (
+        "GET",
+        "/v1/payment",
+        (("limit", "5"), ("page", "0")),
+    )
+
+
+def test_default_transport_uses_session(mock_response):
+    with patch("requests.Session.request", return_value=mock_response()) as mock_request:
+        np = NowPayments("key")
+        assert np.get_api_status() == {"message": "OK"}
+    assert mock_request.call_args.args[:2] == ("GET", "https://api.nowpayments.io/v1/status")
+    assert isinstance(np.payment.transport, RequestsTransport)
+
+
+def test_record_then_replay_offline(tmp_path):
+    cassette = str(tmp_path / "cassette.ndjson")
+    with MockNowPaymentsServer(payments=12) as server:
+        base_url = server.base_url
+        with RecordingTransport(cassette) as recorder:
+            np = NowPayments("secret-key", jwt_token="secret-jwt", base_url=base_url, transport=recorder)
+            created = np.payment.create_payment(10, "usd", "trx", "https://example.com/ipn", "o-1")
+            recorded_status = np.payment.get_payment_status(created["payment_id"])
+            recorded_page = np.payment.get_payment_list(limit=5, page=1)
+            with pytest.raises(NowPaymentsAPIError):
+                np.payment.get_payment_status("404")
+
+    text = open(cassette, encoding="utf-8").read()
+    assert "secret-key" not in text and "secret-jwt" not in text
+    assert json.loads(text.splitlines()[0])["request"]["json"]["order_id"] == "o-1"
+
+    np = NowPayments("other-key", jwt_token="jwt", base_url=base_url, transport=ReplayTransport(cassette))
+    assert np.payment.get_payment_status(created["payment_id"]) == recorded_status
+    page = np.payment.get_payment_list(limit=5, page=1, as_model=True)
+    assert page.to_dict() == recorded_page
+    with pytest.raises(NowPaymentsAPIError) as excinfo:
+        np.payment.get_payment_status("404")
+    assert excinfo.value.status_code == 404
+    with pytest.raises(CassetteMissError):
+        np.payment.get_payment_list(limit=5, page=2)
+
+
+def test_recording_redacts_credentials_in_bodies(tmp_path):
+    cassette = str(tmp_path / "cassette.ndjson")
+    with MockNowPaymentsServer() as server:
+        with RecordingTransport(cassette) as recorder:
+            np = NowPayments("key", base_url=server.base_url, transport=recorder)
+            token = np.payout.login("owner@example.com", "hunter2")["token"]
+
+    text = open(cassette, encoding="utf-8").read()
+    for secret in ("owner@example.com", "hunter2", token):
+        assert secret not in text
+    interaction = json.loads(text)
+    assert interaction["request"]["json"] == {"email": "[REDACTED]", "password": "[REDACTED]"}
+    assert json.loads(interaction["response"]["body"]) == {"token": "[REDACTED]"}
+
+    assert redact({"items": [{"Authorization": "x", "id": 1}]}) == {"items": [{"Authorization": "[REDACTED]", "id": 1}]}
+
+
+def test_transport_without_request_cannot_be_instantiated():
+    class Incomplete(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_recording_closes_only_its_own_transport(tmp_path):
+    inner = MagicMock(spec=Urllib3Transport)
+    RecordingTransport(str(tmp_path / "a.ndjson"), transport=inner).close()
+    inner.close.assert_not_called()
+
+    with patch.object(RequestsTransport, "close") as close:
+        RecordingTransport(str(tmp_path / "b.ndjson")).close()
+    close.assert_called_once_with()
+
+
+def test_replay_serves_repeated_requests_in_order(tmp_path):
+    cassette = tmp_path / "status.ndjson"
+    lines = [
+        {"request": {"method": "GET", "path": "/v1/payment/1", "params": []},
+         "response": {"status": 200, "body": json.dumps({"payment_status": status}), "elapsed": 0.2}}
+        for status in ("waiting", "confirming", "finished")
+    ]
+    cassette.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+    np = NowPayments("key", transport=ReplayTransport(str(cassette)))
+    statuses = [np.payment.get_payment_status("1")["payment_status"] for _ in range(4)]
+    assert statuses == ["waiting", "confirming", "finished", "finished"]
+
+    strict = NowPayments("key", transport=ReplayTransport(str(cassette), strict=True))
+    for _ in range(3):
+        strict.payment.get_payment_status("1")
+    with pytest.raises(CassetteMissError):
+        strict.payment.get_payment_status("1")
+
+
+def test_custom_transport_receives_request_arguments(mock_response):
+    class Capture(Transport):
+        def __init__(self):
+            self.calls = []
+
+        def request(self, method, url, headers=None, timeout=None, **kwargs):
+            self.calls.append((method, url, headers, timeout, kwargs))
+            return mock_response(json_data={"min_amount": 1})
+
+    capture = Capture()
+    np = NowPayments("key", timeout=3, transport=capture)
+    np.payment.get_minimum_payment_amount("btc", "usd")
+    method, url, headers, timeout, kwargs = capture.calls[0]
+    assert (method, timeout) == ("GET", 3)
+    assert url.endswith("/min-amount")
+    assert headers["x-api-key"] == "key"
+    assert kwargs["params"]["currency_from"] == "btc"
+
+
+def test_urllib3_transport_against_mock_server():
+    metrics = ClientMetrics()
+    with MockNowPaymentsServer(payments=12) as server, Urllib3Transport(maxsize=2) as transport:
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, transport=transport, metrics=metrics)
+        assert np.get_api_status() == {"message": "OK"}
+        created = np.payment.create_payment(10, "usd", "trx", "https://example.com/ipn", "o-1")
+        assert np.payment.get_payment_status(created["payment_id"])["order_id"] == "o-1"
+        assert len(np.payment.get_payment_list(limit=5, page=1)["data"]) == 5
+        with pytest.raises(NowPaymentsAPIError) as excinfo:
+            np.payment.get_payment_status("404")
+        assert excinfo.value.status_code == 404
+
+    endpoints = metrics.snapshot()["endpoints"]
+    connects = sum(entry["latency"].get(PHASE_CONNECT, {}).get("count", 0) for entry in endpoints.values())
+    assert connects == 1
+    assert endpoints["POST payment"]["bytes_out"] > 0
+
+
+def test_urllib3_transport_raises_requests_errors():
+    with MockNowPaymentsServer() as server:
+        base_url = server.base_url
+    np = NowPayments("key", base_url=base_url, transport=Urllib3Transport(), max_retries=1, retry_backoff=0)
+    with pytest.raises(requests.ConnectionError):
+        np.get_api_status()
+
+
+def test_http2_transport_requires_httpx():
+    with patch.dict(sys.modules, {"httpx": None}):
+        with pytest.raises(ImportError, match=r"nowpayment\[http2\]"):
+            HTTP2Transport()
+
+
+def test_http2_transport_against_mock_server():
+    pytest.importorskip("h2")
+    pytest.importorskip("httpx")
+    with MockNowPaymentsServer(payments=12) as server:
+        transport = HTTP2Transport()
+        np = NowPayments("key", jwt_token="jwt", base_url=server.base_url, transport=transport)
+        assert np.get_api_status() == {"message": "OK"}
+        assert len(np.payment.get_payment_list(limit=5)["data"]) == 5
+        transport.close()
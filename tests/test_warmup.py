@@ -0,0 +1,98 @@
+import socket
+import time
+from unittest.mock import patch
+
+import pytest
+
+from nowpayment import NowPayments, RateLimiter
+from nowpayment.ratelimit import PRIORITY_BULK
+from nowpayment.transports import Urllib3Transport
+from nowpayment.warmup import KeepAlive
+
+
+def test_warm_up_opens_connections_that_later_calls_reuse(server):
+    with NowPayments("key", base_url=server.base_url) as np:
+        assert np.warm_up(connections=3) == 3
+        assert server.connection_count == 3
+        assert server.requests.count(("GET", "/v1/status")) == 3
+
+        np.payment.get_estimated_price(10, "usd", "btc")
+        assert server.connection_count == 3
+
+
+def test_warm_up_with_urllib3_transport(server):
+    with Urllib3Transport(maxsize=4) as transport:
+        np = NowPayments("key", base_url=server.base_url, transport=transport)
+        assert np.warm_up(connections=4) == 4
+        np.get_api_status()
+        assert server.connection_count == 4
+
+
+def test_warm_up_on_construction(server):
+    with NowPayments("key", base_url=server.base_url, warm_connections=2):
+        assert server.connection_count == 2
+
+
+def test_warm_up_reports_failures_without_raising(server):
+    server.fail_next(500, times=2)
+    with NowPayments("key", base_url=server.base_url) as np:
+        assert np.warm_up(connections=2) == 0
+    with NowPayments("key", base_url="http://127.0.0.1:9/v1") as np:
+        assert np.warm_up(timeout=1) == 0
+
+
+def test_warm_up_with_thread_sessions_only_warms_calling_thread(server):
+    with NowPayments("key", base_url=server.base_url, session_scope="thread") as np:
+        assert np.warm_up(connections=3) == 1
+        assert server.connection_count == 1
+
+
+def test_warm_up_rejects_zero_connections():
+    with pytest.raises(ValueError):
+        NowPayments("key").warm_up(connections=0)
+    with pytest.raises(ValueError):
+        KeepAlive(NowPayments("key"), interval=0)
+
+
+def test_keepalive_pings_only_when_idle(server):
+    limiter = RateLimiter(rate=100)
+    with NowPayments("key", base_url=server.base_url, rate_limiter=limiter) as np:
+        keepalive = np.start_keepalive(interval=0.2)
+        time.sleep(0.5)
+        assert keepalive.pings >= 1
+        assert limiter.granted[PRIORITY_BULK] == keepalive.pings
+
+        # Steady traffic keeps the connection busy, so no pings are needed.
+        pings = keepalive.pings
+        for _ in range(8):
+            np.payment.get_estimated_price(10, "usd", "btc")
+            time.sleep(0.05)
+        assert keepalive.pings == pings
+        assert server.connection_count == 1
+        # Activity comes from the transport, so hooks stay off.
+        assert not np.hooks
+    assert not keepalive.running
+
+
+def test_keepalive_interval_on_construction(server):
+    np = NowPayments("key", base_url=server.base_url, warm_connections=2, keepalive_interval=0.1)
+    try:
+        time.sleep(0.35)
+        assert np._keepalive.connections == 2
+        assert np._keepalive.pings >= 1
+        assert server.connection_count == 2
+    finally:
+        np.close()
+
+
+def test_warm_up_on_construction_is_bounded_when_the_host_never_answers():
+    # Connections are accepted by the kernel but never answered.
+    with socket.socket() as silent:
+        silent.bind(("127.0.0.1", 0))
+        silent.listen(8)
+        base_url = f"http://127.0.0.1:{silent.getsockname()[1]}/v1"
+        started = time.perf_counter()
+        with patch("nowpayment.client.DEFAULT_WARM_UP_TIMEOUT", 0.3):
+            np = NowPayments("key", base_url=base_url, warm_connections=2)
+        assert time.perf_counter() - started < 2
+        np.close()
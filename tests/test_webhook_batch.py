@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from nowpayment.signatures import compute_payment_signature
+from nowpayment.webhooks.batch import main, verify_ipn_log
+
+
+def _write_log(path, count=25):
+    with open(path, "w", encoding="utf-8") as handle:
+        for index in range(count):
+            payload = {"payment_id": index, "payment_status": "finished", "fee": {"b": 1, "a": 2}}
+            secret = "old" if index % 2 else "new"
+            signature = compute_payment_signature(payload, secret)
+            if index == 3:
+                signature = "0" * 128
+            body = json.dumps(payload) if index % 3 else payload
+            handle.write(json.dumps({"body": body, "signature": signature}) + "\n")
+        handle.write("not json\n")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_ipn_log_reports_mismatches_and_key_usage(tmp_path, workers):
+    path = str(tmp_path / "ipn.ndjson")
+    _write_log(path)
+    mismatches = []
+
+    report = verify_ipn_log(
+        path, ["new", "old"], workers=workers, chunk_size=4, on_mismatch=mismatches.append
+    )
+
+    assert report.total == 26
+    assert report.valid == 24
+    assert report.invalid == 1
+    assert report.malformed == 1
+    assert report.matches_by_key == {0: 13, 1: 11}
+    assert [(m.line, m.payment_id) for m in mismatches] == [(4, 3), (26, None)]
+
+
+def test_cli_writes_mismatches_and_summary(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / "ipn.ndjson")
+    output = str(tmp_path / "mismatches.ndjson")
+    _write_log(path)
+    monkeypatch.setenv("SECRET_NEW", "new")
+    monkeypatch.setenv("SECRET_OLD", "old")
+
+    code = main([
+        path,
+        "--secret-env", "SECRET_NEW",
+        "--secret-env", "SECRET_OLD",
+        "--workers", "1",
+        "--output", output,
+    ])
+
+    assert code == 1
+    summary = json.loads(capsys.readouterr().err)
+    assert summary["valid"] == 24
+    with open(output, encoding="utf-8") as handle:
+        assert [json.loads(line)["line"] for line in handle] == [4, 26]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_non_string_signatures_are_counted_as_malformed(tmp_path, workers):
+    path = str(tmp_path / "ipn.ndjson")
+    payload = {"payment_id": 1, "payment_status": "finished"}
+    with open(path, "w", encoding="utf-8") as handle:
+        for signature in (12345, ["a"], {"sig": "a"}, compute_payment_signature(payload, "new")):
+            handle.write(json.dumps({"body": payload, "signature": signature}) + "\n")
+
+    report = verify_ipn_log(path, ["new"], workers=workers, chunk_size=2)
+
+    assert (report.valid, report.invalid, report.malformed) == (1, 0, 3)
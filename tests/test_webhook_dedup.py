@@ -0,0 +1,119 @@
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from nowpayment.signatures import compute_payment_signature
+from nowpayment.webhooks import (
+    DedupStore,
+    IPNDeduplicator,
+    IPNReceiver,
+    MemoryDedupStore,
+    SQLiteDedupStore,
+    ipn_fingerprint,
+)
+
+SECRET = "ipn-secret"
+PAYLOAD = {"payment_id": 1, "payment_status": "finished", "actually_paid": 1.5, "updated_at": 1}
+
+
+def test_fingerprint_ignores_unrelated_fields():
+    assert ipn_fingerprint(PAYLOAD) == ipn_fingerprint({**PAYLOAD, "order_description": "x"})
+    assert ipn_fingerprint(PAYLOAD) != ipn_fingerprint({**PAYLOAD, "payment_status": "sending"})
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryDedupStore(maxsize=2)
+    assert store.add("a", 60) is True
+    assert store.add("b", 60) is True
+    assert store.contains("a") is True
+    store.add("c", 60)
+
+    assert store.contains("a") is True
+    assert store.contains("b") is False
+    assert len(store) == 2
+
+
+def test_memory_store_expires_entries():
+    store = MemoryDedupStore()
+    with patch("nowpayment.webhooks.dedup.time.monotonic", return_value=100.0):
+        store.add("a", 10)
+    with patch("nowpayment.webhooks.dedup.time.monotonic", return_value=111.0):
+        assert store.contains("a") is False
+        assert store.add("a", 10) is True
+
+
+def test_sqlite_store_persists_fingerprints(tmp_path):
+    path = str(tmp_path / "dedup.sqlite")
+    first = IPNDeduplicator(store=SQLiteDedupStore(path))
+    assert first.mark(PAYLOAD) is True
+    assert first.mark(PAYLOAD) is False
+
+    second = IPNDeduplicator(store=SQLiteDedupStore(path))
+    assert second.is_duplicate(PAYLOAD) is True
+    second.forget(PAYLOAD)
+    assert second.is_duplicate(PAYLOAD) is False
+
+
+def test_receiver_acknowledges_duplicates_without_processing():
+    received = []
+    done = threading.Event()
+
+    def handler(payload):
+        received.append(payload)
+        done.set()
+
+    body = json.dumps(PAYLOAD).encode("utf-8")
+    headers = {"x-nowpayments-sig": compute_payment_signature(PAYLOAD, SECRET)}
+    with IPNReceiver(SECRET, handler, dedup=IPNDeduplicator()) as receiver:
+        responses = [receiver.handle("POST", body, headers)[0] for _ in range(3)]
+        assert done.wait(2)
+
+    assert responses == [200, 200, 200]
+    assert received == [PAYLOAD]
+
+
+def test_distinct_payouts_with_the_same_timestamp_are_all_processed():
+    payouts = [
+        {"id": "5000001", "batch_withdrawal_id": "9001", "status": "FINISHED", "updated_at": 1},
+        {"id": "5000002", "batch_withdrawal_id": "9001", "status": "FINISHED", "updated_at": 1},
+    ]
+    assert ipn_fingerprint(payouts[0]) != ipn_fingerprint(payouts[1])
+    assert ipn_fingerprint(payouts[0]) != ipn_fingerprint({**payouts[0], "status": "SENDING"})
+
+    received = []
+    done = threading.Event()
+
+    def handler(payload):
+        received.append(payload)
+        if len(received) == 2:
+            done.set()
+
+    with IPNReceiver(SECRET, handler, dedup=IPNDeduplicator()) as receiver:
+        for payout in payouts + payouts:
+            body = json.dumps(payout).encode("utf-8")
+            headers = {"x-nowpayments-sig": compute_payment_signature(payout, SECRET)}
+            assert receiver.handle("POST", body, headers)[0] == 200
+        assert done.wait(2)
+
+    assert sorted(item["id"] for item in received) == ["5000001", "5000002"]
+
+
+def test_payloads_without_identifiers_are_never_deduplicated():
+    dedup = IPNDeduplicator()
+    payload = {"status": "FINISHED", "updated_at": 1}
+
+    assert dedup.mark(payload) is True
+    assert dedup.mark(payload) is True
+    assert dedup.is_duplicate(payload) is False
+    assert len(dedup.store) == 0
+
+
+def test_incomplete_dedup_store_cannot_be_instantiated():
+    class AddOnly(DedupStore):
+        def add(self, key, ttl):
+            return True
+
+    with pytest.raises(TypeError):
+        AddOnly()
@@ -0,0 +1,87 @@
+import json
+import random
+import threading
+import time
+
+import pytest
+
+from nowpayment.models import Payment, PayoutWithdrawal
+from nowpayment.signatures import compute_payment_signature
+from nowpayment.webhooks import IPNDispatcher, IPNReceiver
+
+
+def test_dispatch_routes_by_kind_and_status():
+    dispatcher = IPNDispatcher()
+    finished, payouts, everything = [], [], []
+
+    @dispatcher.on_payment("finished", "partially_paid")
+    def on_finished(event):
+        finished.append(event)
+
+    @dispatcher.on_payout("FINISHED")
+    def on_payout(event):
+        payouts.append(event)
+
+    dispatcher.add_handler("payment", everything.append)
+
+    dispatcher.dispatch({"payment_id": 1, "payment_status": "waiting"})
+    dispatcher.dispatch({"payment_id": 1, "payment_status": "finished"})
+    dispatcher.dispatch({"id": "w-1", "batch_withdrawal_id": "b-1", "status": "finished"})
+
+    assert [event.status for event in everything] == ["waiting", "finished"]
+    assert isinstance(finished[0].model, Payment)
+    assert finished[0].key == "1"
+    assert isinstance(payouts[0].model, PayoutWithdrawal)
+
+
+def test_parse_rejects_unknown_payloads():
+    with pytest.raises(ValueError):
+        IPNDispatcher().parse({"foo": "bar"})
+
+
+def test_submit_keeps_per_payment_order_across_shards():
+    dispatcher = IPNDispatcher(shards=4)
+    seen = {}
+    lock = threading.Lock()
+
+    @dispatcher.on_payment()
+    def record(event):
+        time.sleep(random.random() / 1000)
+        with lock:
+            seen.setdefault(event.key, []).append(event.payload["sequence"])
+
+    with dispatcher:
+        for sequence in range(20):
+            for payment_id in range(8):
+                assert dispatcher.submit(
+                    {"payment_id": payment_id, "payment_status": "waiting", "sequence": sequence}
+                )
+        dispatcher.join()
+
+    assert len(seen) == 8
+    assert all(order == list(range(20)) for order in seen.values())
+
+
+def test_receiver_hands_events_to_dispatcher():
+    dispatcher = IPNDispatcher(shards=2)
+    received = []
+    done = threading.Event()
+
+    @dispatcher.on_payment("finished")
+    def on_finished(event):
+        received.append(event.model.payment_id)
+        done.set()
+
+    payload = {"payment_id": 7, "payment_status": "finished"}
+    headers = {"x-nowpayments-sig": compute_payment_signature(payload, "secret")}
+    with IPNReceiver("secret", dispatcher=dispatcher) as receiver:
+        status, _, _ = receiver.handle("POST", json.dumps(payload).encode("utf-8"), headers)
+        assert done.wait(2)
+
+    assert status == 200
+    assert received == [7]
+
+
+def test_receiver_requires_handler_or_dispatcher():
+    with pytest.raises(ValueError, match="exactly one"):
+        IPNReceiver("secret")
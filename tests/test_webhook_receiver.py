@@ -0,0 +1,147 @@
+import asyncio
+import io
+import json
+import threading
+import time
+
+from nowpayment.signatures import compute_payment_signature
+from nowpayment.webhooks import IPNReceiver
+
+SECRET = "ipn-secret"
+
+
+def _wsgi_call(app, body, signature=None, method="POST"):
+    environ = {
+        "REQUEST_METHOD": method,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+    }
+    if signature is not None:
+        environ["HTTP_X_NOWPAYMENTS_SIG"] = signature
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"] = status
+        captured["headers"] = dict(headers)
+
+    captured["body"] = b"".join(app(environ, start_response))
+    return captured
+
+
+def _signed(payload):
+    return json.dumps(payload).encode("utf-8"), compute_payment_signature(payload, SECRET)
+
+
+def test_wsgi_acknowledges_and_hands_event_to_worker():
+    received = []
+    done = threading.Event()
+
+    def handler(payload):
+        received.append(payload)
+        done.set()
+
+    with IPNReceiver(SECRET, handler, workers=2) as receiver:
+        body, signature = _signed({"payment_id": 1, "payment_status": "finished"})
+        response = _wsgi_call(receiver.wsgi_app, body, signature)
+        assert done.wait(2)
+
+    assert response["status"] == "200 OK"
+    assert received == [{"payment_id": 1, "payment_status": "finished"}]
+
+
+def test_wsgi_rejects_bad_requests():
+    with IPNReceiver(SECRET, lambda payload: None) as receiver:
+        body, _ = _signed({"payment_id": 1})
+        assert _wsgi_call(receiver.wsgi_app, body, "bad")["status"].startswith("401")
+        assert _wsgi_call(receiver.wsgi_app, b"nope", "sig")["status"].startswith("400")
+        assert _wsgi_call(receiver.wsgi_app, b"", method="GET")["status"].startswith("405")
+
+    small = IPNReceiver(SECRET, lambda payload: None, max_body_size=4)
+    assert _wsgi_call(small.wsgi_app, b"{}" * 10, "sig")["status"].startswith("413")
+
+
+def test_full_queue_applies_backpressure_with_503():
+    picked = threading.Event()
+    release = threading.Event()
+
+    def handler(payload):
+        picked.set()
+        release.wait(2)
+
+    receiver = IPNReceiver(SECRET, handler, workers=1, queue_size=1, retry_after=7)
+    try:
+        statuses = []
+        for payment_id in range(3):
+            body, signature = _signed({"payment_id": payment_id})
+            response = _wsgi_call(receiver.wsgi_app, body, signature)
+            statuses.append(response["status"])
+            if payment_id == 0:
+                # Let the single worker pick up the first event and block on it.
+                assert picked.wait(2)
+        assert statuses[:2] == ["200 OK", "200 OK"]
+        assert statuses[2] == "503 Service Unavailable"
+        assert response["headers"]["Retry-After"] == "7"
+    finally:
+        release.set()
+        receiver.stop()
+
+
+def test_asgi_app_verifies_chunked_body():
+    received = []
+    done = threading.Event()
+    body, signature = _signed({"payment_id": 5, "payment_status": "waiting"})
+    messages = [
+        {"type": "http.request", "body": body[:10], "more_body": True},
+        {"type": "http.request", "body": body[10:], "more_body": False},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"x-nowpayments-sig", signature.encode("ascii"))],
+    }
+    with IPNReceiver(SECRET, lambda payload: (received.append(payload), done.set())) as receiver:
+        asyncio.run(receiver.asgi_app(scope, receive, send))
+        assert done.wait(2)
+
+    assert sent[0]["status"] == 200
+    assert received == [{"payment_id": 5, "payment_status": "waiting"}]
+
+
+def test_asgi_lifespan_shutdown_does_not_block_the_event_loop():
+    release = threading.Event()
+    receiver = IPNReceiver(SECRET, lambda payload: release.wait(5), shutdown_timeout=5)
+    body, signature = _signed({"payment_id": 6, "payment_status": "waiting"})
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "lifespan.startup.complete":
+            receiver.handle("POST", body, {"x-nowpayments-sig": signature})
+
+    async def main():
+        async def release_later():
+            # Only runs if shutdown leaves the event loop free.
+            await asyncio.sleep(0.05)
+            release.set()
+
+        releaser = asyncio.ensure_future(release_later())
+        await receiver.asgi_app({"type": "lifespan"}, receive, send)
+        await releaser
+
+    started = time.perf_counter()
+    asyncio.run(main())
+
+    assert time.perf_counter() - started < 2
+    assert [message["type"] for message in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
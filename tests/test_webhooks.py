@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from nowpayment import IPNVerificationError, IPNVerifier, verify_ipn_body
+from nowpayment.signatures import compute_payment_signature
+
+SECRET = "ipn-secret"
+PAYLOAD = {"payment_id": 1, "payment_status": "finished", "fee": {"depositFee": 1, "currency": "trx"}}
+
+
+def _signed_request(payload=PAYLOAD, secret=SECRET):
+    body = json.dumps(payload).encode("utf-8")
+    return body, {"X-NOWPAYMENTS-SIG": compute_payment_signature(payload, secret)}
+
+
+def test_verify_ipn_body_returns_decoded_payload():
+    body, headers = _signed_request()
+    assert verify_ipn_body(body, headers, SECRET) == PAYLOAD
+
+
+def test_verify_ipn_body_rejects_wrong_signature():
+    body, headers = _signed_request(secret="other-secret")
+    with pytest.raises(IPNVerificationError, match="Invalid"):
+        verify_ipn_body(body, headers, SECRET)
+
+
+def test_verify_ipn_body_rejects_missing_header():
+    body, _ = _signed_request()
+    with pytest.raises(IPNVerificationError, match="Missing"):
+        verify_ipn_body(body, {}, SECRET)
+
+
+def test_verify_ipn_body_rejects_oversized_body_before_parsing():
+    _, headers = _signed_request()
+    with pytest.raises(IPNVerificationError, match="exceeds"):
+        verify_ipn_body(b"{" * 100, headers, SECRET, max_body_size=10)
+
+
+@pytest.mark.parametrize("body", [b"not-json", b"[1, 2]", b"\xff\xfe"])
+def test_verify_ipn_body_rejects_non_object_bodies(body):
+    _, headers = _signed_request()
+    with pytest.raises(IPNVerificationError):
+        verify_ipn_body(body, headers, SECRET)
+
+
+def test_verifier_rejects_non_ascii_signature_without_type_error():
+    body, _ = _signed_request()
+    with pytest.raises(IPNVerificationError, match="Invalid"):
+        IPNVerifier(SECRET).verify_body(body, {"x-nowpayments-sig": "é"})
+
+
+def test_verifier_accepts_any_active_secret_and_reports_match():
+    verifier = IPNVerifier(["new-secret", "old-secret"])
+
+    body, headers = _signed_request(secret="old-secret")
+    assert verifier.verify_body_with_key(body, headers) == (PAYLOAD, 1)
+
+    body, headers = _signed_request(secret="new-secret")
+    assert verifier.verify_body_with_key(body, headers) == (PAYLOAD, 0)
+
+    body, headers = _signed_request(secret="retired-secret")
+    with pytest.raises(IPNVerificationError, match="Invalid"):
+        verifier.verify_body(body, headers)
+
+
+def test_verifier_canonicalizes_once_for_all_secrets(monkeypatch):
+    import nowpayment.webhooks.verification as webhooks
+
+    calls = []
+    original = webhooks.canonicalize_payload
+    monkeypatch.setattr(webhooks, "canonicalize_payload", lambda data: calls.append(1) or original(data))
+
+    body, headers = _signed_request(secret="third")
+    IPNVerifier(["first", "second", "third"]).verify_body(body, headers)
+
+    assert len(calls) == 1
+
+
+def test_verifier_requires_a_secret():
+    with pytest.raises(ValueError, match="At least one"):
+        IPNVerifier([])